@@ -0,0 +1,210 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Benchmark of the response compression for order requests.
+
+Start a local stub of the orders route, which answers with synthetic order
+pages in the size of the requested `with[]` elements and compresses them
+according to the Accept-Encoding header. The stub limits its bandwidth
+(--bandwidth in Mbit/s) to mimic the connection to a plentymarkets system.
+
+Usage:
+    python benchmarks/compression.py [--pages 10] [--bandwidth 50]
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import gzip
+import random
+import threading
+import time
+import zlib
+import simplejson
+
+import plenty_api
+import plenty_api.utils as utils
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ITEMS_PER_PAGE = 50
+WITH_COMBINATIONS = [
+    [],
+    ['orderItems.variation'],
+    ['addresses'],
+    ['orderItems.variation', 'addresses', 'documents'],
+]
+
+
+def build_order(order_id: int, additional: list) -> dict:
+    rand = random.Random(order_id)
+    order = {
+        'id': order_id, 'typeId': 1, 'statusId': 7.0, 'plentyId': 12345,
+        'createdAt': '2020-11-27T10:00:00+01:00',
+        'updatedAt': '2020-11-28T10:00:00+01:00',
+        'properties': [{'typeId': type_id, 'value': str(rand.randint(1, 99))}
+                       for type_id in range(1, 8)],
+        'orderItems': [],
+    }
+    for position in range(rand.randint(1, 6)):
+        item = {
+            'id': order_id * 10 + position, 'orderId': order_id,
+            'typeId': 1, 'itemVariationId': rand.randint(1000, 9999),
+            'quantity': rand.randint(1, 5),
+            'orderItemName': f'Product {rand.randint(1, 500)} - size M',
+            'amounts': [{'currency': 'EUR', 'priceGross': 19.99,
+                         'priceNet': 16.8, 'isSystemCurrency': True}],
+        }
+        if 'orderItems.variation' in additional:
+            item['variation'] = {
+                'id': item['itemVariationId'], 'itemId': rand.randint(1, 999),
+                'number': f'VAR-{rand.randint(10000, 99999)}',
+                'model': 'Model', 'isActive': True,
+                'weightG': rand.randint(100, 2000),
+                'widthMM': 300, 'lengthMM': 200, 'heightMM': 100,
+                'availableUntil': None, 'mainWarehouseId': 104,
+                'customsTariffNumber': '6109100010',
+            }
+        order['orderItems'].append(item)
+    if 'addresses' in additional:
+        order['addresses'] = [
+            {'id': order_id * 2 + kind, 'name1': '', 'name2': 'Erika',
+             'name3': 'Mustermann', 'address1': 'Heidestrasse',
+             'address2': str(rand.randint(1, 200)), 'postalCode': '51147',
+             'town': 'Koeln', 'countryId': 1,
+             'options': [{'typeId': 5, 'value': 'erika@example.com'}]}
+            for kind in range(2)
+        ]
+    if 'documents' in additional:
+        order['documents'] = [
+            {'id': order_id * 3 + kind, 'type': doc_type,
+             'number': rand.randint(100000, 999999),
+             'path': f'{doc_type}/{order_id}/{doc_type}_{order_id}.pdf',
+             'createdAt': '2020-11-27T10:05:00+01:00'}
+            for kind, doc_type in enumerate(['invoice', 'delivery_note'])
+        ]
+    return order
+
+
+def encode_body(body: bytes, accept_encoding: str) -> tuple:
+    encodings = [value.strip() for value in accept_encoding.split(',')]
+    if 'br' in encodings and brotli:
+        return ('br', brotli.compress(body))
+    if 'gzip' in encodings:
+        return ('gzip', gzip.compress(body))
+    if 'deflate' in encodings:
+        return ('deflate', zlib.compress(body))
+    return ('', body)
+
+
+def create_handler(pages: int, bandwidth: float):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def send_body(self, body: bytes) -> None:
+            (encoding, body) = encode_body(
+                body=body,
+                accept_encoding=self.headers.get('Accept-Encoding', ''))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            if bandwidth:
+                time.sleep(len(body) * 8 / (bandwidth * 1_000_000))
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            self.send_body(simplejson.dumps(
+                {'token_type': 'Bearer', 'access_token': 'stub'}
+            ).encode('utf-8'))
+
+        def do_GET(self) -> None:
+            query = parse_qs(urlparse(self.path).query)
+            page = int(query.get('page', ['1'])[0])
+            additional = query.get('with[]', [])
+            first = (page - 1) * ITEMS_PER_PAGE
+            self.send_body(simplejson.dumps({
+                'page': page, 'totalsCount': pages * ITEMS_PER_PAGE,
+                'isLastPage': page >= pages, 'lastPageNumber': pages,
+                'itemsPerPage': ITEMS_PER_PAGE,
+                'entries': [build_order(order_id=order_id,
+                                        additional=additional)
+                            for order_id in range(first,
+                                                  first + ITEMS_PER_PAGE)]
+            }).encode('utf-8'))
+
+    return StubHandler
+
+
+def run_benchmark(url: str, accept_encoding: str, additional: list) -> dict:
+    plenty = plenty_api.PlentyApi(base_url=url, login_method='plain_text',
+                                  login_data={'user': 'u', 'password': 'p'})
+    plenty.accept_encoding = accept_encoding
+    start = time.perf_counter()
+    orders = plenty.plenty_api_get_orders_by_date(
+        start='2020-11-01', end='2020-11-30', additional=additional)
+    duration = time.perf_counter() - start
+    counters = plenty.instrumentation.snapshot()['counters'][
+        utils.resolve_domain(domain='orders')]
+    return {'orders': len(orders), 'duration': duration,
+            'transferred': counters['bytes_transferred'],
+            'decoded': counters['bytes_decoded']}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark of the response compression for orders')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--bandwidth', type=float, default=50.0,
+                        help='Simulated bandwidth in Mbit/s (0: unlimited)')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        create_handler(pages=args.pages, bandwidth=args.bandwidth))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    encodings = ['identity', 'deflate', 'gzip']
+    if brotli:
+        encodings.append('br')
+
+    print(f"{'with[]':<45} {'encoding':<9} {'wire KiB':>10} "
+          f"{'decoded KiB':>12} {'ratio':>6} {'seconds':>8}")
+    for additional in WITH_COMBINATIONS:
+        for encoding in encodings:
+            result = run_benchmark(url=url, accept_encoding=encoding,
+                                   additional=additional)
+            ratio = result['decoded'] / max(result['transferred'], 1)
+            print(f"{','.join(additional) or '-':<45} {encoding:<9} "
+                  f"{result['transferred'] / 1024:>10.1f} "
+                  f"{result['decoded'] / 1024:>12.1f} {ratio:>6.1f} "
+                  f"{result['duration']:>8.2f}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
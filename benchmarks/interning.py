@@ -0,0 +1,109 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Benchmark of the memory usage of an order export with and without the
+string interner.
+
+Synthetic order pages (the same orders as in the compression benchmark) are
+created and decoded page by page, like the pages of a paginated request,
+until the export is complete. Each variant runs within its own process and
+reports the growth of its peak resident set size (RSS).
+
+Result for 50.000 orders: 507.5 MiB peak RSS and 2.47 seconds with the
+default decoder, 493.0 MiB and 4.40 seconds with the interner (about 3% less
+memory at twice the decoding time). The default of 500.000 orders needs
+about 5 GB of memory per variant.
+
+Usage:
+    python benchmarks/interning.py [--orders 500000]
+"""
+from multiprocessing import get_context
+import argparse
+import resource
+import sys
+import time
+import simplejson
+
+from plenty_api.interning import StringInterner
+from compression import build_order
+
+ITEMS_PER_PAGE = 250
+
+
+def get_peak_rss() -> int:
+    """ Peak resident set size of the process in bytes """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def build_pages(orders: int):
+    for first in range(0, orders, ITEMS_PER_PAGE):
+        last = min(first + ITEMS_PER_PAGE, orders)
+        yield simplejson.dumps([
+            build_order(order_id=order_id,
+                        additional=['orderItems.variation', 'addresses'])
+            for order_id in range(first, last)
+        ]).encode('utf-8')
+
+
+def run_export(orders: int, interned: bool, results) -> None:
+    interner = StringInterner() if interned else None
+    baseline = get_peak_rss()
+    entries = []
+    saved = 0
+    duration = 0.0
+    for page in build_pages(orders=orders):
+        start = time.perf_counter()
+        if interner:
+            (data, page_saved) = interner.decode(content=page)
+            saved += page_saved
+        else:
+            data = simplejson.loads(page)
+        duration += time.perf_counter() - start
+        entries += data
+    results.put({'orders': len(entries), 'rss': get_peak_rss() - baseline,
+                 'saved': saved, 'duration': duration})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Memory usage of an order export with string interning')
+    parser.add_argument('--orders', type=int, default=500000)
+    args = parser.parse_args()
+
+    context = get_context('spawn')
+    print(f"{'decoder':<9} {'orders':>8} {'peak RSS MiB':>13} "
+          f"{'reported saved MiB':>19} {'decode seconds':>15}")
+    for interned in [False, True]:
+        results = context.Queue()
+        process = context.Process(target=run_export,
+                                  args=(args.orders, interned, results))
+        process.start()
+        result = results.get()
+        process.join()
+        print(f"{'interned' if interned else 'json':<9} "
+              f"{result['orders']:>8} {result['rss'] / 2**20:>13.1f} "
+              f"{result['saved'] / 2**20:>19.1f} "
+              f"{result['duration']:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Benchmark of the memory usage and construction time of the 'records' and
+the 'lazy' data format (requires pysimdjson) compared to the 'json' format
+for orders with order items.
+
+Synthetic order pages (the same orders as in the compression benchmark) are
+encoded as JSON and decoded page by page, like the pages of a paginated
+request. In the 'records' format every page is converted into record
+objects right after it was decoded. The page peak is the largest amount of
+memory allocated temporarily for a single page. In the 'lazy' format, the
+consumer reads only the ID and the status of each order. The buffers of the
+on-demand parser are allocated outside of the Python allocator, they are not
+part of the measured memory (roughly a few times the size of the raw pages).
+
+For 20.000 orders the 'records' format retained 143 MiB instead of 186 MiB
+(about 23% less) with the same page peak (3.0 MiB), while the decoding took
+about twice as long (2.6 to 3.3 seconds instead of 1.1 to 1.4 seconds).
+
+Usage:
+    python benchmarks/records.py [--orders 20000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+import simplejson
+
+import plenty_api.lazy as lazy
+import plenty_api.records as records
+from compression import build_order
+
+ITEMS_PER_PAGE = 250
+
+
+def build_pages(orders: int) -> list:
+    pages = []
+    for first in range(0, orders, ITEMS_PER_PAGE):
+        last = min(first + ITEMS_PER_PAGE, orders)
+        pages.append(simplejson.dumps([
+            build_order(order_id=order_id,
+                        additional=['orderItems.variation', 'addresses'])
+            for order_id in range(first, last)
+        ]).encode('utf-8'))
+    return pages
+
+
+def decode_pages(pages: list, data_format: str, trace: bool = False):
+    entries = []
+    page_peak = 0
+    for page in pages:
+        if trace:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        if data_format == 'lazy':
+            data = lazy.parse_page(content=page)
+            for order in data:
+                (order['id'], order['statusId'])
+        else:
+            data = simplejson.loads(page)
+        if data_format == 'records':
+            data = records.convert(domain='order', data=data)
+        entries += data
+        del data
+        if trace:
+            page_peak = max(page_peak,
+                            tracemalloc.get_traced_memory()[1] - before)
+    return (entries, page_peak)
+
+
+def run_benchmark(pages: list, data_format: str) -> dict:
+    # Measure the duration without tracing, as tracemalloc slows down the
+    # creation of objects
+    gc.collect()
+    start = time.perf_counter()
+    (entries, _) = decode_pages(pages=pages, data_format=data_format)
+    duration = time.perf_counter() - start
+    del entries
+
+    gc.collect()
+    tracemalloc.start()
+    (entries, page_peak) = decode_pages(pages=pages, data_format=data_format,
+                                        trace=True)
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'orders': len(entries), 'duration': duration,
+            'retained': current, 'peak': peak, 'page_peak': page_peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Memory usage of the records data format for orders')
+    parser.add_argument('--orders', type=int, default=20000)
+    args = parser.parse_args()
+
+    pages = build_pages(orders=args.orders)
+    print(f"raw pages: {sum(len(page) for page in pages) / 2**20:.1f} MiB")
+    print(f"{'format':<8} {'orders':>8} {'retained MiB':>13} "
+          f"{'peak MiB':>9} {'page peak MiB':>14} {'seconds':>8}")
+    data_formats = ['json', 'records']
+    if lazy.is_available():
+        data_formats.append('lazy')
+    for data_format in data_formats:
+        result = run_benchmark(pages=pages, data_format=data_format)
+        print(f"{data_format:<8} {result['orders']:>8} "
+              f"{result['retained'] / 2**20:>13.1f} "
+              f"{result['peak'] / 2**20:>9.1f} "
+              f"{result['page_peak'] / 2**20:>14.1f} "
+              f"{result['duration']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,7 @@
 
 from pkg_resources import get_distribution, DistributionNotFound
 from .api import PlentyApi
+from .pool import PlentyApiPool
 
 try:
     __version__ = get_distribution('plenty_api').version
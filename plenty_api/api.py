@@ -19,6 +19,9 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from pathlib import Path
+import copy
+import math
+import threading
 import time
 from typing import Dict, List, Union
 import requests
@@ -28,13 +31,23 @@ import logging
 import tqdm
 import pandas
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, date, timedelta
 from json.decoder import JSONDecodeError
 
 import plenty_api.keyring
+import plenty_api.lazy
+import plenty_api.records
 import plenty_api.utils as utils
+from plenty_api.cache import ResponseCache
+from plenty_api.instrumentation import Instrumentation
+from plenty_api.resilience import (
+    CircuitBreaker, RateLimiter, RetryPolicy, get_circuit_breaker
+)
 from plenty_api.constants import (
-    IMPORT_ORDER_DATE_TYPES, ORDER_TYPES, VALID_LANGUAGES, DUMPABLE_CONTENT_TYPES
+    ORDER_TYPES, VALID_LANGUAGES, DUMPABLE_CONTENT_TYPES, ORDER_SHARD_SIZE,
+    REQUEST_TIMEOUT, CACHEABLE_ROUTES, MAX_URL_LENGTH,
+    MAX_IDS_PER_REQUEST, MAX_ITEMS_PER_PAGE
 )
 
 
@@ -45,12 +58,18 @@ class PlentyApi():
 
     Public methods:
         GET REQUESTS
+        **plenty_api_estimate_get_request**
+
+        **plenty_api_iterate_pages**
+
         **plenty_api_get_pending_redistribution**
 
         **plenty_api_get_pending_reorder**
 
         **plenty_api_get_orders_by_date**
 
+        **plenty_api_get_orders_by_ids**
+
         **plenty_api_get_attributes**
 
         **plenty_api_get_vat_id_mappings**
@@ -65,12 +84,18 @@ class PlentyApi():
 
         **plenty_api_get_variations**
 
+        **plenty_api_get_items_by_ids**
+
+        **plenty_api_get_variations_by_ids**
+
         **plenty_api_get_stock**
 
         **plenty_api_get_storagelocations**
 
         **plenty_api_get_variation_stock_batches**
 
+        **plenty_api_get_stock_batches_for_variations**
+
         **plenty_api_get_variation_warehouses**
 
         **plenty_api_get_contacts**
@@ -131,7 +156,11 @@ class PlentyApi():
 
     def __init__(self, base_url: str, login_method: str = 'keyring',
                  login_data: dict = None, data_format: str = 'json',
-                 debug: bool = False):
+                 debug: bool = False, retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 timeout: tuple = REQUEST_TIMEOUT,
+                 session: requests.Session = None,
+                 rate_limiter: RateLimiter = None):
         """
         Initialize the object and directly authenticate to the API to get
         the bearer token.
@@ -140,6 +169,8 @@ class PlentyApi():
             base_url    [str]   -   Base URL to the PlentyMarkets API
                                     Endpoint, format:
                                     [https://{name}.plentymarkets-cloud01.com]
+                                    or a local stub server
+                                    [http://127.0.0.1:{port}]
         OPTIONAL
             login_method[str]   -   Choose the login method from a variety of
                                     options:
@@ -147,23 +178,64 @@ class PlentyApi():
                                          plain_text, azure_credential]
             login_data  [dict]  -   Elements for the specific login method
             data_format [str]   -   Output format of the response
+                                    [json, dataframe, records, lazy]
             debug       [bool]  -   Print out additional information about the
                                     request URL and parameters
+            retry_policy[RetryPolicy] - Configuration for repeating requests
+                                    after server errors, timeouts and
+                                    connection resets (default: RetryPolicy())
+            circuit_breaker[CircuitBreaker] - Stop requests to an unreachable
+                                    system (default: breaker shared by all
+                                    instances with the same base_url)
+            timeout     [tuple] -   (connect, read) timeout in seconds for
+                                    every request, including the login
+            session     [Session] - HTTP session, whose connection pool is
+                                    used for all requests, can be shared by
+                                    multiple instances (default: new session)
+            rate_limiter[RateLimiter] - Limit the amount of requests per
+                                    second (default: no limit)
         """
         self.url = base_url
+        self.endpoints = utils.build_endpoint_map(url=base_url)
         self.keyring = plenty_api.keyring.CredentialManager()
         if debug:
             logging.basicConfig(level=logging.DEBUG)
         self.data_format = data_format.lower()
-        if data_format.lower() not in ['json', 'dataframe']:
+        if data_format.lower() not in ['json', 'dataframe', 'records',
+                                       'lazy']:
             self.data_format = 'json'
+        if self.data_format == 'lazy' and not plenty_api.lazy.is_available():
+            logging.warning("The 'lazy' data format requires pysimdjson, "
+                            "the responses are decoded completely")
         self.creds = {'Authorization': ''}
+        self.call_budget = {}
+        self.login_method = login_method
+        self.login_data = login_data
+        self.auth_lock = threading.Lock()
+        self.timeout = timeout
+        self.session = session if session else requests.Session()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        if not self.circuit_breaker:
+            self.circuit_breaker = get_circuit_breaker(base_url=base_url)
+        self.instrumentation = Instrumentation()
+        self.instrumentation.register_gauge(
+            'circuit_breaker', lambda: self.circuit_breaker.state)
         logged_in = self.__authenticate(
             login_method=login_method, login_data=login_data)
         if not logged_in:
             raise RuntimeError('Authentication failed')
 
         self.cli_progress_bar = False
+        self.checkpoint = None
+        self.raise_on_deadline = False
+        self.accept_encoding = utils.get_accept_encoding()
+        self.response_cache = ResponseCache()
+        self.offload = None
+        self.single_flight = None
+        self.page_size_tuner = None
+        self.string_interner = None
 
     def __authenticate(self, login_method: str, login_data: dict) -> bool:
         """
@@ -252,7 +324,8 @@ class PlentyApi():
                 login_data['credential_identifier'])
 
         endpoint = self.url + '/rest/login'
-        response = requests.post(endpoint, params=creds)
+        response = self.session.post(endpoint, params=creds,
+                                     timeout=self.timeout)
         if response.status_code == 403:
             logging.error(
                 "Login to API failed: your account is locked\n"
@@ -276,7 +349,8 @@ class PlentyApi():
                         "Wrong credentials: Please enter valid credentials."
                     )
                     creds = utils.update_keyring_creds(keyring=self.keyring)
-                    response = requests.post(endpoint, params=creds)
+                    response = self.session.post(endpoint, params=creds,
+                                                 timeout=self.timeout)
                     token = utils.build_login_token(
                         response_json=response.json())
                 else:
@@ -295,102 +369,330 @@ class PlentyApi():
         if not token:
             return False
 
-        self.creds['Authorization'] = token
+        # Replace the credentials at once, concurrent requests either use
+        # the old or the new token
+        self.creds = {'Authorization': token}
         return True
 
+    def __refresh_token(self, expired_token: str) -> bool:
+        """
+        Request a new bearer token after the token of a request expired.
+
+        Only one thread requests a new token, the other threads, whose
+        requests failed with the same token, use the new token.
+
+        Parameter:
+            expired_token   [str]       -   Authorization header of the
+                                            rejected request
+
+        Return:
+                        [bool]  -   True if the request can be repeated
+        """
+        with self.auth_lock:
+            if self.creds['Authorization'] != expired_token:
+                return True
+            if self.login_method == 'direct':
+                # Avoid an interactive prompt within a worker thread
+                return False
+            logging.info(f"Bearer token for {self.url} expired, login again")
+            return self.__authenticate(login_method=self.login_method,
+                                       login_data=self.login_data)
+
     def __plenty_api_request(self,
                              method: str,
                              domain: str,
                              query: dict = None,
                              data: dict = None,
-                             path: str = '') -> dict:
+                             path: str = '',
+                             idempotent: bool = None,
+                             deadline: float = None,
+                             lazy: bool = False) -> dict:
         """
         Make a request to the PlentyMarkets API.
 
+        Server errors, timeouts and connection resets are repeated according
+        to the retry policy (`self.retry_policy`). While the circuit
+        breaker (`self.circuit_breaker`) of the system is open, requests fail
+        immediately.
+
+        If a string interner is set (`self.string_interner`), repeated keys
+        and values of the response share a single object.
+
+        GET requests to the routes in `CACHEABLE_ROUTES` are stored within
+        the response cache (`self.response_cache`) and repeated as
+        conditional requests, a '304 Not Modified' response is answered with
+        the stored body.
+
+        The read timeout of each attempt is limited by the deadline, no
+        attempt is started after the deadline passed.
+
         Parameter:
             method      [str]   -   GET/POST
             domain      [str]   -   Orders/Items...
         (Optional)
             query       [dict]  -   Additional options for the request
             data        [dict]  -   Data body for post requests
+            idempotent  [bool]  -   Declare that the request can be repeated
+                                    safely (e.g. a POST request with an
+                                    idempotency guard), None leaves the
+                                    decision to the retry policy
+            deadline    [float] -   Point in time of the monotonic clock
+                                    (utils.get_deadline), None for no limit
+            lazy        [bool]  -   Parse the data records of the response on
+                                    access (plenty_api.lazy)
+
+        Raises:
+            utils.DeadlineExceeded  -   The deadline passed before the
+                                        request completed
         """
-        route = ''
         endpoint = ''
         raw_response = {}
         response = {}
 
-        route = utils.get_route(domain=domain)
-        endpoint = utils.build_endpoint(url=self.url, route=route, path=path)
+        domain_name = utils.resolve_domain(domain=domain)
+        endpoint = self.endpoints.get(domain_name)
+        if not endpoint:
+            logging.error(f"No valid endpoint for domain [{domain}] at "
+                          f"[{self.url}]")
+            return None
+        endpoint += path
         logging.debug(f"Endpoint: {endpoint}")
         if query:
             logging.debug(f"Params: {query}")
+
+        route = utils.get_route(domain=domain_name) + path
+        cache = self.response_cache
+        cache_key = None
+        cache_entry = None
+        conditional_headers = {}
+        if (
+            cache is not None and method.lower() == 'get' and
+            route in CACHEABLE_ROUTES
+        ):
+            cache_key = cache.build_key(route=route, query=query)
+            cache_entry = cache.get(key=cache_key)
+            self.instrumentation.increment(route, 'cache_lookups')
+            if cache_entry and cache.is_fresh(entry=cache_entry):
+                self.instrumentation.increment(route, 'cache_hits')
+                return copy.deepcopy(cache_entry.body)
+            if cache_entry:
+                conditional_headers = cache_entry.get_conditional_headers()
+
+        retry_policy = self.retry_policy
+        retry = retry_policy.allows_method(method=method,
+                                           idempotent=idempotent)
+        breaker = self.circuit_breaker
+        attempt = 0
+        throttled = 0
+        reauthenticated = False
+
+        def wait(delay: float) -> None:
+            remaining = utils.get_remaining_time(deadline=deadline)
+            if remaining is not None:
+                delay = max(min(delay, remaining), 0)
+            time.sleep(delay)
+
         while True:
-            if method.lower() == 'get':
-                raw_response = requests.get(endpoint, headers=self.creds,
-                                            params=query)
-
-            if method.lower() == 'post':
-                raw_response = requests.post(endpoint, headers=self.creds,
-                                             params=query, json=data)
-
-            if method.lower() == 'put':
-                raw_response = requests.put(endpoint, headers=self.creds,
-                                            params=query, json=data)
-
-            if raw_response.status_code != 429:
-                break
-            logging.warning(
-                "API:Request throttled, limit for subscription reached"
-            )
-            time.sleep(3)
+            remaining = utils.get_remaining_time(deadline=deadline)
+            if remaining is not None and remaining <= 0:
+                raise utils.DeadlineExceeded()
+            if self.rate_limiter and not self.rate_limiter.acquire(
+                    timeout=remaining):
+                raise utils.DeadlineExceeded()
+            if not breaker.allow_request():
+                self.instrumentation.increment(domain_name, 'rejected')
+                logging.error(f"Request {method} at {endpoint} rejected, the "
+                              f"circuit breaker for {self.url} is open")
+                return None
+            self.instrumentation.increment(domain_name, 'requests')
+            started = time.monotonic()
+            timeout = utils.get_request_timeout(timeout=self.timeout,
+                                                deadline=deadline)
+            headers = {**self.creds, 'Accept-Encoding': self.accept_encoding,
+                       **conditional_headers}
+            try:
+                if method.lower() == 'get':
+                    raw_response = self.session.get(
+                        endpoint, headers=headers, params=query,
+                        timeout=timeout)
+
+                if method.lower() == 'post':
+                    raw_response = self.session.post(
+                        endpoint, headers=headers, params=query, json=data,
+                        timeout=timeout)
+
+                if method.lower() == 'put':
+                    raw_response = self.session.put(
+                        endpoint, headers=headers, params=query, json=data,
+                        timeout=timeout)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as err:
+                remaining = utils.get_remaining_time(deadline=deadline)
+                if remaining is not None and remaining <= 0:
+                    # The timeout was shortened by the deadline
+                    breaker.release_probe()
+                    raise utils.DeadlineExceeded() from err
+                breaker.record_failure()
+                self.instrumentation.increment(domain_name, 'errors')
+                if retry and retry_policy.acquire(attempt=attempt):
+                    delay = retry_policy.get_delay(attempt=attempt)
+                    logging.warning(f"Request {method} at {endpoint} failed "
+                                    f"({err}), retry in {delay:.2f}s")
+                    self.instrumentation.increment(domain_name, 'retries')
+                    attempt += 1
+                    wait(delay)
+                    continue
+                logging.error(f"Request {method} at {endpoint} failed: {err}")
+                return None
+            except Exception:
+                breaker.release_probe()
+                raise
+
+            if raw_response.status_code == 429:
+                self.instrumentation.increment(domain_name, 'throttled')
+                throttled += 1
+                if throttled > retry_policy.max_throttled:
+                    breaker.record_failure()
+                    logging.error(f"Request {method} at {endpoint} throttled "
+                                  f"{throttled} times, giving up")
+                    return None
+                # Throttling shows that the system is reachable
+                breaker.record_success()
+                logging.warning(
+                    "API:Request throttled, limit for subscription reached"
+                )
+                wait(3)
+                continue
+
+            if raw_response.status_code == 401 and not reauthenticated:
+                reauthenticated = True
+                if self.__refresh_token(
+                        expired_token=headers['Authorization']):
+                    self.instrumentation.increment(domain_name,
+                                                   'reauthenticated')
+                    # The outcome is only known after the repeated request
+                    breaker.release_probe()
+                    continue
+
+            if raw_response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success(latency=time.monotonic() - started)
+
+            if (
+                retry and
+                retry_policy.allows_status(
+                    status_code=raw_response.status_code) and
+                retry_policy.acquire(attempt=attempt)
+            ):
+                self.instrumentation.increment(domain_name, 'errors')
+                delay = retry_policy.get_delay(attempt=attempt)
+                logging.warning(f"Request {method} at {endpoint} failed with "
+                                f"status {raw_response.status_code}, retry in "
+                                f"{delay:.2f}s")
+                self.instrumentation.increment(domain_name, 'retries')
+                attempt += 1
+                wait(delay)
+                continue
+            break
+
+        if raw_response.status_code < 500:
+            retry_policy.record_success()
+        else:
+            self.instrumentation.increment(domain_name, 'errors')
 
         logging.debug(f"request url: {raw_response.request.url}")
+        (transferred, decoded) = utils.get_response_size(
+            response=raw_response)
+        self.instrumentation.increment(domain_name, 'bytes_transferred',
+                                       transferred)
+        self.instrumentation.increment(domain_name, 'bytes_decoded', decoded)
+        call_budget = utils.get_call_budget(headers=raw_response.headers)
+        if call_budget:
+            self.call_budget = call_budget
+
+        if raw_response.status_code == 304 and cache_entry:
+            self.instrumentation.increment(route, 'cache_hits')
+            self.instrumentation.increment(route, 'not_modified')
+            cache.refresh(key=cache_key)
+            return copy.deepcopy(cache_entry.body)
 
         # if the response is a file, return raw content, so it can be written to a file
         if raw_response.headers['Content-Type'] in DUMPABLE_CONTENT_TYPES:
             return raw_response.content
 
         try:
-            response = raw_response.json()
-        except simplejson.errors.JSONDecodeError:
+            if lazy and not cache_key and raw_response.status_code == 200:
+                response = plenty_api.lazy.parse_page(
+                    content=raw_response.content)
+            elif self.string_interner:
+                (response, saved) = self.string_interner.decode(
+                    content=raw_response.content)
+                self.instrumentation.increment(domain_name, 'interned_bytes',
+                                               saved)
+            else:
+                response = raw_response.json()
+        # The on-demand parser raises a ValueError for invalid JSON
+        except (simplejson.errors.JSONDecodeError, ValueError):
             logging.error(f"No response for request {method} at {endpoint}")
             return None
 
         if isinstance(response, dict) and 'error' in response.keys():
             logging.error(f"Request failed:\n{response['error']['message']}")
+        elif cache_key and raw_response.status_code == 200:
+            cache.store(key=cache_key, body=response,
+                        headers=raw_response.headers)
 
         return response
 
 # GET REQUESTS
 
-    def __repeat_get_request_for_all_records(self,
-                                             domain: str,
-                                             query: dict,
-                                             path: str = '') -> dict:
+    def __iterate_get_request_pages(self,
+                                    domain: str,
+                                    query: dict,
+                                    path: str = '',
+                                    deadline: float = None,
+                                    lazy: bool = False):
         """
-        Collect data records from multiple API requests in a single JSON
-        data structure.
+        Request the pages of a GET route one after another and yield the data
+        records of each page as soon as it arrives.
 
-        Parameter:
-            domain      [str]   -   Orders/Items/..
-            query       [dict]  -   Additional options for the request
+        The query of the caller is not modified, so that it can be shared
+        by multiple threads.
 
-        Return:
-                        [dict]  -   API response in as javascript object
-                                    notation
-        """
-        response = self.__plenty_api_request(method='get',
-                                             domain=domain,
-                                             path=path,
-                                             query=query)
-        if not response:
-            return None
+        Routes with a known maximum page size (`MAX_ITEMS_PER_PAGE`) are
+        requested with that page size, unless the query sets `itemsPerPage`
+        or a page slice. If a page size tuner is set (`self.page_size_tuner`)
+        and no checkpoint is used, the tuner picks the page size instead.
 
-        if ((isinstance(response, dict) and 'error' in response.keys()) or
-                isinstance(response, list)):
-            return response
+        If a checkpoint is set (`self.checkpoint`), every completed page is
+        stored within it and an interrupted request with the same domain, path
+        and query yields the stored pages first and then continues with the
+        page after the last completed page.
 
-        page_info = utils.sniff_response_format(response=response, query=query)
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            query       [dict]  -   Additional options for the request
+        OPTIONAL
+            deadline    [float] -   Point in time of the monotonic clock
+                                    (utils.get_deadline), after which no
+                                    further page is requested
+            lazy        [bool]  -   Yield lazy records (plenty_api.lazy),
+                                    which are parsed on access, not used
+                                    together with a checkpoint
+
+        Raises:
+            utils.PaginationError   -   A request failed, the exception
+                                        contains the failed response
+                                        (None for an empty response)
+            utils.DeadlineExceeded  -   The deadline passed before the last
+                                        page was fetched
+
+        Yield:
+                        [list]  -   data records of a single page
+        """
+        query = dict(query)
         # Handle page slices (custom selection of pages)
         slice_start = ''
         slice_end = ''
@@ -399,57 +701,230 @@ class PlentyApi():
             slice_start = pages['start_page'] if 'start_page' in pages else ''
             slice_end = pages['end_page'] if 'end_page' in pages else ''
             logging.debug(f"Using page slice [{slice_start}:{slice_end}]")
-        if slice_start and slice_start >= 2:
-            entries = []
-        else:
-            entries = response[page_info['data']]
-
-        if self.cli_progress_bar and page_info['last_page']:
-            pbar = None
-            if not page_info['end_condition'](response):
-                pbar = tqdm.tqdm(desc=f'Plentymarkets {domain} request',
-                                 total=response[page_info['last_page']])
-        elif self.cli_progress_bar and not page_info['last_page']:
-            logging.warn(f"Response for {domain} has no pagination, unable to detect the number of pages.")
 
-        page = 1
-        while not page_info['end_condition'](response):
-            # Count from 1 onward if the response has no pagination
-            if page_info['page']:
-                page = response[page_info['page']] + 1
-            else:
-                page = page + 1
+        page = slice_start if slice_start and slice_start > 1 else 1
+        checkpoint = self.checkpoint
+        lazy = lazy and not checkpoint
+        domain_name = utils.resolve_domain(domain=domain)
+        tuner = None
+        max_page_size = MAX_ITEMS_PER_PAGE.get(domain_name)
+        if (
+            max_page_size and not path and 'itemsPerPage' not in query and
+            'pages' not in query
+        ):
+            tuner = self.page_size_tuner if not checkpoint else None
+            page_size = max_page_size
+            if tuner:
+                page_size = tuner.get_page_size(domain=domain_name,
+                                                maximum=max_page_size)
+            query.update({'itemsPerPage': page_size})
+
+        checkpoint_key = ''
+        if checkpoint:
+            checkpoint_key = checkpoint.build_key(domain=domain, path=path,
+                                                  query=query, url=self.url)
+            last_page, completed_pages = checkpoint.load(key=checkpoint_key)
+            if last_page:
+                logging.info(f"Resume {domain} request after page "
+                             f"{last_page} from the checkpoint")
+                yield from completed_pages
+                page = last_page + 1
+        if page > 1:
             query.update({'page': page})
 
-            if slice_end and page > slice_end:
-                # Skip requests for pages after the end of the slice
-                break
+        started = time.monotonic()
+        response = self.__plenty_api_request(method='get',
+                                             domain=domain,
+                                             path=path,
+                                             query=query,
+                                             deadline=deadline,
+                                             lazy=lazy)
+        if not response:
+            raise utils.PaginationError(response=None)
 
-            response = self.__plenty_api_request(method='get',
-                                                 domain=domain,
-                                                 path=path,
-                                                 query=query)
-            if not response:
-                return None
+        if isinstance(response, dict) and 'error' in response.keys():
+            raise utils.PaginationError(response=response)
 
-            if isinstance(response, dict) and 'error' in response.keys():
-                logging.error(f"subsequent {domain} API requests failed.")
-                return response
+        if isinstance(response, list):
+            yield response
+            return
 
-            if slice_start and page < slice_start:
-                # Skip pages before the beginning of the slice
-                continue
+        page_info = utils.sniff_response_format(response=response, query=query)
+        if page_info['page']:
+            page = response[page_info['page']]
+        if tuner:
+            tuner.record(domain=domain_name, page_size=page_size,
+                         records=len(response[page_info['data']]),
+                         seconds=time.monotonic() - started)
+        if checkpoint:
+            checkpoint.save_page(key=checkpoint_key, domain=domain, path=path,
+                                 query=query, page=page,
+                                 records=response[page_info['data']])
+        yield response[page_info['data']]
+
+        pbar = None
+        progress_bar = self.cli_progress_bar
+        if progress_bar and page_info['last_page']:
+            if not page_info['end_condition'](response):
+                pbar = tqdm.tqdm(desc=f'Plentymarkets {domain} request',
+                                 total=response[page_info['last_page']],
+                                 initial=page)
+        elif progress_bar and not page_info['last_page']:
+            logging.warn(f"Response for {domain} has no pagination, unable to detect the number of pages.")
 
-            entries += response[page_info['data']]
+        try:
+            while not page_info['end_condition'](response):
+                # Count from the first page onward if the response has no
+                # pagination
+                if page_info['page']:
+                    page = response[page_info['page']] + 1
+                else:
+                    page = page + 1
+                query.update({'page': page})
+
+                if slice_end and page > slice_end:
+                    # Skip requests for pages after the end of the slice
+                    break
+
+                started = time.monotonic()
+                response = self.__plenty_api_request(method='get',
+                                                     domain=domain,
+                                                     path=path,
+                                                     query=query,
+                                                     deadline=deadline,
+                                                     lazy=lazy)
+                if not response:
+                    raise utils.PaginationError(response=None)
+
+                if isinstance(response, dict) and 'error' in response.keys():
+                    logging.error(f"subsequent {domain} API requests failed.")
+                    raise utils.PaginationError(response=response)
+
+                if tuner:
+                    tuner.record(domain=domain_name, page_size=page_size,
+                                 records=len(response[page_info['data']]),
+                                 seconds=time.monotonic() - started)
 
-            if self.cli_progress_bar:
                 if pbar:
                     pbar.update(1)
 
-        if self.cli_progress_bar and page_info['last_page']:
+                if checkpoint:
+                    checkpoint.save_page(
+                        key=checkpoint_key, domain=domain, path=path,
+                        query=query, page=page,
+                        records=response[page_info['data']])
+                yield response[page_info['data']]
+        finally:
             if pbar:
                 pbar.close()
 
+        if checkpoint:
+            checkpoint.clear(key=checkpoint_key)
+
+    def __repeat_get_request_for_all_records(self,
+                                             domain: str,
+                                             query: dict,
+                                             path: str = '',
+                                             record_filter=None,
+                                             deadline: float = None,
+                                             projection: dict = None) -> dict:
+        """
+        Collect data records from multiple API requests in a single JSON
+        data structure.
+
+        When the deadline passes, the records collected so far are returned
+        as a `utils.PartialResult`, or `utils.DeadlineExceeded` is raised if
+        `self.raise_on_deadline` is set.
+
+        In the 'records' format, the data records of the order, variation,
+        stock and storage location routes are converted into compact record
+        objects (plenty_api.records) page by page, which reduces the memory
+        of the collected records at the cost of a slower decoding. In the
+        'lazy' format, the data records are parsed on access
+        (plenty_api.lazy).
+
+        If request coalescing is active (`self.single_flight`), identical
+        requests of multiple threads share a single upstream request
+        (requests with a `record_filter` are never shared). Each thread
+        applies its own deadline: a waiting thread stops waiting when its
+        deadline passes and a thread, whose deadline did not pass yet,
+        repeats the request if the shared result is incomplete.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            query       [dict]  -   Additional options for the request
+        OPTIONAL
+            record_filter[callable] - Applied to every record of a page as
+                                    soon as the page arrives, records for
+                                    which it returns False are discarded
+                                    instead of being collected
+            deadline    [float] -   Point in time of the monotonic clock
+                                    (utils.get_deadline), None for no limit
+            projection  [dict]  -   Reduce each record to these fields
+                                    (utils.build_projection) as soon as the
+                                    page arrives
+
+        Return:
+                        [dict]  -   API response in as javascript object
+                                    notation
+        """
+        def collect(raise_on_deadline: bool):
+            entries = []
+            try:
+                for records in self.__iterate_get_request_pages(
+                        domain=domain, query=query, path=path,
+                        deadline=deadline,
+                        lazy=self.data_format == 'lazy'):
+                    if record_filter:
+                        records = [
+                            record for record in records
+                            if record_filter(record)
+                        ]
+                    if projection:
+                        records = utils.project_record(record=records,
+                                                       projection=projection)
+                    if self.data_format == 'records':
+                        records = plenty_api.records.convert(
+                            domain=domain_name, path=path, data=records)
+                    entries += records
+            except utils.PaginationError as err:
+                return err.response
+            except utils.DeadlineExceeded as err:
+                if raise_on_deadline:
+                    raise utils.DeadlineExceeded(records=entries) from err
+                logging.warning(f"Deadline of the {domain} request exceeded, "
+                                f"return {len(entries)} records")
+                return utils.PartialResult(entries)
+
+            return entries
+
+        domain_name = utils.resolve_domain(domain=domain)
+        if self.single_flight is None or record_filter:
+            return collect(raise_on_deadline=self.raise_on_deadline)
+
+        key = (self.url, domain_name, path, utils.freeze_query(query=query),
+               repr(projection), self.data_format)
+        try:
+            # The shared request never raises on the deadline, as the
+            # waiting threads apply their own deadline to the result
+            (entries, shared) = self.single_flight.do(
+                key=key, function=lambda: collect(raise_on_deadline=False),
+                timeout=utils.get_remaining_time(deadline=deadline))
+        except TimeoutError as err:
+            if self.raise_on_deadline:
+                raise utils.DeadlineExceeded() from err
+            logging.warning(f"Deadline of the {domain} request exceeded "
+                            "while waiting for the request of another thread")
+            return utils.PartialResult()
+        if shared:
+            self.instrumentation.increment(domain_name, 'coalesced')
+        if isinstance(entries, utils.PartialResult):
+            remaining = utils.get_remaining_time(deadline=deadline)
+            if shared and (remaining is None or remaining > 0):
+                # The deadline of the other thread passed before the own one
+                return collect(raise_on_deadline=self.raise_on_deadline)
+            if self.raise_on_deadline:
+                raise utils.DeadlineExceeded(records=entries)
         return entries
 
     def __plenty_api_generic_get(self,
@@ -458,7 +933,10 @@ class PlentyApi():
                                  refine: dict = None,
                                  additional: list = None,
                                  query: dict = None,
-                                 lang: str = ''):
+                                 lang: str = '',
+                                 deadline: float = None,
+                                 fields: list = None,
+                                 sink=None):
         """
         Generic wrapper for GET routes that includes basic checks, repeated
         requests and data type conversion.
@@ -470,57 +948,372 @@ class PlentyApi():
             additional  [list]  -   Additional arguments for the query
             query       [dict]  -   Extra elements for the query
             lang        [str]   -   Language for the export
+            deadline    [float] -   Time budget in seconds for all pages
+            fields      [list]  -   Only keep these fields of each record,
+                                    nested fields are separated by a dot
+            sink        [Sink]  -   Write the records page by page into the
+                                    sink (plenty_api.sinks)
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
-        """
+                        [int]   -   Amount of written records with a sink,
+                                    a `utils.PartialCount` if the deadline
+                                    passed
+        """
+        projection = None
+        if fields:
+            if sink:
+                # The sink can't identify records without their key fields
+                key_fields = sink.get_key_fields(
+                    domain=utils.resolve_domain(domain=domain))
+                fields = list(dict.fromkeys(list(fields) + list(key_fields)))
+            projection = utils.build_projection(fields=fields)
+            if not path:
+                # Nested fields of a relation are only part of the response
+                # if the relation is requested
+                relations = utils.get_projection_relations(
+                    domain=domain, projection=projection)
+                additional = list(dict.fromkeys(
+                    (additional or []) + relations))
+
         query = utils.sanity_check_parameter(
             domain=domain, query=query, refine=refine,
             additional=additional,lang=lang)
 
+        deadline = utils.get_deadline(seconds=deadline)
+        if sink:
+            return self.__write_to_sink(domain=domain, path=path, query=query,
+                                        sink=sink, deadline=deadline,
+                                        projection=projection)
+
+        if self.offload and self.data_format == 'dataframe':
+            return self.__collect_dataframe(domain=domain, path=path,
+                                            query=query, deadline=deadline,
+                                            projection=projection)
+
         data = self.__repeat_get_request_for_all_records(
-            domain=domain, path=path, query=query)
+            domain=domain, path=path, query=query, deadline=deadline,
+            projection=projection)
 
-        return utils.transform_data_type(
-            data=data, data_format=self.data_format)
+        return self.__transform_data_type(data=data)
 
-    def __plenty_api_get_pending_non_sales_orders(self, refine: dict) -> list:
+    def __collect_dataframe(self, domain: str, query: dict, path: str = '',
+                            deadline: float = None, projection: dict = None):
+        """
+        Convert the pages of a GET request into a dataframe within the
+        worker processes of `self.offload`, while the next pages are fetched.
+
+        When the deadline passes, the pages converted so far are returned
+        as a dataframe flagged as partial (`attrs['partial']`), or
+        `utils.DeadlineExceeded` is raised with that dataframe as `records`
+        if `self.raise_on_deadline` is set.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            query       [dict]  -   Additional options for the request
+            path        [str]   -   Addition to the domain for a specific route
+            deadline    [float] -   Point in time of the monotonic clock
+                                    (utils.get_deadline), None for no limit
+            projection  [dict]  -   Reduce each record to these fields
+                                    (utils.build_projection)
+
+        Return:
+                        [DataFrame]
+        """
+        futures = []
+        partial = False
+        try:
+            for records in self.__iterate_get_request_pages(
+                    domain=domain, query=query, path=path, deadline=deadline):
+                if projection:
+                    records = utils.project_record(record=records,
+                                                   projection=projection)
+                if records:
+                    futures.append(self.offload.submit('json_to_dataframe',
+                                                       json=records))
+        except utils.PaginationError as err:
+            for future in futures:
+                future.cancel()
+            return utils.transform_data_type(data=err.response,
+                                             data_format=self.data_format)
+        except utils.DeadlineExceeded as err:
+            if self.raise_on_deadline:
+                raise utils.DeadlineExceeded(
+                    records=self.__concat_frames(futures=futures,
+                                                 partial=True)) from err
+            logging.warning(f"Deadline of the {domain} request exceeded, "
+                            f"return {len(futures)} pages")
+            partial = True
+
+        return self.__concat_frames(futures=futures, partial=partial)
+
+    def __concat_frames(self, futures: list, partial: bool = False):
+        """
+        Combine the dataframes of the converted pages.
+
+        Parameter:
+            futures     [list]  -   Conversions of the pages (offload)
+            partial     [bool]  -   Flag the dataframe as incomplete
+
+        Return:
+                        [DataFrame]
+        """
+        frames = [future.result() for future in futures]
+        if not frames:
+            return self.__transform_data_type(
+                data=utils.PartialResult() if partial else [])
+        data = pandas.concat(frames, ignore_index=True)
+        if partial:
+            data.attrs['partial'] = True
+        return data
+
+    def __write_to_sink(self, domain: str, query: dict, sink, path: str = '',
+                        deadline: float = None,
+                        projection: dict = None):
+        """
+        Write the pages of a GET request into a sink (plenty_api.sinks) as
+        soon as they arrive, instead of collecting the records in memory.
+
+        The sink receives the records in the 'json' format, the 'records'
+        and 'lazy' data formats only apply to returned records. When the
+        deadline passes, the amount of written records is returned as a
+        `utils.PartialCount`, or `utils.DeadlineExceeded` is raised if
+        `self.raise_on_deadline` is set.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            query       [dict]  -   Additional options for the request
+            sink        [Sink]  -   Destination of the records
+            path        [str]   -   Addition to the domain for a specific route
+            deadline    [float] -   Point in time of the monotonic clock
+                                    (utils.get_deadline), None for no limit
+            projection  [dict]  -   Reduce each record to these fields
+                                    (utils.build_projection)
+
+        Return:
+                        [int/dict] -   Amount of written records or the
+                                    error response of a failed page
+        """
+        domain_name = utils.resolve_domain(domain=domain)
+        written = 0
+        try:
+            for records in self.__iterate_get_request_pages(
+                    domain=domain, query=query, path=path, deadline=deadline):
+                if projection:
+                    records = utils.project_record(record=records,
+                                                   projection=projection)
+                sink.write(records=records, domain=domain_name)
+                written += len(records)
+        except utils.PaginationError as err:
+            logging.error(f"{domain} request failed after {written} records "
+                          "were written to the sink")
+            return err.response
+        except utils.DeadlineExceeded as err:
+            if self.raise_on_deadline:
+                raise utils.DeadlineExceeded(count=written) from err
+            logging.warning(f"Deadline of the {domain} request exceeded, "
+                            f"{written} records were written to the sink")
+            return utils.PartialCount(written)
+        return written
+
+    def __transform_data_type(self, data):
+        """
+        Convert the data into the configured format (`self.data_format`),
+        within a worker process if `self.offload` is set.
+
+        Parameter:
+            data        [list/dict] -   Decoded response data
+
+        Return:
+                        [JSON(Dict) / DataFrame] <= self.data_format
+        """
+        # Only lists are offloaded, JSON would turn integer keys into strings
+        if (
+            not self.offload or self.data_format != 'dataframe' or
+            not data or not isinstance(data, list)
+        ):
+            return utils.transform_data_type(data=data,
+                                             data_format=self.data_format)
+        converted = self.offload.run('transform_data_type', data=data,
+                                     data_format=self.data_format)
+        if isinstance(data, utils.PartialResult):
+            converted.attrs['partial'] = True
+        return converted
+
+    def __plenty_api_get_pending_non_sales_orders(
+        self, refine: dict, created_after: str = '',
+        transactions: bool = True, deadline: float = None
+    ) -> list:
         """
         Get all non sales orders that have not been finished yet.
         (Redistributions or Reorders)
+
+        Finished orders are discarded page by page, as soon as a page arrives,
+        so that they are never accumulated.
+
+        Without `created_after` all orders of the type are requested, as an
+        order can stay unfinished for any amount of time: a default window
+        would silently leave out old pending orders. Callers, which know the
+        age of their oldest pending order, should set `created_after` to
+        reduce the amount of transferred orders.
+
         Parameters:
             refine          [dict]      -   Refine arguments for the order
                                             search
+        OPTIONAL
+            created_after   [str]       -   Only search orders created after
+                                            the given date, which excludes
+                                            old finished orders on the server
+            transactions    [bool]      -   Add the transactions of each order
+                                            item to the response
+            deadline        [float]     -   Time budget in seconds for all
+                                            pages
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
         """
-        additional = ['orderItems.transactions']
+        query = {}
+        if created_after:
+            created_after = utils.parse_date(date=created_after)
+            if not created_after:
+                logging.error("Invalid created_after date for pending orders")
+                return None
+            query.update({'createdAtFrom': created_after})
+
+        additional = ['orderItems.transactions'] if transactions else None
         query = utils.sanity_check_parameter(domain='order',
-                                             query=None,
+                                             query=query,
                                              refine=refine,
                                              additional=additional)
 
-        orders = self.__repeat_get_request_for_all_records(domain='orders',
-                                                           query=query)
-        if isinstance(orders, dict) and 'error' in orders.keys():
+        orders = self.__repeat_get_request_for_all_records(
+            domain='orders', query=query,
+            record_filter=lambda order: not utils.is_finished_order(order),
+            deadline=utils.get_deadline(seconds=deadline))
+        if orders is None or (isinstance(orders, dict) and
+                              'error' in orders.keys()):
             logging.error("GET pending non sales orders failed with:\n"
                           f"{orders}")
             return None
 
-        pending_list = []
-        for order in orders:
-            finished = False
-            for event_date in order['dates']:
-                if event_date['typeId'] == IMPORT_ORDER_DATE_TYPES['finish']:
-                    finished = True
-            if not finished:
-                pending_list.append(order)
-        orders = utils.transform_data_type(data=pending_list,
-                                           data_format=self.data_format)
+        orders = self.__transform_data_type(data=orders)
 
         return orders
 
+    def plenty_api_estimate_get_request(self, domain: str, path: str = '',
+                                        refine: dict = None,
+                                        additional: list = None,
+                                        query: dict = None,
+                                        lang: str = '') -> dict:
+        """
+        Estimate the cost of a paginated GET request, by fetching only the
+        first page.
+
+        The amount of pages and records is read from the first page, the
+        duration is estimated with the duration of the first page, the
+        rate limiter and the remaining calls of the plentymarkets call limits.
+
+        Parameter:
+            domain      [str]   -   orders/items/...
+        OPTIONAL
+            path        [str]   -   Addition to the domain for a specific route
+            refine      [dict]  -   Apply filters to the request
+            additional  [list]  -   Additional arguments for the query
+            query       [dict]  -   Extra elements for the query
+            lang        [str]   -   Language for the export
+
+        Return:
+                        [dict]  -   Expected amount of calls (pages) and
+                                    records, duration in seconds and the
+                                    remaining calls of the day (-1 unknown)
+        """
+        query = utils.sanity_check_parameter(
+            domain=domain, query=query, refine=refine,
+            additional=additional, lang=lang)
+        query.pop('pages', None)
+        domain_name = utils.resolve_domain(domain=domain)
+        max_page_size = MAX_ITEMS_PER_PAGE.get(domain_name)
+        if max_page_size and not path and 'itemsPerPage' not in query:
+            page_size = max_page_size
+            if self.page_size_tuner:
+                page_size = self.page_size_tuner.chosen.get(domain_name,
+                                                            max_page_size)
+            query['itemsPerPage'] = page_size
+
+        started = time.monotonic()
+        response = self.__plenty_api_request(method='get', domain=domain,
+                                             path=path, query=query)
+        latency = time.monotonic() - started
+        if not response or (
+            isinstance(response, dict) and 'error' in response
+        ):
+            logging.error(f"GET {domain} estimate failed with:\n{response}")
+            return None
+
+        if isinstance(response, list):
+            (pages, records) = (1, len(response))
+        else:
+            page_info = utils.sniff_response_format(response=response,
+                                                    query=query)
+            page_records = len(response[page_info['data']])
+            pages = 1
+            if page_info['last_page']:
+                pages = max(int(response[page_info['last_page']]), 1)
+            records = utils.get_total_record_count(response=response)
+            if records < 0:
+                records = pages * page_records
+
+        rate = self.rate_limiter.rate if self.rate_limiter else None
+        call_budget = dict(self.call_budget)
+        calls_left = call_budget.get('long_calls_left', -1)
+        return {
+            'calls': pages,
+            'records': records,
+            'seconds': utils.estimate_duration(
+                calls=pages, latency=latency, call_budget=call_budget,
+                rate=rate),
+            'calls_left': calls_left,
+            'fits_budget': calls_left < 0 or pages <= calls_left
+        }
+
+    def plenty_api_iterate_pages(self, domain: str, path: str = '',
+                                 refine: dict = None,
+                                 additional: list = None,
+                                 query: dict = None, lang: str = '',
+                                 deadline: float = None, prefetch: int = 1):
+        """
+        Stream the records of a paginated GET request page by page, while
+        the next pages are fetched in the background.
+
+        Parameter:
+            domain      [str]   -   orders/items/...
+        OPTIONAL
+            path        [str]   -   Addition to the domain for a specific route
+            refine      [dict]  -   Apply filters to the request
+            additional  [list]  -   Additional arguments for the query
+            query       [dict]  -   Extra elements for the query
+            lang        [str]   -   Language for the export
+            deadline    [float] -   Time budget in seconds for all pages
+            prefetch    [int]   -   Maximum amount of pages fetched ahead of
+                                    the caller, 0 fetches a page only when
+                                    it is requested
+
+        Raises:
+            utils.PaginationError   -   A request failed
+            utils.DeadlineExceeded  -   The deadline passed before the last
+                                        page was fetched
+
+        Yield:
+                        [list]  -   data records of a single page
+        """
+        query = utils.sanity_check_parameter(
+            domain=domain, query=query, refine=refine,
+            additional=additional, lang=lang)
+        pages = self.__iterate_get_request_pages(
+            domain=domain, path=path, query=query,
+            deadline=utils.get_deadline(seconds=deadline))
+        yield from utils.prefetch(iterable=pages, window=prefetch)
+
     def plenty_api_dump_bi_raw_file(
         self, remote_files: Union[str, dict, list],
         download_directory: Path = Path('.')
@@ -610,14 +1403,14 @@ class PlentyApi():
                           f"{bi_files}")
             return None
 
-        bi_files = utils.transform_data_type(data=bi_files,
-                                           data_format=self.data_format)
+        bi_files = self.__transform_data_type(data=bi_files)
 
         return bi_files
 
     def plenty_api_get_pending_redistribution(
         self, order_id: int = 0, sender: int = 0, receiver: int = 0,
-        shipping_packages: str = ''
+        shipping_packages: str = '', created_after: str = '',
+        transactions: bool = True, deadline: float = None
     ) -> list:
         """
         Get all redistribution that have not been finished yet.
@@ -636,6 +1429,15 @@ class PlentyApi():
                                                 'minimal' - pull minimal info,
                                                 'full' - pull all information
                                             ]
+            created_after   [str]       -   Only search orders created after
+                                            this date (server side filter),
+                                            by default all orders are
+                                            searched
+            transactions    [bool]      -   Include the transactions of the
+                                            order items (default: True)
+            deadline        [float]     -   Time budget in seconds for all
+                                            pages, an incomplete result is
+                                            flagged as partial
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
@@ -648,8 +1450,10 @@ class PlentyApi():
             refine.update({'sender.warehouse': sender})
         if receiver:
             refine.update({'receiver.warehouse': receiver})
-        orders = self.__plenty_api_get_pending_non_sales_orders(refine=refine)
-        if shipping_packages != '':
+        orders = self.__plenty_api_get_pending_non_sales_orders(
+            refine=refine, created_after=created_after,
+            transactions=transactions, deadline=deadline)
+        if shipping_packages != '' and orders:
             for order in orders:
                 packages = self.plenty_api_get_shipping_packages_for_order(
                     order_id=order['id'], mode=shipping_packages)
@@ -657,7 +1461,9 @@ class PlentyApi():
         return orders
 
     def plenty_api_get_pending_reorder(
-        self, order_id: int = 0, sender: int = 0, receiver: int = 0
+        self, order_id: int = 0, sender: int = 0, receiver: int = 0,
+        created_after: str = '', transactions: bool = True,
+        deadline: float = None
     ) -> list:
         """
         Get all reorders that have not been finished yet.
@@ -669,6 +1475,15 @@ class PlentyApi():
                                             contact
             receiver        [int]       -   Plentymarkets ID of the receiver
                                             warehouse
+            created_after   [str]       -   Only search orders created after
+                                            this date (server side filter),
+                                            by default all orders are
+                                            searched
+            transactions    [bool]      -   Include the transactions of the
+                                            order items (default: True)
+            deadline        [float]     -   Time budget in seconds for all
+                                            pages, an incomplete result is
+                                            flagged as partial
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
@@ -680,11 +1495,14 @@ class PlentyApi():
             refine.update({'sender.contact': sender})
         if receiver:
             refine.update({'receiver.warehouse': receiver})
-        return self.__plenty_api_get_pending_non_sales_orders(refine=refine)
+        return self.__plenty_api_get_pending_non_sales_orders(
+            refine=refine, created_after=created_after,
+            transactions=transactions, deadline=deadline)
 
     def plenty_api_get_orders_by_date(self, start: str = '', end: str = '',
                                       date_type='creation', additional=None,
-                                      refine=None):
+                                      refine=None, workers: int = 1,
+                                      deadline: float = None, sink=None):
         """
         Get all orders within a specific date range.
 
@@ -702,9 +1520,20 @@ class PlentyApi():
                                         1 and 4 (sales orders and refund)
                                     And restrict it to only orders from the
                                     referrer with id '1'
+            workers     [int]   -   Split the date range into sub-ranges,
+                                    which are fetched by the given amount of
+                                    parallel threads (default 1: no split)
+            deadline    [float] -   Time budget in seconds for all pages, an
+                                    incomplete result is flagged as partial
+            sink        [Sink]  -   Write the orders page by page into the
+                                    sink (plenty_api.sinks) instead of
+                                    returning them
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
+                        [int]   -   Amount of written orders with a sink,
+                                    a `utils.PartialCount` if the deadline
+                                    passed
         """
         if not start:
             start = (date.today() - timedelta(days=1)).isoformat()
@@ -729,17 +1558,259 @@ class PlentyApi():
                                              refine=refine,
                                              additional=additional)
 
-        orders = self.__repeat_get_request_for_all_records(domain='orders',
-                                                           query=query)
-        if isinstance(orders, dict) and 'error' in orders.keys():
+        deadline = utils.get_deadline(seconds=deadline)
+        if workers > 1:
+            orders = self.__get_orders_in_shards(
+                date_range=date_range, date_type=date_type, query=query,
+                workers=workers, deadline=deadline, sink=sink)
+        elif sink:
+            orders = self.__write_to_sink(domain='orders', query=query,
+                                          sink=sink, deadline=deadline)
+        else:
+            orders = self.__repeat_get_request_for_all_records(
+                domain='orders', query=query, deadline=deadline)
+        if orders is None or (isinstance(orders, dict) and
+                              'error' in orders.keys()):
             logging.error(f"GET orders by date failed with:\n{orders}")
             return None
 
-        orders = utils.transform_data_type(data=orders,
-                                           data_format=self.data_format)
+        if sink:
+            return orders
+
+        orders = self.__transform_data_type(data=orders)
 
         return orders
 
+    def plenty_api_get_orders_by_ids(self, order_ids: list,
+                                     additional: list = None,
+                                     max_workers: int = 4):
+        """
+        Get multiple orders by their IDs.
+
+        Parameter:
+            order_ids   [list]  -   Plentymarkets IDs of the orders
+            additional  [list]  -   Additional arguments for the query as
+                                    specified in the manual
+            max_workers [int]   -   Amount of concurrent requests
+
+        Return:
+                        [dict/DataFrame]    -   {order ID: order or None}
+                                                or a DataFrame of the found
+                                                orders
+        """
+        return self.__get_records_by_ids(
+            domain='order', refine_key='orderIds', ids=order_ids,
+            additional=additional, max_workers=max_workers)
+
+    @staticmethod
+    def __chunk_refine_ids(url: str, query: dict, refine_key: str,
+                           ids: list) -> list:
+        """
+        Split a list of IDs into chunks for a comma separated refine argument,
+        so that every request stays within the URL length limit and the ID
+        limit of the server.
+
+        Parameter:
+            url         [str]   -   Complete URL of the route
+            query       [dict]  -   Remaining arguments of the query
+            refine_key  [str]   -   Refine argument for a list of IDs
+            ids         [list]  -   Plentymarkets IDs of the records
+
+        Return:
+                        [list]  -   list of ID lists
+        """
+        # Measure the complete encoded URL of a request with an empty refine
+        # argument and the longest page argument
+        prepared = requests.Request(
+            'GET', url,
+            params={**query, refine_key: '', 'page': 99999}).prepare()
+        return utils.chunk_ids(ids=ids,
+                               max_length=MAX_URL_LENGTH - len(prepared.url),
+                               max_ids=MAX_IDS_PER_REQUEST)
+
+    def __get_records_by_ids(self, domain: str, refine_key: str, ids: list,
+                             additional: list = None, lang: str = '',
+                             max_workers: int = 4):
+        """
+        Request records by their IDs in chunks, which fit into the URL length
+        limit and the ID limit of the server, and execute the chunks
+        concurrently.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            refine_key  [str]   -   Refine argument for a list of IDs
+            ids         [list]  -   Plentymarkets IDs of the records
+            additional  [list]  -   Additional arguments for the query
+            lang        [str]   -   Language for the export
+            max_workers [int]   -   Amount of concurrent requests
+
+        Return:
+                        [dict/DataFrame]    -   {ID: record or None} or a
+                                                DataFrame of the found records
+                                                (`attrs['missing_ids']`)
+        """
+        ids = list(dict.fromkeys(int(record_id) for record_id in ids))
+        if not ids:
+            return {}
+        query = utils.sanity_check_parameter(
+            domain=domain, query=None, additional=additional, lang=lang)
+        domain_name = utils.resolve_domain(domain=domain)
+        endpoint = self.endpoints.get(domain_name)
+        if not endpoint:
+            logging.error(f"No valid endpoint for domain [{domain}]")
+            return None
+        if domain_name in MAX_ITEMS_PER_PAGE:
+            # Set the page size here, so that it is part of the measured URL
+            query['itemsPerPage'] = MAX_ITEMS_PER_PAGE[domain_name]
+        chunks = self.__chunk_refine_ids(url=endpoint, query=query,
+                                         refine_key=refine_key, ids=ids)
+
+        def fetch(chunk: list) -> list:
+            chunk_query = {
+                **query, refine_key: ','.join(str(x) for x in chunk)
+            }
+            return self.__repeat_get_request_for_all_records(
+                domain=domain, query=chunk_query)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, chunks))
+
+        records = dict.fromkeys(ids)
+        for result in results:
+            if result is None or isinstance(result, dict):
+                logging.error(f"GET {domain} by IDs failed with:\n{result}")
+                return None
+            for record in result:
+                if record.get('id') in records:
+                    records[record['id']] = record
+
+        missing = [record_id for record_id, record in records.items()
+                   if record is None]
+        if missing:
+            logging.warning(f"{len(missing)} of {len(ids)} {domain} IDs not "
+                            f"found: {missing[:10]}")
+
+        if self.data_format == 'dataframe':
+            data = utils.transform_data_type(
+                data=[record for record in records.values() if record],
+                data_format=self.data_format)
+            if isinstance(data, pandas.DataFrame):
+                data.attrs['missing_ids'] = missing
+            return data
+        return records
+
+    def __get_orders_in_shards(self, date_range: dict, date_type: str,
+                               query: dict, workers: int,
+                               deadline: float = None, sink=None) -> list:
+        """
+        Fetch the orders of a date range in parallel sub-ranges (shards).
+
+        The date range is split into one shard per worker, the first page of
+        each shard is used to determine the amount of orders within it and
+        dense shards are split further to roughly `ORDER_SHARD_SIZE` orders.
+        Orders at the border of two shards are only returned once, with a
+        sink the shards write into the sink concurrently and border orders
+        can be written twice (the SQLite sink replaces them by ID).
+
+        Parameter:
+            date_range  [dict]  -   Start & End date in W3C date format
+            date_type   [str]   -   Type of date {Creation, Change, ...}
+            query       [dict]  -   Query without the date range
+            workers     [int]   -   Amount of parallel threads
+            deadline    [float] -   Point in time of the monotonic clock
+                                    (utils.get_deadline), None for no limit
+            sink        [Sink]  -   Write the orders into the sink instead
+                                    of collecting them
+
+        Raises:
+            utils.DeadlineExceeded  -   A shard exceeded the deadline and
+                                        `self.raise_on_deadline` is set, the
+                                        exception contains the orders (or
+                                        the written amount) of all shards
+
+        Return:
+                        [list]  -   Orders in the order of the shards, the
+                                    failed response if a shard fails,
+                                    a `utils.PartialResult` if a shard
+                                    exceeded the deadline
+                        [int]   -   Amount of written orders with a sink,
+                                    a `utils.PartialCount` if the deadline
+                                    passed
+        """
+        def build_shard_query(shard: dict) -> dict:
+            shard_query = dict(query)
+            shard_query.update(utils.build_query_date(date_range=shard,
+                                                      date_type=date_type))
+            return shard_query
+
+        def count_orders(shard: dict) -> int:
+            try:
+                response = self.__plenty_api_request(
+                    method='get', domain='orders',
+                    query={**build_shard_query(shard=shard),
+                           'itemsPerPage': 1},
+                    deadline=deadline)
+            except utils.DeadlineExceeded:
+                return -1
+            if not isinstance(response, dict) or 'error' in response:
+                return -1
+            return utils.get_total_record_count(response=response)
+
+        def fetch_shard(shard: dict) -> list:
+            # The exception of a shard is raised once for all shards, with
+            # the orders of the other shards
+            try:
+                if sink:
+                    return self.__write_to_sink(
+                        domain='orders', query=build_shard_query(shard=shard),
+                        sink=sink, deadline=deadline)
+                return self.__repeat_get_request_for_all_records(
+                    domain='orders', query=build_shard_query(shard=shard),
+                    deadline=deadline)
+            except utils.DeadlineExceeded as err:
+                return err
+
+        shards = utils.split_date_range(date_range=date_range, parts=workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sized_shards = []
+            for shard, count in zip(shards,
+                                    executor.map(count_orders, shards)):
+                if count == 0:
+                    continue
+                parts = math.ceil(count / ORDER_SHARD_SIZE) if count > 0 else 1
+                sized_shards += utils.split_date_range(date_range=shard,
+                                                       parts=parts)
+            logging.debug(f"Fetch orders in {len(sized_shards)} shards")
+            results = list(executor.map(fetch_shard, sized_shards))
+
+        for result in results:
+            if result is None or isinstance(result, dict):
+                return result
+        exceeded = [result for result in results
+                    if isinstance(result, utils.DeadlineExceeded)]
+
+        if sink:
+            written = sum(
+                result.count if isinstance(result, utils.DeadlineExceeded)
+                else result for result in results)
+            if exceeded:
+                raise utils.DeadlineExceeded(count=written) from exceeded[0]
+            if any(isinstance(result, utils.PartialCount)
+                   for result in results):
+                return utils.PartialCount(written)
+            return written
+
+        orders = utils.merge_unique_records(
+            pages=[result.records
+                   if isinstance(result, utils.DeadlineExceeded) else result
+                   for result in results],
+            key='id')
+        if exceeded:
+            raise utils.DeadlineExceeded(records=orders) from exceeded[0]
+        if any(isinstance(result, utils.PartialResult) for result in results):
+            return utils.PartialResult(orders)
+        return orders
+
     def plenty_api_get_attributes(self,
                                   additional: list = None,
                                   last_update: str = '',
@@ -796,16 +1867,43 @@ class PlentyApi():
             return None
 
         if variation_map:
-            variation = self.plenty_api_get_variations(
-                additional=['variationAttributeValues'])
-            attributes = utils.attribute_variation_mapping(
-                variation=variation, attribute=attributes)
+            attributes = self.__map_variations_to_attributes(
+                attributes=attributes)
 
-        attributes = utils.transform_data_type(data=attributes,
-                                               data_format=self.data_format)
+        attributes = self.__transform_data_type(data=attributes)
 
         return attributes
 
+    def __map_variations_to_attributes(self, attributes: list) -> list:
+        """
+        Stream all variations page by page into a compact index and add the
+        linked variations to each attribute value.
+
+        Parameter:
+            attributes  [list]  -   Attributes with values
+
+        Return:
+                        [list]  -   Attributes with linked variations
+        """
+        if not attributes:
+            return attributes
+
+        index = utils.AttributeValueIndex()
+        query = utils.sanity_check_parameter(
+            domain='variation', query=None,
+            additional=['variationAttributeValues'])
+        try:
+            for variations in self.__iterate_get_request_pages(
+                    domain='variation', query=query):
+                if not index.add_variations(variations=variations):
+                    return attributes
+        except utils.PaginationError as err:
+            logging.error("GET variations for the attribute mapping failed "
+                          f"with:\n{err.response}")
+            return attributes
+
+        return index.annotate(attributes=attributes)
+
     def plenty_api_get_vat_id_mappings(self, subset: List[int] = None):
         """
         Get a mapping of all VAT configuration IDs to each country or
@@ -828,10 +1926,13 @@ class PlentyApi():
             logging.error(f"GET VAT-configuration failed with:\n{vat_data}")
             return None
 
-        vat_table = utils.create_vat_mapping(data=vat_data, subset=subset)
+        if self.offload:
+            vat_table = self.offload.run('create_vat_mapping', data=vat_data,
+                                         subset=subset)
+        else:
+            vat_table = utils.create_vat_mapping(data=vat_data, subset=subset)
 
-        vat_table = utils.transform_data_type(data=vat_table,
-                                              data_format=self.data_format)
+        vat_table = self.__transform_data_type(data=vat_table)
         return vat_table
 
     def plenty_api_get_price_configuration(self,
@@ -875,14 +1976,14 @@ class PlentyApi():
                     utils.shrink_price_configuration(data=price))
             prices = minimal_prices
 
-        prices = utils.transform_data_type(data=prices,
-                                           data_format=self.data_format)
+        prices = self.__transform_data_type(data=prices)
         return prices
 
     def plenty_api_get_manufacturers(self,
                                      refine: dict = None,
                                      additional: list = None,
-                                     last_update: str = ''):
+                                     last_update: str = '',
+                                     deadline: float = None):
         """
         Get a list of manufacturers (brands), which are setup on
         PlentyMarkets.
@@ -900,6 +2001,8 @@ class PlentyApi():
                                         YYYY-MM-DDTHH:MM:SS+UTC-OFFSET
                                         YYYY-MM-DDTHH:MM
                                         YYYY-MM-DD
+            deadline    [float] -   Time budget in seconds for all pages, an
+                                    incomplete result is flagged as partial
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
@@ -910,7 +2013,8 @@ class PlentyApi():
         return self.__plenty_api_generic_get(domain='manufacturer',
                                              query=query,
                                              refine=refine,
-                                             additional=additional)
+                                             additional=additional,
+                                             deadline=deadline)
 
     def plenty_api_get_referrers(self,
                                  column: str = ''):
@@ -948,8 +2052,7 @@ class PlentyApi():
             logging.error(f"GET referrers failed with:\n{referrers}")
             return None
 
-        referrers = utils.transform_data_type(data=referrers,
-                                              data_format=self.data_format)
+        referrers = self.__transform_data_type(data=referrers)
 
         return referrers
 
@@ -957,7 +2060,10 @@ class PlentyApi():
                              refine: dict = None,
                              additional: list = None,
                              last_update: str = '',
-                             lang: str = ''):
+                             lang: str = '',
+                             deadline: float = None,
+                             fields: list = None,
+                             sink=None):
         """
         Get product data from PlentyMarkets.
 
@@ -978,9 +2084,21 @@ class PlentyApi():
                                     the following languages:
 
             (plenty documentation: https://rb.gy/r6koft)
+            deadline    [float] -   Time budget in seconds for all pages, an
+                                    incomplete result is flagged as partial
+            fields      [list]  -   Only keep these fields of each record,
+                                    nested fields are separated by a dot
+                                    Example:
+                                    ['id', 'number', 'stock.netStock']
+            sink        [Sink]  -   Write the records page by page into the
+                                    sink (plenty_api.sinks) instead of
+                                    returning them
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
+                        [int]   -   Amount of written records with a sink,
+                                    a `utils.PartialCount` if the deadline
+                                    passed
         """
         query = {}
         if last_update:
@@ -991,12 +2109,18 @@ class PlentyApi():
                                              query=query,
                                              refine=refine,
                                              additional=additional,
-                                             lang=lang)
+                                             lang=lang,
+                                             deadline=deadline,
+                                             fields=fields,
+                                             sink=sink)
 
     def plenty_api_get_variations(self,
                                   refine: dict = None,
                                   additional: list = None,
-                                  lang: str = ''):
+                                  lang: str = '',
+                                  deadline: float = None,
+                                  fields: list = None,
+                                  sink=None):
         """
         Get product data from PlentyMarkets.
 
@@ -1013,9 +2137,21 @@ class PlentyApi():
                                     Example: 'de', 'en', etc.
 
             (plenty documentation: https://rb.gy/r6koft)
+            deadline    [float] -   Time budget in seconds for all pages, an
+                                    incomplete result is flagged as partial
+            fields      [list]  -   Only keep these fields of each record,
+                                    nested fields are separated by a dot
+                                    Example:
+                                    ['id', 'number', 'stock.netStock']
+            sink        [Sink]  -   Write the records page by page into the
+                                    sink (plenty_api.sinks) instead of
+                                    returning them
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
+                        [int]   -   Amount of written records with a sink,
+                                    a `utils.PartialCount` if the deadline
+                                    passed
         """
         query = {}
 
@@ -1023,9 +2159,65 @@ class PlentyApi():
                                              refine=refine,
                                              additional=additional,
                                              query=query,
-                                             lang=lang)
+                                             lang=lang,
+                                             deadline=deadline,
+                                             fields=fields,
+                                             sink=sink)
 
-    def plenty_api_get_stock(self, refine: dict = None):
+    def plenty_api_get_items_by_ids(self, item_ids: list,
+                                    additional: list = None, lang: str = '',
+                                    max_workers: int = 4):
+        """
+        Get multiple items by their IDs.
+
+        Parameter:
+            item_ids    [list]  -   Plentymarkets IDs of the items
+            additional  [list]  -   Add additional elements to the response
+                                    data.
+                                    Example:
+                                    ['variations', 'itemImages']
+            lang        [str]   -   Provide the text within the data in one of
+                                    the following languages:
+            max_workers [int]   -   Amount of concurrent requests
+
+        Return:
+                        [dict/DataFrame]    -   {item ID: item or None}
+                                                or a DataFrame of the found
+                                                items
+        """
+        return self.__get_records_by_ids(
+            domain='item', refine_key='id', ids=item_ids,
+            additional=additional, lang=lang, max_workers=max_workers)
+
+    def plenty_api_get_variations_by_ids(self, variation_ids: list,
+                                         additional: list = None,
+                                         lang: str = '',
+                                         max_workers: int = 4):
+        """
+        Get multiple variations by their IDs.
+
+        Parameter:
+            variation_ids[list] -   Plentymarkets IDs of the variations
+            additional  [list]  -   Add additional elements to the response
+                                    data.
+                                    Example:
+                                    ['stock', 'images']
+            lang        [str]   -   Provide the text within the data in one
+                                    of the following languages:
+                                    Example: 'de', 'en', etc.
+            max_workers [int]   -   Amount of concurrent requests
+
+        Return:
+                        [dict/DataFrame]    -   {variation ID: variation or
+                                                None} or a DataFrame of the
+                                                found variations
+        """
+        return self.__get_records_by_ids(
+            domain='variation', refine_key='id', ids=variation_ids,
+            additional=additional, lang=lang, max_workers=max_workers)
+
+    def plenty_api_get_stock(self, refine: dict = None,
+                             deadline: float = None, sink=None):
         """
         Get stock data from PlentyMarkets.
 
@@ -1033,17 +2225,28 @@ class PlentyApi():
             refine      [dict]  -   Apply filters to the request
                                     Example:
                                     {'variationId': 2345}
+            deadline    [float] -   Time budget in seconds for all pages, an
+                                    incomplete result is flagged as partial
+            sink        [Sink]  -   Write the stock rows page by page into the
+                                    sink (plenty_api.sinks) instead of
+                                    returning them
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
+                        [int]   -   Amount of written records with a sink,
+                                    a `utils.PartialCount` if the deadline
+                                    passed
         """
         return self.__plenty_api_generic_get(domain='stockmanagement',
-                                             refine=refine)
+                                             refine=refine,
+                                             deadline=deadline,
+                                             sink=sink)
 
     def plenty_api_get_storagelocations(self,
                                         warehouse_id: int,
                                         refine: dict = None,
-                                        additional: list = None):
+                                        additional: list = None,
+                                        deadline: float = None):
         """
         Get storage location data from PlentyMarkets.
 
@@ -1056,6 +2259,8 @@ class PlentyApi():
                                     data.
                                     Example:
                                     ['warehouseLocation']
+            deadline    [float] -   Time budget in seconds for all pages, an
+                                    incomplete result is flagged as partial
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
@@ -1064,7 +2269,8 @@ class PlentyApi():
             domain='warehouses',
             path=f'/{warehouse_id}/stock/storageLocations',
             refine=refine,
-            additional=additional)
+            additional=additional,
+            deadline=deadline)
 
     def plenty_api_get_variation_stock_batches(self, variation_id: int):
         """
@@ -1094,6 +2300,90 @@ class PlentyApi():
         # return ordered by best before date (oldest first)
         return sorted(storage_data, key=lambda s: s['bestBeforeDate'])
 
+    def plenty_api_get_stock_batches_for_variations(
+        self, variation_ids: List[int], max_workers: int = 4
+    ) -> Dict[int, list]:
+        """
+        Get all storage locations from all available warehouses for multiple
+        variations at once.
+
+        In contrast to `plenty_api_get_variation_stock_batches`, the stock of
+        the variations is requested in chunks of variation IDs and every
+        warehouse that contains stock of at least one of the variations is
+        requested only once for each chunk, the requests are executed
+        concurrently.
+
+        Parameter:
+            variation_ids[list] -   Plentymarkets IDs of the target variations
+        OPTIONAL
+            max_workers [int]   -   Amount of concurrent requests
+
+        Return:
+                        [dict]  -   Mapping of each variation ID to a list of
+                                    storage locations ordered by the
+                                    `bestBeforeDate`, None if a stock or
+                                    storage location request failed
+        """
+        variation_ids = {int(variation_id) for variation_id in variation_ids}
+        batches: Dict[int, list] = {
+            variation_id: [] for variation_id in variation_ids
+        }
+        if not variation_ids:
+            return batches
+
+        # The storage location route is longer than the stock route, a chunk
+        # that fits into it fits into both
+        location_url = (f"{self.endpoints['warehouses']}/"
+                        f"{10**9}/stock/storageLocations")
+        chunks = self.__chunk_refine_ids(
+            url=location_url, query={}, refine_key='variationId',
+            ids=sorted(variation_ids))
+
+        def fetch_stock(chunk: list) -> list:
+            # returns only locations with positive stock
+            return self.__repeat_get_request_for_all_records(
+                domain='stockmanagement',
+                query={'variationId': ','.join(str(x) for x in chunk)})
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            stock_chunks = list(executor.map(fetch_stock, chunks))
+
+        requests_per_warehouse = []
+        for stock in stock_chunks:
+            if stock is None or isinstance(stock, dict):
+                logging.error(f"GET stock failed with:\n{stock}")
+                return None
+            warehouse_map = utils.group_stock_by_warehouse(
+                stock=stock, variation_ids=variation_ids)
+            requests_per_warehouse += warehouse_map.items()
+
+        def fetch_warehouse(warehouse_id: int, stocked: set) -> list:
+            return self.__repeat_get_request_for_all_records(
+                domain='warehouses',
+                path=f'/{warehouse_id}/stock/storageLocations',
+                query={'variationId': ','.join(
+                    str(x) for x in sorted(stocked))})
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            locations = executor.map(lambda x: fetch_warehouse(*x),
+                                      requests_per_warehouse)
+            for (warehouse_id, stocked), warehouse_locations in zip(
+                    requests_per_warehouse, locations):
+                if warehouse_locations is None or isinstance(
+                        warehouse_locations, dict):
+                    logging.error("GET storage locations for warehouse "
+                                  f"{warehouse_id} failed with:\n"
+                                  f"{warehouse_locations}")
+                    return None
+                for location in warehouse_locations:
+                    if location['variationId'] in stocked:
+                        batches[location['variationId']].append(location)
+
+        # order by best before date (oldest first)
+        for locations in batches.values():
+            locations.sort(key=lambda s: s['bestBeforeDate'])
+        return batches
+
     def plenty_api_get_variation_warehouses(self,
                                             item_id: int,
                                             variation_id: int) -> list:
@@ -1114,7 +2404,9 @@ class PlentyApi():
 
     def plenty_api_get_contacts(self,
                                 refine: dict = None,
-                                additional: list = None):
+                                additional: list = None,
+                                deadline: float = None,
+                                sink=None):
         """
         List all contacts on the Plentymarkets system.
 
@@ -1126,14 +2418,24 @@ class PlentyApi():
                                     data.
                                     Example:
                                     ['addresses']
+            deadline    [float] -   Time budget in seconds for all pages, an
+                                    incomplete result is flagged as partial
+            sink        [Sink]  -   Write the records page by page into the
+                                    sink (plenty_api.sinks) instead of
+                                    returning them
 
         Return:
                         [JSON(Dict) / DataFrame] <= self.data_format
+                        [int]   -   Amount of written records with a sink,
+                                    a `utils.PartialCount` if the deadline
+                                    passed
         """
         return self.__plenty_api_generic_get(
             domain='contact',
             refine=refine,
-            additional=additional)
+            additional=additional,
+            deadline=deadline,
+            sink=sink)
 
     def plenty_api_get_property_names(
         self, property_id: Union[int, List[int]] = None,
@@ -1287,8 +2589,7 @@ class PlentyApi():
         path = f'/shipping/packages/{package_id}/items'
         orders = self.__repeat_get_request_for_all_records(
             domain='order', path=path, query={})
-        return utils.transform_data_type(
-            data=orders, data_format=self.data_format)
+        return self.__transform_data_type(data=orders)
 
     def plenty_api_get_shipping_packages_for_order(self, order_id: int,
                                                    mode: str = 'full'):
@@ -1314,6 +2615,9 @@ class PlentyApi():
                 package['content'] = package_response
                 package_responses.append(package)
 
+        if self.offload:
+            return self.offload.run('summarize_shipment_packages',
+                                    response=package_responses, mode=mode)
         return utils.summarize_shipment_packages(
             response=package_responses, mode=mode)
 
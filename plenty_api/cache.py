@@ -0,0 +1,144 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+import copy
+import threading
+import time
+
+import plenty_api.utils as utils
+
+
+@dataclass
+class CacheEntry:
+    """ Response body of a GET request together with its validators """
+    body: object
+    etag: str = ''
+    last_modified: str = ''
+    stored_at: float = 0.0
+
+    def get_conditional_headers(self) -> dict:
+        """
+        Build the headers of a conditional request for the entry.
+
+        Return:
+                        [dict]
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache():
+    """
+    Store the responses of rarely changing GET routes together with their
+    validators (ETag, Last-Modified).
+
+    A stored response is either served directly, while it is younger than
+    `max_age` seconds, or it is revalidated by a conditional request, which
+    is answered with '304 Not Modified' if the data didn't change.
+    The least recently used entries are removed when the cache is full.
+    """
+    def __init__(self, max_entries: int = 256, max_age: float = 0.0):
+        """
+        Parameter:
+            max_entries [int]   -   Maximum amount of stored responses
+            max_age     [float] -   Seconds in which a stored response is
+                                    served without a conditional request
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def build_key(route: str, query: dict) -> tuple:
+        """
+        Create the identifier of a request.
+
+        Parameter:
+            route       [str]   -   Route and path of the request
+            query       [dict]  -   Params of the request
+
+        Return:
+                        [tuple]
+        """
+        return (route, utils.freeze_query(query=query or {}))
+
+    def get(self, key: tuple) -> CacheEntry:
+        """
+        Get the stored entry of a request.
+
+        Parameter:
+            key         [tuple] -   Identifier of the request (`build_key`)
+
+        Return:
+                        [CacheEntry/None]
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """ Check if the entry can be served without a conditional request """
+        return time.monotonic() - entry.stored_at < self.max_age
+
+    def store(self, key: tuple, body: object, headers: dict) -> bool:
+        """
+        Store the response of a request, if it contains a validator.
+
+        Parameter:
+            key         [tuple] -   Identifier of the request (`build_key`)
+            body        [object]-   Decoded response body
+            headers     [dict]  -   Response headers
+
+        Return:
+                        [bool]  -   True if the response was stored
+        """
+        etag = headers.get('ETag', '')
+        last_modified = headers.get('Last-Modified', '')
+        if not etag and not last_modified:
+            return False
+        entry = CacheEntry(body=copy.deepcopy(body), etag=etag,
+                           last_modified=last_modified,
+                           stored_at=time.monotonic())
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return True
+
+    def refresh(self, key: tuple) -> None:
+        """ Restart the `max_age` period of a revalidated entry """
+        with self.lock:
+            if key in self.entries:
+                self.entries[key].stored_at = time.monotonic()
+
+    def clear(self) -> None:
+        """ Remove all stored responses """
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,165 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pathlib import Path
+from typing import Iterator, Tuple
+import hashlib
+import sqlite3
+import threading
+import simplejson
+
+import plenty_api.utils as utils
+
+
+class PaginationCheckpoint():
+    """
+    Persist the progress of paginated GET requests within a SQLite database,
+    so that an interrupted request can be resumed at the page after the last
+    completed page.
+
+    Each request is identified by the plentymarkets system, its domain, path
+    and query (without the page number), the records of every completed page
+    are stored together with the page number. The entries of a request are
+    removed as soon as the request completed successfully.
+    """
+    def __init__(self, path: Path):
+        """
+        Parameter:
+            path        [Path]  -   Location of the SQLite database file,
+                                    created if it doesn't exist
+        """
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(str(self.path),
+                                          check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS requests ('
+                'key TEXT PRIMARY KEY, domain TEXT, path TEXT, query TEXT, '
+                'last_page INTEGER)'
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS pages ('
+                'key TEXT, page INTEGER, records TEXT, '
+                'PRIMARY KEY (key, page))'
+            )
+
+    @staticmethod
+    def build_key(domain: str, path: str, query: dict, url: str = '') -> str:
+        """
+        Create the identifier of a request.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            path        [str]   -   Addition to the domain for a specific route
+            query       [dict]  -   Params of the request, the page number is
+                                    ignored
+            url         [str]   -   Base URL of the plentymarkets system, so
+                                    that multiple systems can share a
+                                    checkpoint
+
+        Return:
+                        [str]
+        """
+        query = {name: value for name, value in query.items()
+                 if name != 'page'}
+        identifier = simplejson.dumps(
+            [url.rstrip('/').lower(), utils.resolve_domain(domain=domain),
+             path, utils.freeze_query(query=query)], default=str)
+        return hashlib.sha1(identifier.encode('utf-8')).hexdigest()
+
+    def load(self, key: str) -> Tuple[int, Iterator[list]]:
+        """
+        Get the last completed page and the records of the completed pages.
+
+        The pages are read from the database one at a time, while they are
+        consumed, so that resuming a large request doesn't load all of its
+        completed pages into memory at once.
+
+        Parameter:
+            key         [str]   -   Identifier of the request (`build_key`)
+
+        Return:
+                        [tuple] -   last completed page (0 if unknown) and
+                                    an iterator of the records of each page
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT last_page FROM requests WHERE key = ?', (key,)
+            ).fetchone()
+        if not row:
+            return (0, iter(()))
+        return (row[0], self.__iterate_pages(key=key))
+
+    def __iterate_pages(self, key: str) -> Iterator[list]:
+        with self.lock:
+            pages = [page for (page,) in self.connection.execute(
+                'SELECT page FROM pages WHERE key = ? ORDER BY page', (key,))]
+        for page in pages:
+            # The lock isn't held while the caller processes the page, as
+            # the caller stores the following pages in the meantime
+            with self.lock:
+                row = self.connection.execute(
+                    'SELECT records FROM pages WHERE key = ? AND page = ?',
+                    (key, page)
+                ).fetchone()
+            if row:
+                yield simplejson.loads(row[0])
+
+    def save_page(self, key: str, domain: str, path: str, query: dict,
+                  page: int, records: list) -> None:
+        """
+        Store the records of a completed page and mark it as the last
+        completed page within a single transaction.
+
+        Parameter:
+            key         [str]   -   Identifier of the request (`build_key`)
+            domain      [str]   -   Orders/Items/..
+            path        [str]   -   Addition to the domain for a specific route
+            query       [dict]  -   Params of the request
+            page        [int]   -   Number of the completed page
+            records     [list]  -   Data records of the page
+        """
+        query = {name: value for name, value in query.items()
+                 if name != 'page'}
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO pages (key, page, records) '
+                'VALUES (?, ?, ?)',
+                (key, page, simplejson.dumps(records))
+            )
+            self.connection.execute(
+                'INSERT OR REPLACE INTO requests '
+                '(key, domain, path, query, last_page) VALUES (?, ?, ?, ?, ?)',
+                (key, domain, path, simplejson.dumps(query, default=str),
+                 page)
+            )
+
+    def clear(self, key: str) -> None:
+        """ Remove a completed request from the checkpoint """
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM pages WHERE key = ?', (key,))
+            self.connection.execute('DELETE FROM requests WHERE key = ?',
+                                    (key,))
+
+    def close(self) -> None:
+        """ Close the database connection """
+        with self.lock:
+            self.connection.close()
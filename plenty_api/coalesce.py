@@ -0,0 +1,101 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Callable, Hashable, Tuple
+import copy
+import threading
+
+
+class _Flight():
+    """ State of a running request shared with the waiting threads """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight():
+    """
+    Coalesce identical requests, which are made at the same time by multiple
+    threads, into a single request.
+
+    The first thread (leader) executes the request, every thread that asks
+    for the same key while the request is running waits for the result of
+    the leader. Every thread receives its own copy of the result, so that
+    modifications of one caller do not affect the others.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def do(self, key: Hashable, function: Callable,
+           timeout: float = None) -> Tuple[object, bool]:
+        """
+        Execute the function, unless an identical request is running.
+
+        Parameter:
+            key         [hashable]  -   Identifier of the request
+            function    [callable]  -   Request without arguments
+            timeout     [float]     -   Maximum amount of seconds to wait
+                                        for the request of another thread,
+                                        None to wait until it completes
+
+        Raises:
+            TimeoutError    -   The request of another thread did not
+                                complete within the timeout
+
+        Return:
+                        [tuple]     -   result and True if the result of
+                                        another thread was used
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self.flights[key] = flight
+            else:
+                flight.followers += 1
+
+        if not leader:
+            if timeout is not None:
+                timeout = max(timeout, 0)
+            if not flight.done.wait(timeout=timeout):
+                raise TimeoutError(f"Shared request {key} still running "
+                                   f"after {timeout:.2f}s")
+            if flight.error:
+                raise flight.error
+            return (copy.deepcopy(flight.result), True)
+
+        try:
+            flight.result = function()
+        except Exception as err:
+            flight.error = err
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+                followers = flight.followers
+            flight.done.set()
+
+        if followers:
+            return (copy.deepcopy(flight.result), False)
+        return (flight.result, False)
@@ -62,6 +62,29 @@ VALID_ROUTES = [
 ]
 DOMAIN_ROUTE_MAP = dict(zip(VALID_DOMAINS, VALID_ROUTES))
 
+# Alternative names for the domains, that are accepted in addition to the
+# names in VALID_DOMAINS (case-insensitive)
+DOMAIN_ALIASES = {
+    'attributes': 'attribute',
+    'contacts': 'contact',
+    'items': 'item',
+    'manufacturers': 'manufacturer',
+    'orders': 'order',
+    'price': 'prices',
+    'redistributions': 'redistribution',
+    'reorders': 'reorder',
+    'referrers': 'referrer',
+    'stock': 'stockmanagement',
+    'variations': 'variation',
+    'warehouse': 'warehouses',
+    'properties': 'property',
+    'v2properties': 'v2property',
+}
+# Resolve any accepted domain name to the domain name from VALID_DOMAINS
+DOMAIN_LOOKUP = {
+    **{domain: domain for domain in VALID_DOMAINS}, **DOMAIN_ALIASES
+}
+
 # Mapping of date_type function parameter value to query parameter
 # the date_type function parameter is supposed to be more descriptive
 ORDER_DATE_ARGUMENTS = {
@@ -71,6 +94,69 @@ ORDER_DATE_ARGUMENTS = {
     'delivery': 'outgoingItemsBooked'
 }
 
+# Maximum page size (itemsPerPage) of paginated GET routes, requests are made
+# with the maximum page size to reduce the amount of round-trips
+MAX_ITEMS_PER_PAGE = {
+    'order': 250,
+    'item': 250,
+    'variation': 250,
+    'contact': 250,
+    'manufacturer': 250,
+    'attribute': 250,
+    'bi_raw': 100,
+}
+
+# Base URLs of a local server (e.g. a stub for tests and benchmarks), which
+# are accepted without https
+LOCAL_URL = r'http://(localhost|127\.0\.0\.1|\[::1\])(:\d+)?/?$'
+
+# Maximum length of a request URL and maximum amount of IDs within a single
+# refine argument, for requests of many records by their IDs
+MAX_URL_LENGTH = 2000
+MAX_IDS_PER_REQUEST = 100
+
+# Fields with few distinct values, whose values are shared across all
+# records of a response (plenty_api.interning)
+INTERNED_FIELDS = frozenset([
+    'typeId', 'statusId', 'statusName', 'plentyId', 'referrerId',
+    'warehouseId', 'countryId', 'countryVatId', 'shippingProfileId',
+    'currency', 'lang', 'isoCode2', 'direction', 'status', 'gender',
+    'exchangeRate', 'vatRate', 'vatField', 'unit', 'orderType',
+])
+
+# Response headers of the plentymarkets call limits, short period: calls
+# within a few seconds, long period: calls within the day
+CALL_LIMIT_HEADERS = {
+    'short_limit': 'X-Plenty-Global-Short-Period-Limit',
+    'short_calls_left': 'X-Plenty-Global-Short-Period-Calls-Left',
+    'short_decay': 'X-Plenty-Global-Short-Period-Decay',
+    'long_limit': 'X-Plenty-Global-Long-Period-Limit',
+    'long_calls_left': 'X-Plenty-Global-Long-Period-Calls-Left',
+    'long_decay': 'X-Plenty-Global-Long-Period-Decay',
+}
+
+# Fields, which identify a record of a domain within a sink
+# (plenty_api.sinks), the records of other domains are identified by their ID
+SINK_RECORD_KEYS = {
+    'stockmanagement': ('variationId', 'warehouseId'),
+}
+
+# Routes (with path) of rarely changing data, which are stored within the
+# response cache and revalidated with conditional requests
+CACHEABLE_ROUTES = frozenset([
+    '/rest/vat',
+    '/rest/orders/referrers',
+    '/rest/items/sales_prices',
+    '/rest/properties/names',
+])
+
+# Default (connect, read) timeout in seconds for each request
+REQUEST_TIMEOUT = (10.0, 120.0)
+
+# Targeted amount of orders for each date range, when the orders of a date
+# range are fetched in multiple parallel sub-ranges
+ORDER_SHARD_SIZE = 2500
+
 ORDER_TYPES = {
     'reorder': 12,
     'redistribution': 15
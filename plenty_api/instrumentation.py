@@ -0,0 +1,86 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from collections import defaultdict
+from typing import Callable
+import threading
+
+
+class Instrumentation():
+    """
+    Thread-safe collection of counters for each domain (or route) of the
+    requests made by a PlentyApi instance.
+
+    Counters are created on first use, gauges are functions that are
+    evaluated whenever a snapshot is taken (e.g. the state of a circuit
+    breaker).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(lambda: defaultdict(float))
+        self.gauges = {}
+
+    def increment(self, domain: str, counter: str,
+                  amount: float = 1) -> None:
+        """
+        Increase a counter of a domain.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/.. or a route
+            counter     [str]   -   Name of the counter (e.g. 'retries')
+            amount      [float] -   Value added to the counter
+        """
+        with self.lock:
+            self.counters[domain][counter] += amount
+
+    def register_gauge(self, name: str, gauge: Callable) -> None:
+        """
+        Add a value, which is determined at the time of the snapshot.
+
+        Parameter:
+            name        [str]       -   Key of the value within the snapshot
+            gauge       [callable]  -   Function without arguments
+        """
+        with self.lock:
+            self.gauges[name] = gauge
+
+    def snapshot(self) -> dict:
+        """
+        Get a copy of all counters and the current values of all gauges.
+
+        Return:
+                        [dict]  -   {'counters': {domain: {name: value}},
+                                     'gauges': {name: value}}
+        """
+        with self.lock:
+            counters = {
+                domain: dict(values)
+                for domain, values in self.counters.items()
+            }
+            gauges = dict(self.gauges)
+        return {
+            'counters': counters,
+            'gauges': {name: gauge() for name, gauge in gauges.items()}
+        }
+
+    def reset(self) -> None:
+        """ Remove all counters """
+        with self.lock:
+            self.counters.clear()
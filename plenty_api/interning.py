@@ -0,0 +1,113 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Tuple
+import sys
+import threading
+import simplejson
+
+from plenty_api.constants import INTERNED_FIELDS
+
+
+class StringInterner():
+    """
+    Decode responses, while sharing a single object for repeated keys and
+    for repeated values of low-cardinality fields across all pages.
+
+    The JSON decoder creates a new string for every key of every page and a
+    new object for every value. Keys are interned (`sys.intern`), the values
+    of the fields in `fields` (e.g. currency codes, languages, type IDs) are
+    taken from a pool, which holds at most `max_entries` values per type.
+
+    The saving is small, the decoder already shares the keys within a page
+    and small integers are cached by the interpreter. For a synthetic export
+    of 50.000 orders (benchmarks/interning.py) the peak memory usage dropped
+    by about 3%, while the decoding took about twice as long. The interner
+    is therefore not used by default.
+
+    A single interner can be used by multiple threads, the pages are decoded
+    one after another (the decoding is bound by the GIL either way).
+    """
+    def __init__(self, fields: frozenset = INTERNED_FIELDS,
+                 max_length: int = 64, max_entries: int = 100000):
+        """
+        Parameter:
+            fields      [set]   -   Fields with few distinct values
+            max_length  [int]   -   Longer strings are never pooled
+            max_entries [int]   -   Maximum amount of pooled values per type
+        """
+        self.fields = frozenset(fields)
+        self.max_length = max_length
+        self.max_entries = max_entries
+        self.pools = {str: {}, int: {}, float: {}}
+        self.lock = threading.Lock()
+
+    def decode(self, content: bytes) -> Tuple[object, int]:
+        """
+        Decode a response body.
+
+        Parameter:
+            content     [bytes] -   Response body
+
+        Raises:
+            simplejson.errors.JSONDecodeError   -   Invalid JSON
+
+        Return:
+                        [tuple] -   decoded body and the amount of bytes,
+                                    which are saved by the pooled values
+        """
+        saved = 0
+        fields = self.fields
+        pools = self.pools
+        intern = sys.intern
+
+        def build_object(pairs: list) -> dict:
+            nonlocal saved
+            record = {intern(key): value for key, value in pairs}
+            for field in fields.intersection(record):
+                value = record[field]
+                pool = pools.get(type(value))
+                if pool is None:
+                    continue
+                pooled = self.__get_pooled(pool=pool, value=value)
+                if pooled is not value:
+                    saved += sys.getsizeof(value)
+                    record[field] = pooled
+            return record
+
+        with self.lock:
+            data = simplejson.loads(content, object_pairs_hook=build_object)
+        return (data, saved)
+
+    def __get_pooled(self, pool: dict, value):
+        pooled = pool.get(value)
+        if pooled is not None:
+            return pooled
+        if isinstance(value, str) and len(value) > self.max_length:
+            return value
+        if len(pool) < self.max_entries:
+            pool[value] = value
+        return value
+
+    def clear(self) -> None:
+        """ Remove all pooled values """
+        with self.lock:
+            for pool in self.pools.values():
+                pool.clear()
@@ -0,0 +1,174 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Iterator
+import simplejson
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+def is_available() -> bool:
+    """ Check if the on-demand parser (pysimdjson) is installed """
+    return simdjson is not None
+
+
+def wrap(value):
+    """
+    Wrap a value of the on-demand parser, objects become lazy records and
+    arrays become lists of wrapped values.
+    """
+    if simdjson is None:
+        return value
+    if isinstance(value, simdjson.Object):
+        return LazyRecord(element=value)
+    if isinstance(value, simdjson.Array):
+        return [wrap(entry) for entry in value]
+    return value
+
+
+def materialize(value):
+    """
+    Convert lazy records within a value into dictionaries, which don't
+    reference the parsed page anymore.
+    """
+    if isinstance(value, LazyRecord):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [materialize(entry) for entry in value]
+    if isinstance(value, dict):
+        return {key: materialize(entry) for key, entry in value.items()}
+    return value
+
+
+def parse_page(content: bytes):
+    """
+    Decode the body of a GET response, while the data records are only
+    parsed on access.
+
+    The envelope of the page (page number, last page, ...) is returned as a
+    dictionary and the data records as lazy records. Without pysimdjson,
+    the body is decoded completely.
+
+    Parameter:
+        content         [bytes] -   Response body
+
+    Raises:
+        ValueError      -   The body is no valid JSON
+
+    Return:
+                        [dict/list]
+    """
+    if simdjson is None:
+        return simplejson.loads(content)
+    # Every page needs its own parser, a parser can't be reused while the
+    # records of its previous document are referenced
+    document = simdjson.Parser().parse(content)
+    if isinstance(document, simdjson.Object):
+        return {key: wrap(document[key]) for key in document.keys()}
+    return wrap(document)
+
+
+class LazyRecord():
+    """
+    View of a JSON object within the parsed response body.
+
+    Fields are decoded on access, nested objects are returned as lazy
+    records as well. Assigned fields are stored separately and override the
+    fields of the response. Copies of a record are dictionaries.
+
+    The record references the parsed document of its complete page, so a
+    single record keeps the whole page in memory. Use `materialize` for
+    records, which outlive the rest of their page.
+    """
+    __slots__ = ('element', 'overrides')
+
+    def __init__(self, element):
+        """
+        Parameter:
+            element     [simdjson.Object]
+        """
+        self.element = element
+        self.overrides = None
+
+    def keys(self) -> Iterator[str]:
+        yield from self.element.keys()
+        if self.overrides:
+            yield from (key for key in self.overrides
+                        if key not in self.element)
+
+    def items(self) -> Iterator[tuple]:
+        for key in self.keys():
+            yield (key, self[key])
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict:
+        """
+        Decode the complete record.
+
+        Return:
+                        [dict]
+        """
+        data = self.element.as_dict()
+        if self.overrides:
+            data.update(materialize(self.overrides))
+        return data
+
+    def __getitem__(self, key: str):
+        if self.overrides and key in self.overrides:
+            return self.overrides[key]
+        try:
+            return wrap(self.element[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value) -> None:
+        if self.overrides is None:
+            self.overrides = {}
+        self.overrides[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.element or bool(
+            self.overrides and key in self.overrides)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.keys())
+
+    def __eq__(self, other) -> bool:
+        return self.to_dict() == materialize(other)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return self.to_dict()
+
+    def __reduce__(self):
+        return (dict, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"LazyRecord({self.to_dict()})"
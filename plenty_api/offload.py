@@ -0,0 +1,100 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+import simplejson
+
+import plenty_api.utils as utils
+
+# Functions of the utils module, which can be executed by a worker process.
+# The attribute mapping is not part of it, the variations are streamed into a
+# compact index (utils.AttributeValueIndex) instead of being handed over.
+OFFLOAD_FUNCTIONS = frozenset([
+    'json_to_dataframe',
+    'transform_data_type',
+    'summarize_shipment_packages',
+    'create_vat_mapping',
+])
+
+
+def _call(function_name: str, payload: bytes):
+    """ Decode the arguments and call the utils function (worker process) """
+    return getattr(utils, function_name)(**simplejson.loads(payload))
+
+
+class ProcessOffload():
+    """
+    Execute CPU-heavy transformations of the response data (dataframe
+    conversion, VAT mappings, shipment summaries) within worker processes, so
+    that the requests of the calling process are not blocked by the GIL.
+
+    The arguments are handed over to the worker as a compact JSON string
+    instead of a pickled tree of dictionaries.
+    """
+    def __init__(self, max_workers: int = None):
+        """
+        Parameter:
+            max_workers [int]   -   Amount of worker processes
+                                    (default: amount of CPUs)
+        """
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(self, function_name: str, **kwargs) -> Future:
+        """
+        Start a transformation within a worker process.
+
+        Parameter:
+            function_name[str]  -   Name of a function from OFFLOAD_FUNCTIONS
+            kwargs              -   JSON serializable arguments of the
+                                    function
+
+        Return:
+                        [Future]
+        """
+        if function_name not in OFFLOAD_FUNCTIONS:
+            raise ValueError(f"{function_name} can't be offloaded")
+        payload = simplejson.dumps(kwargs, separators=(',', ':'))
+        return self.executor.submit(_call, function_name,
+                                    payload.encode('utf-8'))
+
+    def run(self, function_name: str, **kwargs):
+        """
+        Execute a transformation within a worker process and wait for the
+        result.
+
+        Parameter:
+            function_name[str]  -   Name of a function from OFFLOAD_FUNCTIONS
+            kwargs              -   JSON serializable arguments of the
+                                    function
+
+        Return:
+                                -   Return value of the function
+        """
+        return self.submit(function_name, **kwargs).result()
+
+    def close(self) -> None:
+        """ Stop the worker processes """
+        self.executor.shutdown(wait=True)
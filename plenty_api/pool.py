@@ -0,0 +1,217 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from plenty_api.api import PlentyApi
+from plenty_api.resilience import RateLimiter
+
+
+class PlentyApiPool():
+    """
+    Manage the PlentyApi instances of multiple plentymarkets systems
+    (tenants) within a single process.
+
+    Tenants are registered with their base URL and login data, the instance
+    of a tenant is created and authenticated on first use. Each tenant has
+    its own HTTP session (headers, cookies), all sessions share a single
+    connection pool (HTTPAdapter) and the pool of worker threads used for
+    requests across multiple tenants, each tenant can be limited to an
+    amount of requests per second.
+    """
+    def __init__(self, max_workers: int = 8, pool_maxsize: int = 10):
+        """
+        Parameter:
+            max_workers [int]   -   Amount of threads for requests across
+                                    multiple tenants
+            pool_maxsize[int]   -   Maximum amount of open connections for
+                                    each plentymarkets system
+        """
+        self.adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.sessions = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.configs = {}
+        self.clients = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def tenants(self) -> List[str]:
+        """ Names of all registered tenants """
+        with self.lock:
+            return list(self.configs)
+
+    def register(self, name: str, base_url: str,
+                 login_method: str = 'keyring', login_data: dict = None,
+                 rate: float = None, burst: int = 1, **kwargs) -> None:
+        """
+        Add a plentymarkets system to the pool, without authentication.
+
+        Parameter:
+            name        [str]   -   Unique name of the tenant
+            base_url    [str]   -   Base URL of the plentymarkets system
+            login_method[str]   -   Login method of the tenant (PlentyApi)
+            login_data  [dict]  -   Elements for the login method
+            rate        [float] -   Maximum average amount of requests per
+                                    second, None for no limit
+            burst       [int]   -   Maximum amount of requests without delay
+            kwargs              -   Further arguments for PlentyApi
+                                    (e.g. data_format, retry_policy)
+        """
+        with self.lock:
+            if name in self.configs:
+                raise ValueError(f"Tenant {name} is already registered")
+            rate_limiter = None
+            if rate:
+                rate_limiter = RateLimiter(rate=rate, burst=burst)
+            self.configs[name] = {
+                'base_url': base_url, 'login_method': login_method,
+                'login_data': login_data, 'rate_limiter': rate_limiter,
+                **kwargs
+            }
+            self.locks[name] = threading.Lock()
+
+    def get(self, name: str) -> PlentyApi:
+        """
+        Get the PlentyApi instance of a tenant, create and authenticate it
+        on first use.
+
+        Parameter:
+            name        [str]   -   Name of the tenant
+
+        Return:
+                        [PlentyApi]
+        """
+        with self.lock:
+            if name not in self.configs:
+                raise KeyError(f"Unknown tenant {name}")
+            client = self.clients.get(name)
+            tenant_lock = self.locks[name]
+        if client:
+            return client
+
+        # Only one thread authenticates a tenant, without blocking others
+        with tenant_lock:
+            with self.lock:
+                client = self.clients.get(name)
+            if client:
+                return client
+            session = self.__create_session()
+            client = PlentyApi(session=session, **self.configs[name])
+            with self.lock:
+                self.sessions[name] = session
+                self.clients[name] = client
+        return client
+
+    def __create_session(self) -> requests.Session:
+        """ Create the session of a tenant with the shared connection pool """
+        session = requests.Session()
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        return session
+
+    def map(self, function: Callable, tenants: List[str] = None) -> Dict:
+        """
+        Call a function with the instance of each tenant concurrently.
+
+        Parameter:
+            function    [callable]  -   Function with the PlentyApi instance
+                                        as the only argument
+            tenants     [list]      -   Restrict the call to a subset of
+                                        tenants (default: all)
+
+        Return:
+                        [dict]      -   Result for each tenant, None for a
+                                        tenant where the call failed
+        """
+        if tenants is None:
+            tenants = self.tenants
+
+        def call(name: str):
+            return function(self.get(name=name))
+
+        futures = {name: self.executor.submit(call, name) for name in tenants}
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as err:
+                logging.error(f"Request for tenant {name} failed: {err}")
+                results[name] = None
+        return results
+
+    def get_stock_for_variation(self, variation_id: int,
+                                tenants: List[str] = None) -> Dict:
+        """
+        Get the stock of a variation on every tenant.
+
+        Parameter:
+            variation_id[int]   -   Plentymarkets ID of the variation
+            tenants     [list]  -   Restrict the request to a subset of
+                                    tenants (default: all)
+
+        Return:
+                        [dict]  -   Stock data for each tenant
+        """
+        return self.map(
+            function=lambda client: client.plenty_api_get_stock(
+                refine={'variationId': variation_id}),
+            tenants=tenants)
+
+    def get_orders_by_date(self, start: str = '', end: str = '',
+                           tenants: List[str] = None, **kwargs) -> Dict:
+        """
+        Get the orders within a date range from every tenant.
+
+        Parameter:
+            start       [str]   -   Start date
+            end         [str]   -   End date
+            tenants     [list]  -   Restrict the request to a subset of
+                                    tenants (default: all)
+            kwargs              -   Further arguments for
+                                    plenty_api_get_orders_by_date
+
+        Return:
+                        [dict]  -   Orders for each tenant
+        """
+        return self.map(
+            function=lambda client: client.plenty_api_get_orders_by_date(
+                start=start, end=end, **kwargs),
+            tenants=tenants)
+
+    def close(self) -> None:
+        """ Stop the worker threads and close all connections """
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            sessions = list(self.sessions.values())
+        for session in sessions:
+            session.close()
+        self.adapter.close()
@@ -0,0 +1,272 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Iterator, List
+
+
+class Record():
+    """
+    Compact representation of a data record of the REST API.
+
+    Every field of a record type is stored within a slot instead of a
+    dictionary per record, fields that are not part of the record type are
+    kept within the `extra` dictionary, so that no data is lost.
+    The record supports the read and write access of a dictionary
+    (`record['id']`, `record.get('id')`), so that code written for the
+    'json' format works with records as well.
+    """
+    __slots__ = ('extra',)
+    fields = ()
+    field_set = frozenset()
+    # Fields that contain a nested record or a list of nested records
+    # {field: record type}
+    nested = {}
+    plain_fields = ()
+
+    def __init__(self, **kwargs):
+        self.extra = None
+        for field in self.fields:
+            setattr(self, field, None)
+        for key, value in kwargs.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Record':
+        """
+        Create a record from a decoded JSON object.
+
+        Parameter:
+            data        [dict]  -   Data record of the REST API
+
+        Return:
+                        [Record]
+        """
+        record = cls.__new__(cls)
+        get = data.get
+        for field in cls.plain_fields:
+            setattr(record, field, get(field))
+        for field, record_type in cls.nested.items():
+            value = get(field)
+            if value:
+                if isinstance(value, dict):
+                    value = record_type.from_dict(data=value)
+                else:
+                    value = record_type.from_list(data=value)
+            setattr(record, field, value)
+        record.extra = None
+        if not cls.field_set.issuperset(data):
+            record.extra = {key: value for key, value in data.items()
+                            if key not in cls.field_set}
+        return record
+
+    @classmethod
+    def from_list(cls, data: list) -> List['Record']:
+        """ Create a record for each JSON object of a list """
+        if not isinstance(data, list):
+            return data
+        return [cls.from_dict(data=entry) if isinstance(entry, dict)
+                else entry for entry in data]
+
+    def to_dict(self) -> dict:
+        """
+        Convert the record back into the JSON object of the REST API.
+
+        Return:
+                        [dict]
+        """
+        data = {}
+        for field in self.fields:
+            value = getattr(self, field)
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif field in self.nested and isinstance(value, list):
+                value = [entry.to_dict() if isinstance(entry, Record)
+                         else entry for entry in value]
+            data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def keys(self) -> Iterator[str]:
+        yield from self.fields
+        if self.extra:
+            yield from self.extra
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key: str):
+        if key in self.field_set:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key in self.field_set:
+            setattr(self, key, value)
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.field_set or bool(self.extra and key in self.extra)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+def _record_type(name: str, fields: tuple, nested: dict = None) -> type:
+    """ Create a record class with a slot for each field """
+    nested = nested or {}
+    return type(name, (Record,), {
+        '__slots__': fields, 'fields': fields, 'field_set': frozenset(fields),
+        'nested': nested,
+        'plain_fields': tuple(field for field in fields
+                              if field not in nested)
+    })
+
+
+# Type ID and value pairs (order properties, order item properties, address
+# options)
+Property = _record_type('Property', ('typeId', 'value'))
+
+Amount = _record_type('Amount', (
+    'id', 'currency', 'exchangeRate', 'isNet', 'isSystemCurrency',
+    'priceOriginalGross', 'priceOriginalNet', 'priceGross', 'priceNet',
+    'surcharge', 'discount', 'isPercentage', 'purchasePrice', 'netTotal',
+    'grossTotal', 'vatTotal', 'invoiceTotal', 'paidAmount', 'createdAt',
+    'updatedAt'
+))
+
+Address = _record_type('Address', (
+    'id', 'gender', 'name1', 'name2', 'name3', 'name4', 'address1',
+    'address2', 'address3', 'address4', 'postalCode', 'town', 'countryId',
+    'stateId', 'createdAt', 'updatedAt', 'options'
+), nested={'options': Property})
+
+StockRow = _record_type('StockRow', (
+    'itemId', 'variationId', 'warehouseId', 'stockPhysical', 'reservedStock',
+    'reservedEbay', 'reorderDelta', 'stockNet', 'reordered',
+    'reservedBundle', 'averagePurchasePrice', 'physicalStock', 'netStock',
+    'reservedListing', 'reservedBundles', 'purchasePrice', 'valueOfGoods',
+    'updatedAt'
+))
+
+Variation = _record_type('Variation', (
+    'id', 'itemId', 'isMain', 'mainVariationId', 'isActive', 'number',
+    'model', 'externalId', 'parentVariationId', 'availability',
+    'mainWarehouseId', 'weightG', 'weightNetG', 'widthMM', 'lengthMM',
+    'heightMM', 'purchasePrice', 'availableUntil', 'customsTariffNumber',
+    'createdAt', 'updatedAt', 'stock', 'variationAttributeValues',
+    'variationSalesPrices', 'variationBarcodes', 'properties', 'item'
+), nested={'stock': StockRow})
+
+Transaction = _record_type('Transaction', (
+    'id', 'orderItemId', 'warehouseId', 'storageLocationId', 'quantity',
+    'direction', 'status', 'batch', 'bestBeforeDate', 'identification',
+    'receiptId', 'userId', 'createdAt', 'updatedAt'
+))
+
+OrderItem = _record_type('OrderItem', (
+    'id', 'orderId', 'typeId', 'referrerId', 'itemVariationId', 'quantity',
+    'orderItemName', 'attributeValues', 'shippingProfileId', 'countryVatId',
+    'vatField', 'vatRate', 'position', 'warehouseId', 'createdAt',
+    'updatedAt', 'amounts', 'properties', 'orderProperties', 'dates',
+    'references', 'variation', 'transactions'
+), nested={'transactions': Transaction, 'variation': Variation,
+           'amounts': Amount, 'properties': Property})
+
+Order = _record_type('Order', (
+    'id', 'typeId', 'statusId', 'statusName', 'plentyId', 'referrerId',
+    'ownerId', 'locationId', 'lockStatus', 'roundTotalsOnly',
+    'numberOfDecimals', 'createdAt', 'updatedAt', 'orderItems', 'properties',
+    'addressRelations', 'relations', 'amounts', 'dates', 'addresses',
+    'documents', 'comments', 'payments', 'shippingPackages'
+), nested={'orderItems': OrderItem, 'amounts': Amount,
+           'properties': Property, 'addresses': Address})
+
+StorageLocation = _record_type('StorageLocation', (
+    'itemId', 'variationId', 'warehouseId', 'storageLocationId', 'quantity',
+    'batch', 'bestBeforeDate', 'createdAt', 'updatedAt'
+))
+
+# Record types of the routes {domain: {path: record type}}, the path of the
+# storage location route ends with the storage location suffix
+RECORD_TYPES = {
+    'order': {'': Order},
+    'variation': {'': Variation},
+    'stockmanagement': {'': StockRow},
+    'warehouses': {'/stock/storageLocations': StorageLocation},
+}
+
+
+def get_record_type(domain: str, path: str = '') -> type:
+    """
+    Find the record type of a route.
+
+    Parameter:
+        domain          [str]   -   Domain name (utils.resolve_domain)
+        path            [str]   -   Addition to the domain
+
+    Return:
+                        [type/None] -   None for routes without a record type
+    """
+    for suffix, record_type in RECORD_TYPES.get(domain, {}).items():
+        if (suffix and path.endswith(suffix)) or (not suffix and not path):
+            return record_type
+    return None
+
+
+def convert(domain: str, data: list, path: str = '') -> list:
+    """
+    Convert the JSON objects of a page into records, routes without a
+    record type keep their JSON objects.
+
+    The JSON objects are replaced within the list one by one, so that the
+    JSON objects of a record are released as soon as the record exists and
+    the page is not held in both formats at the same time. The records need
+    less memory than the JSON objects, but creating them roughly doubles
+    the time to decode a page.
+
+    Parameter:
+        domain          [str]   -   Domain name (utils.resolve_domain)
+        data            [list]  -   Data records of a single page, replaced
+                                    in place
+
+    Return:
+                        [list]
+    """
+    record_type = get_record_type(domain=domain, path=path)
+    if not record_type or not isinstance(data, list):
+        return data
+    for index, entry in enumerate(data):
+        if isinstance(entry, dict):
+            data[index] = record_type.from_dict(data=entry)
+    return data
@@ -0,0 +1,314 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import random
+import time
+import threading
+
+
+class RetryPolicy():
+    """
+    Decide if and when a failed request (server error, timeout or connection
+    reset) is repeated.
+
+    Only idempotent methods are repeated by default (GET and PUT), a POST
+    request is only repeated if the caller declares it as idempotent or if
+    'post' is part of the `methods`.
+
+    The delay between the attempts grows exponentially with a random
+    jitter ("full jitter"), all retries of an instance draw from a shared
+    budget, which is refilled by successful requests. This avoids that a
+    broken system is flooded by retries of many parallel requests.
+    """
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0,
+                 statuses: tuple = (500, 502, 503, 504),
+                 methods: tuple = ('get', 'put'),
+                 budget: float = 10.0, budget_ratio: float = 0.1,
+                 max_throttled: int = 20):
+        """
+        Parameter:
+            max_retries [int]   -   Maximum retries of a single request
+            backoff_factor[float] - Base delay in seconds, the delay of the
+                                    n-th retry is taken at random from
+                                    [0, backoff_factor * 2^n]
+            max_backoff [float] -   Upper limit of the delay in seconds
+            statuses    [tuple] -   HTTP status codes that are repeated
+            methods     [tuple] -   Lower-case HTTP methods that are repeated
+            budget      [float] -   Maximum amount of stored retries
+            budget_ratio[float] -   Retries added to the budget for each
+                                    successful request
+            max_throttled [int] -   Maximum repetitions of a single request
+                                    after a 429 (too many requests) response
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.lower() for method in methods)
+        self.budget = budget
+        self.budget_ratio = budget_ratio
+        self.max_throttled = max_throttled
+        self.tokens = budget
+        self.lock = threading.Lock()
+
+    def allows_method(self, method: str, idempotent: bool = None) -> bool:
+        """
+        Check if requests of the given method may be repeated.
+
+        Parameter:
+            method      [str]   -   HTTP method (GET/POST/PUT)
+            idempotent  [bool]  -   Declaration of the caller, that the
+                                    request can be repeated safely,
+                                    None uses the configured methods
+
+        Return:
+                        [bool]
+        """
+        if idempotent is not None:
+            return idempotent
+        return method.lower() in self.methods
+
+    def allows_status(self, status_code: int) -> bool:
+        """ Check if a response with the given status may be repeated """
+        return status_code in self.statuses
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Get the delay in seconds before the given retry attempt.
+
+        Parameter:
+            attempt     [int]   -   Number of the retry (starting at 0)
+
+        Return:
+                        [float]
+        """
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def acquire(self, attempt: int) -> bool:
+        """
+        Take a retry from the budget.
+
+        Parameter:
+            attempt     [int]   -   Number of the retry (starting at 0)
+
+        Return:
+                        [bool]  -   False if the request must not be repeated
+        """
+        if attempt >= self.max_retries:
+            return False
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+        return True
+
+    def record_success(self) -> None:
+        """ Refill the budget after a successful request """
+        with self.lock:
+            self.tokens = min(self.budget, self.tokens + self.budget_ratio)
+
+
+class CircuitBreaker():
+    """
+    Stop sending requests to a plentymarkets system, which is not reachable.
+
+    The breaker opens after `failure_threshold` consecutive failures (server
+    errors, timeouts, connection resets, exhausted throttling or responses
+    slower than `latency_threshold`). While open, requests fail immediately
+    without contacting the system. After `recovery_timeout` seconds the
+    breaker is half-open and lets up to `half_open_probes` requests through,
+    a successful probe closes the breaker, a failed probe opens it again.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0, half_open_probes: int = 1,
+                 latency_threshold: float = None):
+        """
+        Parameter:
+            failure_threshold [int] - Consecutive failures that open the
+                                    breaker
+            recovery_timeout[float] - Seconds until an open breaker lets
+                                    probe requests through
+            half_open_probes [int] - Maximum concurrent probe requests
+            latency_threshold[float] - Responses slower than this amount of
+                                    seconds count as failure, None disables
+                                    the check
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self.latency_threshold = latency_threshold
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.__state = self.CLOSED
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """ Current state of the breaker (closed/open/half_open) """
+        with self.lock:
+            return self.__get_state()
+
+    def __get_state(self) -> str:
+        if (
+            self.__state == self.OPEN and
+            time.monotonic() - self.opened_at >= self.recovery_timeout
+        ):
+            self.__state = self.HALF_OPEN
+            self.probes = 0
+        return self.__state
+
+    def allow_request(self) -> bool:
+        """
+        Check if a request may be sent, a permitted request has to be
+        completed by either `record_success`, `record_failure` or
+        `release_probe`.
+
+        Return:
+                        [bool]
+        """
+        with self.lock:
+            state = self.__get_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self.probes < self.half_open_probes:
+                self.probes += 1
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """
+        Give back the probe slot of a permitted request, which ended without
+        an outcome (e.g. the deadline passed or the token expired).
+        """
+        with self.lock:
+            if self.__state == self.HALF_OPEN and self.probes > 0:
+                self.probes -= 1
+
+    def record_success(self, latency: float = 0.0) -> None:
+        """
+        Report a completed request.
+
+        Parameter:
+            latency     [float] -   Duration of the request in seconds
+        """
+        if (
+            self.latency_threshold is not None and
+            latency > self.latency_threshold
+        ):
+            self.record_failure()
+            return
+        with self.lock:
+            self.failures = 0
+            self.probes = 0
+            self.__state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """ Report a failed request """
+        with self.lock:
+            self.failures += 1
+            if (
+                self.__state == self.HALF_OPEN or
+                self.failures >= self.failure_threshold
+            ):
+                self.__state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probes = 0
+
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    """
+    Get the circuit breaker shared by all instances for a plentymarkets
+    system.
+
+    Parameter:
+        base_url        [str]   -   Base URL of the plentymarkets system
+
+    Return:
+                        [CircuitBreaker]
+    """
+    key = base_url.rstrip('/').lower()
+    with _circuit_breakers_lock:
+        if key not in _circuit_breakers:
+            _circuit_breakers[key] = CircuitBreaker()
+        return _circuit_breakers[key]
+
+
+class RateLimiter():
+    """
+    Token bucket, which limits the amount of requests per second.
+
+    The bucket holds up to `burst` tokens and is refilled with `rate` tokens
+    per second, every request takes one token and waits if the bucket is
+    empty.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Parameter:
+            rate        [float] -   Average amount of requests per second
+            burst       [int]   -   Maximum amount of requests without delay
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst,
+                          self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Take a token from the bucket, wait until one is available.
+
+        Parameter:
+            timeout     [float] -   Maximum wait time in seconds,
+                                    None waits without limit
+
+        Return:
+                        [bool]  -   False if no token was available in time
+        """
+        limit = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self.__refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                delay = (1 - self.tokens) / self.rate
+            if limit is not None:
+                remaining = limit - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            time.sleep(delay)
@@ -0,0 +1,216 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pathlib import Path
+import abc
+import gzip
+import re
+import sqlite3
+import threading
+import simplejson
+
+from plenty_api.constants import SINK_RECORD_KEYS
+
+
+class Sink(abc.ABC):
+    """
+    Destination for the records of a paginated GET request, which receives
+    the records page by page instead of collecting them in memory.
+
+    Subclasses implement `write_page`, the sink can be used by multiple
+    threads at the same time (e.g. for the shards of an order request).
+    The records are always written in the 'json' format, independent of
+    the data format of the `PlentyApi` instance.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, records: list, domain: str = '') -> None:
+        """
+        Store the records of a single page.
+
+        Parameter:
+            records     [list]  -   Data records of the page
+            domain      [str]   -   Domain name of the records
+                                    (utils.resolve_domain)
+        """
+        if not records:
+            return
+        with self.lock:
+            self.write_page(records=records, domain=domain)
+            self.written += len(records)
+
+    @abc.abstractmethod
+    def write_page(self, records: list, domain: str = '') -> None:
+        """
+        Persist the records of a single page, called under the lock of the
+        sink.
+
+        Parameter:
+            records     [list]  -   Data records of the page
+            domain      [str]   -   Domain name of the records
+        """
+
+    def get_key_fields(self, domain: str = '') -> tuple:
+        """
+        Get the fields, which the sink needs to identify a record of a
+        domain, they are kept when the records are reduced to a set of
+        fields.
+
+        Parameter:
+            domain      [str]   -   Domain name (utils.resolve_domain)
+
+        Return:
+                        [tuple]
+        """
+        return ()
+
+    def close(self) -> None:
+        """ Release the storage of the sink """
+
+
+class NdjsonSink(Sink):
+    """
+    Append the records as newline delimited JSON (one record per line) to a
+    file, optionally compressed with gzip.
+
+    The file is flushed after every page, so that at most the page, which
+    was written during a crash, is lost.
+    """
+    def __init__(self, path: Path, compress: bool = False):
+        """
+        Parameter:
+            path        [Path]  -   Location of the file, created if it
+                                    doesn't exist, otherwise appended
+            compress    [bool]  -   Write a gzip compressed file
+        """
+        super().__init__()
+        self.path = Path(path)
+        if compress:
+            self.file = gzip.open(self.path, 'at', encoding='utf-8')
+        else:
+            self.file = open(self.path, 'a', encoding='utf-8')
+
+    def write_page(self, records: list, domain: str = '') -> None:
+        self.file.write(''.join(
+            simplejson.dumps(record, default=str) + '\n'
+            for record in records))
+        self.file.flush()
+
+    def close(self) -> None:
+        """ Close the file """
+        with self.lock:
+            self.file.close()
+
+
+class SqliteSink(Sink):
+    """
+    Store the records within a table of a SQLite database, each record as a
+    JSON document together with its key.
+
+    The records of a page are inserted within a single transaction, a
+    record with the key of an existing record replaces it (upsert), so that
+    repeated exports update the table. Without an explicit key, the key of
+    the domain (`SINK_RECORD_KEYS`, e.g. variation and warehouse ID for
+    stock) or the ID of the record is used.
+    """
+    def __init__(self, path: Path, table: str = 'records',
+                 key: tuple = None):
+        """
+        Parameter:
+            path        [Path]  -   Location of the SQLite database file,
+                                    created if it doesn't exist
+            table       [str]   -   Name of the table, created if it doesn't
+                                    exist
+            key         [tuple] -   Fields, which identify a record
+                                    (e.g. ('variationId', 'warehouseId')),
+                                    None for the key of the domain
+        """
+        super().__init__()
+        if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', table):
+            raise ValueError(f"Invalid table name {table}")
+        self.path = Path(path)
+        self.table = table
+        self.key = tuple(key) if key else None
+        self.connection = sqlite3.connect(str(self.path),
+                                          check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                'key TEXT PRIMARY KEY, data TEXT)'
+            )
+
+    def get_key_fields(self, domain: str = '') -> tuple:
+        """
+        Get the fields, which identify a record of a domain.
+
+        Parameter:
+            domain      [str]   -   Domain name (utils.resolve_domain)
+
+        Return:
+                        [tuple]
+        """
+        if self.key:
+            return self.key
+        return SINK_RECORD_KEYS.get(domain, ('id',))
+
+    @staticmethod
+    def build_key(record: dict, fields: tuple) -> str:
+        """
+        Create the key of a record from its key fields.
+
+        Parameter:
+            record      [dict]  -   Data record
+            fields      [tuple] -   Key fields
+
+        Raises:
+            ValueError  -   A key field is missing, the record could not be
+                            replaced by a later export
+
+        Return:
+                        [str]
+        """
+        values = [record.get(field) for field in fields]
+        if any(value is None for value in values):
+            raise ValueError(f"Record without the key fields {fields}: "
+                             f"{record}")
+        return '/'.join(str(value) for value in values)
+
+    def write_page(self, records: list, domain: str = '') -> None:
+        fields = self.get_key_fields(domain=domain)
+        rows = [(self.build_key(record=record, fields=fields),
+                 simplejson.dumps(record, default=str))
+                for record in records]
+        with self.connection:
+            self.connection.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (key, data) '
+                'VALUES (?, ?)', rows)
+
+    def close(self) -> None:
+        """ Close the database connection """
+        with self.lock:
+            self.connection.close()
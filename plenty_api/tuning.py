@@ -0,0 +1,109 @@
+"""
+Python-PlentyMarkets-API-interface.
+
+Interface to the resources from PlentyMarkets(https://www.plentymarkets.eu)
+
+Copyright (C) 2021  Sebastian Fricke, Panasiam
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from collections import defaultdict
+import threading
+
+
+class PageSizeTuner():
+    """
+    Find the page size (itemsPerPage) with the highest throughput (records
+    per second) for each domain.
+
+    The page size of a request can't change between its pages, as the page
+    number is relative to the page size. Instead, successive requests of a
+    domain use the candidate page sizes one after another, until each of them
+    was measured for `pages_per_candidate` full pages. Afterwards, all
+    requests of the domain use the fastest page size.
+    """
+    def __init__(self, candidates: tuple = (50, 100, 250),
+                 pages_per_candidate: int = 3):
+        """
+        Parameter:
+            candidates  [tuple] -   Page sizes to compare, limited by the
+                                    maximum page size of the domain
+            pages_per_candidate [int] - Amount of full pages measured for
+                                    each candidate
+        """
+        self.candidates = candidates
+        self.pages_per_candidate = pages_per_candidate
+        # {domain: {page size: [records, seconds, pages]}}
+        self.samples = defaultdict(dict)
+        self.chosen = {}
+        self.lock = threading.Lock()
+
+    def get_page_size(self, domain: str, maximum: int) -> int:
+        """
+        Get the page size for the next request of a domain.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            maximum     [int]   -   Maximum page size of the domain
+
+        Return:
+                        [int]
+        """
+        sizes = sorted({min(size, maximum) for size in self.candidates})
+        with self.lock:
+            if domain in self.chosen:
+                return self.chosen[domain]
+            samples = self.samples[domain]
+            for size in sizes:
+                if (
+                    size not in samples or
+                    samples[size][2] < self.pages_per_candidate
+                ):
+                    return size
+            best = max(sizes, key=lambda size: samples[size][0] /
+                       max(samples[size][1], 1e-9))
+            self.chosen[domain] = best
+            return best
+
+    def record(self, domain: str, page_size: int, records: int,
+               seconds: float) -> None:
+        """
+        Add the measurement of a single page, pages that aren't full (e.g. the
+        last page) are ignored as they would distort the throughput.
+
+        Parameter:
+            domain      [str]   -   Orders/Items/..
+            page_size   [int]   -   itemsPerPage of the request
+            records     [int]   -   Amount of records within the page
+            seconds     [float] -   Duration of the request
+        """
+        if records < page_size:
+            return
+        with self.lock:
+            if domain in self.chosen:
+                return
+            sample = self.samples[domain].setdefault(page_size, [0, 0.0, 0])
+            sample[0] += records
+            sample[1] += seconds
+            sample[2] += 1
+
+    def reset(self, domain: str = '') -> None:
+        """ Restart the measurement for a domain or for all domains """
+        with self.lock:
+            if domain:
+                self.samples.pop(domain, None)
+                self.chosen.pop(domain, None)
+            else:
+                self.samples.clear()
+                self.chosen.clear()
@@ -18,11 +18,19 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from array import array
 from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet
 import getpass
+import math
+import queue
+import importlib.util
 import datetime
 import time
 import re
+import threading
 import dateutil.parser
 import pandas
 import logging
@@ -40,6 +48,162 @@ class InvalidLoginAttempt(Exception):
                    f"{self.reason}")
 
 
+class PaginationError(Exception):
+    def __init__(self, response: dict) -> None:
+        self.response = response
+        super().__init__()
+
+    def __str__(self):
+        return str(f"Paginated GET request failed, Response: {self.response}")
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, records: list = None, count: int = None) -> None:
+        self.records = records if records is not None else []
+        # Amount of records written into a sink, instead of collected ones
+        self.count = count if count is not None else len(self.records)
+        super().__init__()
+
+    def __str__(self):
+        return str("Deadline of the request exceeded after "
+                   f"{self.count} records")
+
+
+class PartialResult(list):
+    """
+    Records of a paginated request, which was stopped before all pages were
+    fetched (e.g. because the deadline of the request passed).
+    """
+    partial = True
+
+
+class PartialCount(int):
+    """
+    Amount of records, which a paginated request wrote into a sink before
+    it was stopped (e.g. because the deadline of the request passed).
+    """
+    partial = True
+
+
+def get_deadline(seconds: float):
+    """
+    Convert a time budget into a point in time of the monotonic clock.
+
+    Parameter:
+        seconds         [float] -   Time budget, None for no deadline
+
+    Return:
+                        [float/None]
+    """
+    if seconds is None:
+        return None
+    return time.monotonic() + seconds
+
+
+def get_remaining_time(deadline: float):
+    """
+    Get the seconds until the deadline (negative if it passed).
+
+    Parameter:
+        deadline        [float] -   Point in time of the monotonic clock,
+                                    None for no deadline
+
+    Return:
+                        [float/None]
+    """
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def get_request_timeout(timeout: tuple, deadline: float) -> tuple:
+    """
+    Limit the read timeout of a request to the time left until the deadline.
+
+    Parameter:
+        timeout         [tuple] -   (connect timeout, read timeout) in seconds
+        deadline        [float] -   Point in time of the monotonic clock,
+                                    None for no deadline
+
+    Return:
+                        [tuple]
+    """
+    remaining = get_remaining_time(deadline=deadline)
+    if remaining is None:
+        return timeout
+    (connect, read) = timeout
+    remaining = max(remaining, 0.001)
+    if read is None or read > remaining:
+        read = remaining
+    if connect is None or connect > remaining:
+        connect = remaining
+    return (connect, read)
+
+
+def prefetch(iterable, window: int = 1):
+    """
+    Consume an iterable within a background thread, while the caller
+    processes the items that were already fetched.
+
+    The background thread stays at most `window` items ahead of the caller
+    and waits when the buffer is full. Exceptions of the iterable are raised
+    within the caller, when it reaches the failed item.
+
+    Parameter:
+        iterable        [iterable]  -   e.g. the pages of a GET request
+        window          [int]       -   Maximum amount of fetched items,
+                                        which weren't consumed yet, 0
+                                        deactivates the background thread
+
+    Yield:
+                                    -   Items of the iterable
+    """
+    if window < 1:
+        yield from iterable
+        return
+
+    buffer = queue.Queue(maxsize=window)
+    stop = threading.Event()
+    finished = object()
+
+    def put(entry: tuple) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    break
+        except Exception as err:
+            put((finished, err))
+        else:
+            put((finished, None))
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close:
+                close()
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            (item, error) = buffer.get()
+            if item is finished:
+                if error:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+
 def create_vat_mapping(data: list, subset: list = None) -> dict:
     """
     Create a mapping of each country ID to (Tax ID and configuration ID),
@@ -68,6 +232,77 @@ def create_vat_mapping(data: list, subset: list = None) -> dict:
     return mapping
 
 
+class AttributeValueIndex():
+    """
+    Compact index of the variation IDs linked to each attribute value.
+
+    The index is filled page by page from the variation responses, so that
+    the variations do not have to be held in memory, the variation IDs are
+    stored in typed arrays instead of lists of python integers.
+    """
+    def __init__(self):
+        self.value_map = {}
+
+    def add_variations(self, variations: list) -> bool:
+        """
+        Add the attribute values of the given variations to the index.
+
+        Parameter:
+            variations  [list]  -   response body entries from:
+                                    /rest/items/variations
+                                    (with variationAttributeValues)
+
+        Return:
+                        [bool]  -   False if the variations do not contain
+                                    attribute values
+        """
+        value_map = self.value_map
+        for var in variations:
+            try:
+                attribute_values = var['variationAttributeValues']
+            except KeyError:
+                logging.warning("variations without attribute values"
+                                " used for attribute mapping")
+                return False
+            var_id = var['id']
+            for attr in attribute_values:
+                try:
+                    attr_map = value_map[attr['attributeId']]
+                except KeyError:
+                    attr_map = value_map[attr['attributeId']] = {}
+                try:
+                    attr_map[attr['valueId']].append(var_id)
+                except KeyError:
+                    attr_map[attr['valueId']] = array('q', (var_id,))
+        return True
+
+    def get(self, attribute_id: int, value_id: int) -> array:
+        """ Get the variation IDs of an attribute value (empty if unknown) """
+        return self.value_map.get(attribute_id, {}).get(value_id, array('q'))
+
+    def annotate(self, attributes: list) -> list:
+        """
+        Add the 'linked_variations' field to each attribute value, which is
+        linked to at least one variation.
+
+        Parameter:
+            attributes  [list]  -   response body entries from:
+                                    /rest/items/attributes (with values)
+
+        Return:
+                        [list]  -   extended response body of the attributes
+        """
+        for entry in attributes:
+            attr_map = self.value_map.get(entry['id'])
+            if not attr_map:
+                continue
+            for value in entry['values']:
+                variation_ids = attr_map.get(value['id'])
+                if variation_ids is not None:
+                    value['linked_variations'] = variation_ids.tolist()
+        return attributes
+
+
 def attribute_variation_mapping(variation: dict, attribute: dict) -> dict:
     """
     Add an additional field to the attribute JSON response body:
@@ -84,39 +319,17 @@ def attribute_variation_mapping(variation: dict, attribute: dict) -> dict:
     Return:
                         [dict]     -   extended response body of the attributes
     """
-    value_id_map = {}
-
     if not attribute:
         return {}
 
     if not variation:
         return attribute
 
-    for var in variation:
-        if 'variationAttributeValues' not in var.keys():
-            logging.warning("variations without attribute values"
-                            " used for attribute mapping")
-            return attribute
-        for attr in var['variationAttributeValues']:
-            attr_id = str(attr['attributeId'])
-            val_id = str(attr['valueId'])
-            if attr_id not in value_id_map:
-                value_id_map[attr_id] = {val_id: [var['id']]}
-                continue
-            if val_id not in value_id_map[attr_id]:
-                value_id_map[attr_id][val_id] = [var['id']]
-                continue
-            value_id_map[attr_id][val_id].append(var['id'])
-
-    for entry in attribute:
-        attr_id = str(entry['id'])
-        if attr_id in value_id_map:
-            for value in entry['values']:
-                val_id = str(value['id'])
-                if val_id in value_id_map[attr_id]:
-                    value['linked_variations'] = value_id_map[attr_id][val_id]
+    index = AttributeValueIndex()
+    if not index.add_variations(variations=variation):
+        return attribute
 
-    return attribute
+    return index.annotate(attributes=attribute)
 
 
 def shrink_price_configuration(data: dict) -> dict:
@@ -169,6 +382,21 @@ def shrink_price_configuration(data: dict) -> dict:
     return configuration
 
 
+def resolve_domain(domain: str) -> str:
+    """
+    Map a domain name or one of its aliases (e.g. 'items' for 'item') to the
+    domain name used within the constants.
+
+    Parameter:
+        domain          [str]       -   type of route for the request
+                                        {item/order/..}
+
+    Return:
+                        [str]       -   Empty string for unknown domains
+    """
+    return constants.DOMAIN_LOOKUP.get(domain.lower(), '')
+
+
 def get_route(domain: str) -> str:
     """
     Use fixed mappings to determine the correct route for the endpoint.
@@ -180,10 +408,257 @@ def get_route(domain: str) -> str:
     Return:
                         [str]
     """
-    for valid_domain in constants.VALID_DOMAINS:
-        if re.match(valid_domain, domain.lower()):
-            return constants.DOMAIN_ROUTE_MAP[valid_domain]
-    return ''
+    return constants.DOMAIN_ROUTE_MAP.get(resolve_domain(domain=domain), '')
+
+
+@lru_cache(maxsize=None)
+def get_accept_encoding() -> str:
+    """
+    Get the content encodings for the Accept-Encoding header of a request,
+    brotli is only offered if either the `brotli` or the `brotlicffi`
+    package is installed (used by urllib3 for the decoding).
+
+    Return:
+                        [str]
+    """
+    encodings = ['gzip', 'deflate']
+    if any(importlib.util.find_spec(name)
+           for name in ['brotli', 'brotlicffi']):
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+def get_response_size(response) -> tuple:
+    """
+    Determine the transferred (possibly compressed) and the decoded size of
+    a response body.
+
+    Parameter:
+        response        [requests.Response]
+
+    Return:
+                        [tuple] -   (transferred bytes, decoded bytes)
+    """
+    decoded = len(response.content or b'')
+    transferred = 0
+    try:
+        transferred = response.raw.tell()
+    except (AttributeError, OSError):
+        pass
+    if not transferred:
+        try:
+            transferred = int(response.headers.get('Content-Length',
+                                                   decoded))
+        except ValueError:
+            transferred = decoded
+    return (transferred, decoded)
+
+
+def get_total_record_count(response: dict) -> int:
+    """
+    Read the total amount of records of a paginated GET route from the
+    response of a single page.
+
+    Parameter:
+        response                [dict]      -   GET request response body
+
+    Return:
+                                [int]       -   -1 if the response format does
+                                                not contain a total count
+    """
+    for key in ['totalsCount', 'total']:
+        if key in response:
+            return int(response[key])
+    return -1
+
+
+def get_call_budget(headers: dict) -> dict:
+    """
+    Read the remaining calls of the plentymarkets call limits from the
+    response headers.
+
+    Parameter:
+        headers                 [dict]      -   Response headers
+
+    Return:
+                                [dict]      -   Limits, remaining calls and
+                                                seconds until the reset of
+                                                each period, empty if the
+                                                response contains no limits
+    """
+    budget = {}
+    for key, header in constants.CALL_LIMIT_HEADERS.items():
+        try:
+            budget[key] = int(headers[header])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return budget
+
+
+def estimate_duration(calls: int, latency: float, call_budget: dict,
+                      rate: float = None) -> float:
+    """
+    Estimate the duration of a series of requests.
+
+    The requests take at least `latency` seconds each, when the calls of the
+    short period are used up, every further `short_limit` calls wait for
+    the reset of the period (`short_decay`).
+
+    Parameter:
+        calls                   [int]       -   Amount of requests
+        latency                 [float]     -   Duration of a single request
+        call_budget             [dict]      -   Call limits (get_call_budget)
+        rate                    [float]     -   Maximum amount of requests per
+                                                second of the rate limiter
+
+    Return:
+                                [float]     -   Seconds
+    """
+    duration = calls * latency
+    if rate:
+        duration = max(duration, calls / rate)
+    limit = call_budget.get('short_limit', 0)
+    calls_left = call_budget.get('short_calls_left', calls)
+    if limit > 0 and calls > calls_left:
+        periods = math.ceil((calls - calls_left) / limit)
+        duration += periods * call_budget.get('short_decay', 0)
+    return duration
+
+
+def merge_unique_records(pages: list, key: str = 'id') -> list:
+    """
+    Combine multiple lists of records, while keeping only the first occurrence
+    of each record.
+
+    Parameter:
+        pages                   [list]      -   Lists of records
+        key                     [str]       -   Field that identifies a record
+
+    Return:
+                                [list]
+    """
+    known = set()
+    records = []
+    for page in pages:
+        for record in page:
+            if record[key] in known:
+                continue
+            known.add(record[key])
+            records.append(record)
+    return records
+
+
+def chunk_ids(ids: list, max_length: int, max_ids: int) -> list:
+    """
+    Split a list of IDs into chunks, which fit into a comma separated refine
+    argument of a request URL.
+
+    Parameter:
+        ids                     [list]      -   Plentymarkets IDs
+        max_length              [int]       -   Available characters of the
+                                                URL for the argument value
+        max_ids                 [int]       -   Maximum amount of IDs within
+                                                a single chunk
+
+    Return:
+                                [list]      -   list of ID lists
+    """
+    # The comma separator is URL encoded as '%2C'
+    separator_length = 3
+    chunks = []
+    chunk = []
+    length = 0
+    for record_id in ids:
+        id_length = len(str(record_id))
+        if chunk:
+            id_length += separator_length
+        if chunk and (length + id_length > max_length or
+                      len(chunk) >= max_ids):
+            chunks.append(chunk)
+            chunk = []
+            length = 0
+            id_length -= separator_length
+        chunk.append(record_id)
+        length += id_length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def build_projection(fields: list) -> dict:
+    """
+    Convert a list of field names into a tree of the fields to keep, nested
+    fields are separated by a dot (e.g. 'variation.number').
+
+    Parameter:
+        fields                  [list]      -   Names of the fields
+
+    Return:
+                                [dict]      -   {field: {sub field: {}}}
+    """
+    projection = {}
+    for field in fields:
+        node = projection
+        for part in field.split('.'):
+            node = node.setdefault(part, {})
+    return projection
+
+
+def get_projection_relations(domain: str, projection: dict) -> list:
+    """
+    Find the relations (additional values of the query), which have to be
+    requested to fill the nested fields of a projection.
+
+    Parameter:
+        domain                  [str]       -   Orders/Items/..
+        projection              [dict]      -   Result of `build_projection`
+
+    Return:
+                                [list]      -   e.g. ['variations'] for the
+                                                field 'variations.number'
+    """
+    relations = []
+    valid_values = constants.VALID_ADDITIONAL_VALUES.get(
+        resolve_domain(domain=domain), [])
+    for relation in valid_values:
+        node = projection
+        for part in relation.split('.'):
+            node = node.get(part)
+            if node is None:
+                break
+        else:
+            relations.append(relation)
+    return relations
+
+
+def project_record(record, projection: dict):
+    """
+    Reduce a record to the fields of the projection, lists of records are
+    reduced element by element.
+
+    Parameter:
+        record                  [dict/list] -   Data record of a response
+        projection              [dict]      -   Result of `build_projection`
+
+    Return:
+                                [dict/list]
+    """
+    if isinstance(record, list):
+        return [project_record(record=entry, projection=projection)
+                for entry in record]
+    # Besides dictionaries, records with a mapping interface (e.g. lazy
+    # records) are projected as well
+    if not hasattr(record, 'keys'):
+        return record
+    projected = {}
+    for key, sub_projection in projection.items():
+        if key not in record:
+            continue
+        value = record[key]
+        if sub_projection:
+            value = project_record(record=value, projection=sub_projection)
+        projected[key] = value
+    return projected
 
 
 def sniff_response_format(response: dict, query: dict) -> dict:
@@ -248,6 +723,111 @@ def get_language(lang: str) -> str:
     return lang
 
 
+@dataclass(frozen=True)
+class QueryBuilder:
+    """
+    Immutable set of valid query arguments for a single domain, used to build
+    the params field of GET requests without modifying the arguments.
+
+    Instances are hashable and cached per domain (`get_query_builder`).
+    """
+    domain: str
+    refine_keys: FrozenSet[str]
+    additional_values: FrozenSet[str]
+
+    def build(self, query: dict = None, refine: dict = None,
+              additional: list = None, lang: str = '') -> dict:
+        """
+        Build a new query dictionary, while dropping invalid arguments.
+
+        Parameter:
+            query       [dict]   -   Dictionary used for the params field for
+                                     the requests module.
+            refine      [dict]   -   Filters for the request
+            additional  [list]   -   additional elements for the response body
+            lang        [str]    -   Name of the language for product texts
+
+        Return:
+                        [dict]   -   new query
+        """
+        params = dict(query) if query else {}
+
+        if refine:
+            invalid_keys = refine.keys() - self.refine_keys
+            if invalid_keys:
+                logging.info(
+                    f"Invalid refine argument key removed: {invalid_keys}")
+            params.update({key: value for key, value in refine.items()
+                           if key in self.refine_keys})
+
+        if additional:
+            invalid_values = set(additional) - self.additional_values
+            if invalid_values:
+                logging.info("Invalid additional argument removed: "
+                             f"{invalid_values}")
+            valid_values = [value for value in additional
+                            if value in self.additional_values]
+            if valid_values:
+                if self.domain == 'order':
+                    params.update({'with[]': valid_values})
+                else:
+                    params.update({'with': ','.join(valid_values)})
+
+        if lang:
+            params.update({'lang': get_language(lang=lang)})
+
+        return params
+
+
+@lru_cache(maxsize=None)
+def _create_query_builder(domain: str) -> QueryBuilder:
+    """ Create the validation sets of a domain only once """
+    return QueryBuilder(
+        domain=domain,
+        refine_keys=frozenset(constants.VALID_REFINE_KEYS.get(domain, [])),
+        additional_values=frozenset(
+            constants.VALID_ADDITIONAL_VALUES.get(domain, []))
+    )
+
+
+def get_query_builder(domain: str) -> QueryBuilder:
+    """
+    Get the cached query builder for a domain or one of its aliases.
+
+    Parameter:
+        domain          [str]    -   type of route for the request
+                                     {item/order/..}
+
+    Return:
+                        [QueryBuilder/None]
+    """
+    valid_domain = resolve_domain(domain=domain)
+    if not valid_domain:
+        return None
+    return _create_query_builder(domain=valid_domain)
+
+
+def freeze_query(query: dict) -> tuple:
+    """
+    Create a hashable and order independent representation of a query, e.g.
+    to use it as a cache key.
+
+    Parameter:
+        query           [dict]   -   Dictionary used for the params field for
+                                     the requests module.
+
+    Return:
+                        [tuple]
+    """
+    if not query:
+        return ()
+    return tuple(sorted(
+        (key, freeze_query(value) if isinstance(value, dict) else
+         tuple(value) if isinstance(value, (list, tuple, set)) else value)
+        for key, value in query.items()
+    ))
+
+
 def sanity_check_parameter(domain: str,
                            query: dict,
                            refine: dict = None,
@@ -255,7 +835,7 @@ def sanity_check_parameter(domain: str,
                            lang: str = ''):
     """
     Build the query dictionary, while checking for invalid arguments and
-    removing them.
+    removing them. None of the arguments is modified.
 
     Parameter:
         domain          [str]    -   type of route for the request
@@ -269,41 +849,13 @@ def sanity_check_parameter(domain: str,
     Return:
                         [dict]   -   updated query
     """
-    if not query:
-        query = {}
-
-    if domain not in constants.VALID_DOMAINS:
+    builder = get_query_builder(domain=domain)
+    if not builder:
         logging.error(f"Invalid domain name {domain}")
         return {}
 
-    if refine:
-        invalid_keys = set(refine.keys()).difference(
-            constants.VALID_REFINE_KEYS[domain])
-        if invalid_keys:
-            logging.info(f"Invalid refine argument key removed: {invalid_keys}")
-            for invalid_key in invalid_keys:
-                refine.pop(invalid_key, None)
-        if refine:
-            query.update(refine)
-
-    if additional:
-        invalid_values = set(additional).difference(
-            constants.VALID_ADDITIONAL_VALUES[domain])
-        if invalid_values:
-            logging.info("Invalid additional argument removed: "
-                         f"{invalid_values}")
-            for invalid_value in invalid_values:
-                additional.remove(invalid_value)
-        if additional:
-            if domain == 'order':
-                query.update({'with[]': additional})
-            else:
-                query.update({'with': ','.join(additional)})
-
-    if lang:
-        query.update({'lang': get_language(lang=lang)})
-
-    return query
+    return builder.build(query=query, refine=refine, additional=additional,
+                         lang=lang)
 
 
 def sanity_check_json(route_name: str, json: dict) -> bool:
@@ -420,6 +972,9 @@ def build_endpoint(url: str, route: str, path: str = '') -> str:
     `build_request_query` function to ensure using correct arguments
     and having the correct HTTP encoding for special signs.
 
+    Plain http is only accepted for the local host (e.g. a stub server
+    of a test or a benchmark).
+
     Parameter:
         url             [str]       -   Base url of the plentymarkets API
         route           [str]       -   Route part endpoint (e.g. /rest/items)
@@ -428,7 +983,10 @@ def build_endpoint(url: str, route: str, path: str = '') -> str:
     Parameter:
                         [str]       -   complete endpoint
     """
-    if not re.search(r'https://.*', url):
+    if (
+        not re.search(r'https://.*', url) and
+        not re.match(constants.LOCAL_URL, url)
+    ):
         logging.error(f"Provided url parameter [{url}] is no valid https url.")
         return ''
 
@@ -439,6 +997,27 @@ def build_endpoint(url: str, route: str, path: str = '') -> str:
     return url + route + path
 
 
+def build_endpoint_map(url: str) -> dict:
+    """
+    Build the endpoint prefix for every valid domain of the given base url
+    once, so that single requests only have to append the path.
+
+    Parameter:
+        url             [str]       -   Base url of the plentymarkets API
+
+    Return:
+                        [dict]      -   Mapping of domain names to endpoint
+                                        prefixes, empty for an invalid url
+    """
+    endpoints = {}
+    for domain, route in constants.DOMAIN_ROUTE_MAP.items():
+        endpoint = build_endpoint(url=url, route=route)
+        if not endpoint:
+            return {}
+        endpoints[domain] = endpoint
+    return endpoints
+
+
 def build_date_update_json(date_type: str, date: datetime.datetime) -> dict:
     """
     Create a valid JSON for a redistribution PUT request to update a date.
@@ -708,15 +1287,21 @@ def json_to_dataframe(json):
 
 
 def transform_data_type(data: dict, data_format: str):
-    """ simple wrapper around the data conversion before return """
-    if not data:
+    """
+    simple wrapper around the data conversion before return, an incomplete
+    result keeps its `partial` flag (within `attrs` for a dataframe)
+    """
+    partial = isinstance(data, PartialResult)
+    if not data and not partial:
         return {}
 
-    if data_format == 'json':
+    if data_format in ['json', 'records', 'lazy']:
         return data
 
     if data_format == 'dataframe':
-        data = json_to_dataframe(json=data)
+        data = json_to_dataframe(json=list(data) if partial else data)
+        if partial:
+            data.attrs['partial'] = True
         return data
 
 
@@ -841,6 +1426,36 @@ def build_date_range(start: str, end: str) -> dict:
     return {'start': w3c_start, 'end': w3c_end}
 
 
+def split_date_range(date_range: dict, parts: int) -> list:
+    """
+    Split a range of 2 dates in the W3C dateformat into consecutive sub-ranges
+    of equal length, the end of each sub-range is the start of the next one.
+
+    Parameter:
+        date_range      [dict]      -   Start & End date in W3C date format
+                                        (use `build_date_range`)
+        parts           [int]       -   Amount of sub-ranges, reduced if the
+                                        sub-ranges would be shorter than a
+                                        second
+
+    Return:
+                        [list]      -   List of date ranges
+    """
+    start = dateutil.parser.parse(date_range['start'])
+    end = dateutil.parser.parse(date_range['end'])
+    parts = max(1, min(parts, int((end - start).total_seconds())))
+    if parts == 1:
+        return [date_range]
+
+    step = (end - start) / parts
+    borders = [date_range['start']]
+    borders += [parse_date(date=(start + step * index).isoformat())
+                for index in range(1, parts)]
+    borders.append(date_range['end'])
+    return [{'start': borders[index], 'end': borders[index + 1]}
+            for index in range(parts)]
+
+
 def date_to_timestamp(date: str) -> int:
     """
     Parse a date object in to a unix timestamp.
@@ -998,3 +1613,40 @@ def summarize_shipment_packages(response: dict, mode: str) -> dict:
             key: list(values) for key, values in pallet_summary.items()
         }
     }
+
+
+def group_stock_by_warehouse(stock: list, variation_ids: set) -> dict:
+    """
+    Collect the variations with stock for each warehouse, restricted to the
+    given set of variations.
+
+    Parameter:
+        stock           [list]      -   Response JSON data from the
+                                        /rest/stockmanagement/stock route
+        variation_ids   [set]       -   Plentymarkets IDs of the variations
+
+    Return:
+                        [dict]      -   Mapping of warehouse IDs to the set of
+                                        stocked variation IDs
+    """
+    warehouse_map = defaultdict(set)
+    for entry in stock:
+        if entry['variationId'] in variation_ids:
+            warehouse_map[entry['warehouseId']].add(entry['variationId'])
+    return dict(warehouse_map)
+
+
+def is_finished_order(order: dict) -> bool:
+    """
+    Check if a redistribution/reorder contains the finish event date.
+
+    Parameter:
+        order           [dict]      -   Order JSON from the /rest/orders route
+
+    Return:
+                        [bool]
+    """
+    return any(
+        event_date['typeId'] == constants.IMPORT_ORDER_DATE_TYPES['finish']
+        for event_date in order['dates']
+    )
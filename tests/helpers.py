@@ -0,0 +1,86 @@
+import threading
+import requests
+import simplejson
+
+import plenty_api
+from plenty_api.resilience import CircuitBreaker, RetryPolicy
+
+
+def build_response(url: str, status_code: int, body: dict,
+                   headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Content-Type'] = 'application/json'
+    response.headers.update(headers or {})
+    response._content = simplejson.dumps(body).encode('utf-8')
+    response.request = requests.Request('GET', url).prepare()
+    return response
+
+
+class FakeSession:
+    """
+    Answers every login and replays the scripted GET responses, the
+    parameters of each GET request are kept within `requests` and its
+    headers within `headers`.
+    """
+    def __init__(self, responses: list = None, handler=None):
+        """
+        Parameter:
+            responses   [list]      -   (status code, body) tuples or
+                                        callables returning a response
+            handler     [callable]  -   Answers every GET request instead,
+                                        (url, params) -> (status, body)
+        """
+        self.responses = responses or []
+        self.handler = handler
+        self.logins = 0
+        self.requests = []
+        self.headers = []
+        self.lock = threading.Lock()
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        self.logins += 1
+        return build_response(url=url, status_code=200, body={
+            'token_type': 'Bearer', 'access_token': f'token{self.logins}'})
+
+    def get(self, url: str, params: dict = None, headers: dict = None,
+            **kwargs) -> requests.Response:
+        with self.lock:
+            self.requests.append((url, dict(params or {})))
+            self.headers.append(dict(headers or {}))
+            if not self.handler:
+                response = self.responses.pop(0)
+        if self.handler:
+            # Called without the lock, so that a slow answer doesn't block
+            # the requests of other threads
+            (status_code, body) = self.handler(url, params)
+            return build_response(url=url, status_code=status_code,
+                                  body=body)
+        if callable(response):
+            return response()
+        (status_code, body) = response
+        return build_response(url=url, status_code=status_code, body=body)
+
+
+def create_api(session=None,
+               base_url: str = 'https://api.plentymarkets-cloud01.com',
+               **kwargs) -> plenty_api.PlentyApi:
+    """
+    Create an API instance with the plain text login.
+
+    Every instance gets a circuit breaker of its own, so that the failed
+    requests of one test don't reject the requests of the next one, and a
+    short retry delay. A local base URL (e.g. http://127.0.0.1:8080) points
+    the instance at a stub server.
+
+    Parameter:
+        session     [Session]   -   FakeSession or None for a real session
+        base_url    [str]       -   Base URL of the system
+        kwargs      [dict]      -   Further arguments of `PlentyApi`
+    """
+    kwargs.setdefault('circuit_breaker', CircuitBreaker())
+    kwargs.setdefault('retry_policy', RetryPolicy(backoff_factor=0.01))
+    return plenty_api.PlentyApi(
+        base_url=base_url, login_method='plain_text',
+        login_data={'user': 'u', 'password': 'p'}, session=session,
+        **kwargs)
@@ -0,0 +1,379 @@
+from urllib.parse import parse_qs, urlparse
+import datetime
+import math
+import time
+import dateutil.parser
+import pytest
+import requests
+
+import plenty_api.api
+import plenty_api.utils as utils
+from plenty_api.constants import MAX_URL_LENGTH
+from plenty_api.sinks import SqliteSink
+from tests.helpers import FakeSession, build_response, create_api
+
+API_URL = 'https://api.plentymarkets-cloud01.com'
+
+
+def _build_url(url: str, params: dict) -> str:
+    return requests.Request('GET', url, params=params).prepare().url
+
+
+def describe_get_orders_by_ids():
+    def with_long_id_list():
+        def _handler(url: str, params: dict):
+            ids = params['orderIds'].split(',')
+            return (200, {'page': 1, 'totalsCount': len(ids),
+                          'isLastPage': True, 'lastPageNumber': 1,
+                          'entries': [{'id': int(x)} for x in ids]})
+
+        session = FakeSession(handler=_handler)
+        plenty = create_api(session=session)
+        order_ids = list(range(10**17, 10**17 + 1000))
+
+        orders = plenty.plenty_api_get_orders_by_ids(
+            order_ids=order_ids,
+            additional=['addresses', 'orderItems.variation',
+                        'orderItems.transactions', 'shippingPackages'])
+
+        assert order_ids == sorted(orders)
+        assert all(orders.values())
+        for url, params in session.requests:
+            full_url = _build_url(url=url, params={**params, 'page': 99999})
+            assert len(full_url) <= MAX_URL_LENGTH
+            assert '250' == parse_qs(urlparse(full_url).query)[
+                'itemsPerPage'][0]
+
+
+def describe_get_stock_batches_for_variations():
+    def _page(entries: list) -> tuple:
+        return (200, {'page': 1, 'totalsCount': len(entries),
+                      'isLastPage': True, 'lastPageNumber': 1,
+                      'entries': entries})
+
+    def _handler(url: str, params: dict):
+        variation_ids = [int(x) for x in params['variationId'].split(',')]
+        if url.endswith('/stockmanagement/stock'):
+            return _page([
+                {'variationId': x, 'warehouseId': 1 + x % 2}
+                for x in variation_ids if x % 3
+            ])
+        warehouse_id = int(url.split('/')[-3])
+        return _page([
+            {'variationId': x, 'warehouseId': warehouse_id,
+             'bestBeforeDate': f'2026-0{warehouse_id}-01'}
+            for x in variation_ids
+        ])
+
+    def with_variation_filter_in_chunks():
+        session = FakeSession(handler=_handler)
+        plenty = create_api(session=session)
+        variation_ids = list(range(10**11, 10**11 + 300))
+
+        batches = plenty.plenty_api_get_stock_batches_for_variations(
+            variation_ids=variation_ids)
+
+        stock_requests = [params for url, params in session.requests
+                          if url.endswith('/stockmanagement/stock')]
+        requested = [int(x) for params in stock_requests
+                     for x in params['variationId'].split(',')]
+        assert 3 == len(stock_requests)
+        assert variation_ids == sorted(requested)
+        for url, params in session.requests:
+            full_url = _build_url(url=url, params={**params, 'page': 99999})
+            assert len(full_url) <= MAX_URL_LENGTH
+        assert sorted(variation_ids) == sorted(batches)
+        for variation_id, locations in batches.items():
+            if variation_id % 3:
+                assert [{'variationId': variation_id,
+                         'warehouseId': 1 + variation_id % 2,
+                         'bestBeforeDate':
+                         f'2026-0{1 + variation_id % 2}-01'}] == locations
+            else:
+                assert [] == locations
+
+    def with_failed_stock_request():
+        session = FakeSession(handler=lambda url, params: (500, {}))
+        plenty = create_api(session=session)
+
+        batches = plenty.plenty_api_get_stock_batches_for_variations(
+            variation_ids=[1, 2])
+
+        assert None is batches
+        assert all(url.endswith('/stockmanagement/stock')
+                   for url, params in session.requests)
+
+    def with_failed_warehouse_request():
+        def _fail_warehouse(url: str, params: dict):
+            if url.endswith('/stockmanagement/stock'):
+                return _handler(url=url, params=params)
+            return (500, {})
+
+        plenty = create_api(session=FakeSession(handler=_fail_warehouse))
+
+        assert None is plenty.plenty_api_get_stock_batches_for_variations(
+            variation_ids=[1, 2])
+
+    def with_empty_warehouse(caplog):
+        def _empty_warehouse(url: str, params: dict):
+            if url.endswith('/stockmanagement/stock'):
+                return _handler(url=url, params=params)
+            return _page([])
+
+        plenty = create_api(session=FakeSession(handler=_empty_warehouse))
+
+        batches = plenty.plenty_api_get_stock_batches_for_variations(
+            variation_ids=[1, 2])
+
+        assert {1: [], 2: []} == batches
+        assert 'failed' not in caplog.text
+
+
+def describe_get_orders_in_shards():
+    START = datetime.datetime(2020, 11, 1, tzinfo=datetime.timezone.utc)
+    PAGE_SIZE = 5
+
+    def _create_orders(hours: list) -> list:
+        return [{'id': index + 1,
+                 'createdAt': (START + datetime.timedelta(hours=hour))}
+                for index, hour in enumerate(hours)]
+
+    def _create_handler(orders: list, slow_after: datetime.datetime = None):
+        def _handler(url: str, params: dict):
+            start = dateutil.parser.parse(params['createdAtFrom'])
+            end = dateutil.parser.parse(params['createdAtTo'])
+            # Both borders are inclusive, like the plentymarkets filter
+            entries = [{'id': order['id'],
+                        'createdAt': order['createdAt'].isoformat()}
+                       for order in orders
+                       if start <= order['createdAt'] <= end]
+            page = params.get('page', 1)
+            size = 1 if params.get('itemsPerPage') == 1 else PAGE_SIZE
+            if slow_after and start >= slow_after and page > 1:
+                time.sleep(0.4)
+                raise requests.exceptions.Timeout()
+            last_page = max(1, math.ceil(len(entries) / size))
+            return (200, {'page': page, 'totalsCount': len(entries),
+                          'isLastPage': page >= last_page,
+                          'lastPageNumber': last_page,
+                          'entries': entries[(page - 1) * size:page * size]})
+        return _handler
+
+    def _shards(session: FakeSession) -> set:
+        return {(params['createdAtFrom'], params['createdAtTo'])
+                for _, params in session.requests
+                if params.get('itemsPerPage') != 1}
+
+    def with_orders_of_all_shards():
+        # The order after 24 hours is at the border of both shards
+        orders = _create_orders(hours=[1, 5, 10, 24, 30, 40, 47])
+        session = FakeSession(handler=_create_handler(orders=orders))
+        plenty = create_api(session=session)
+
+        result = plenty.plenty_api_get_orders_by_date(
+            start='2020-11-01', end='2020-11-03', workers=2)
+
+        assert list(range(1, 8)) == [order['id'] for order in result]
+        assert 2 == len(_shards(session=session))
+
+    def with_dense_shard_split(monkeypatch):
+        monkeypatch.setattr(plenty_api.api, 'ORDER_SHARD_SIZE', 10)
+        orders = _create_orders(hours=[x / 2 for x in range(40)] + [30])
+        session = FakeSession(handler=_create_handler(orders=orders))
+        plenty = create_api(session=session)
+
+        result = plenty.plenty_api_get_orders_by_date(
+            start='2020-11-01', end='2020-11-03', workers=2)
+
+        assert list(range(1, 42)) == sorted(order['id'] for order in result)
+        # 40 orders within the first shard are split into 4 shards
+        assert 5 == len(_shards(session=session))
+
+    def with_exceeded_deadline_of_one_shard():
+        orders = _create_orders(hours=list(range(0, 48, 2)))
+        session = FakeSession(handler=_create_handler(
+            orders=orders, slow_after=START + datetime.timedelta(hours=24)))
+        plenty = create_api(session=session)
+        plenty.raise_on_deadline = True
+
+        with pytest.raises(utils.DeadlineExceeded) as error:
+            plenty.plenty_api_get_orders_by_date(
+                start='2020-11-01', end='2020-11-03', workers=2,
+                deadline=0.3)
+
+        # The first shard and the first page of the second shard
+        assert list(range(1, 18)) == sorted(
+            order['id'] for order in error.value.records)
+
+    def with_sink(tmp_path):
+        orders = _create_orders(hours=[1, 5, 10, 24, 30, 40, 47])
+        session = FakeSession(handler=_create_handler(orders=orders))
+        plenty = create_api(session=session)
+
+        with SqliteSink(path=tmp_path / 'orders.db') as sink:
+            written = plenty.plenty_api_get_orders_by_date(
+                start='2020-11-01', end='2020-11-03', workers=2, sink=sink)
+
+        # The border order is written by both shards
+        assert 8 == written
+        assert not isinstance(written, utils.PartialCount)
+
+    def with_exceeded_deadline_of_sink(tmp_path):
+        orders = _create_orders(hours=list(range(0, 48, 2)))
+        session = FakeSession(handler=_create_handler(
+            orders=orders, slow_after=START + datetime.timedelta(hours=24)))
+        plenty = create_api(session=session)
+
+        with SqliteSink(path=tmp_path / 'orders.db') as sink:
+            written = plenty.plenty_api_get_orders_by_date(
+                start='2020-11-01', end='2020-11-03', workers=2, sink=sink,
+                deadline=0.3)
+        plenty.raise_on_deadline = True
+        with SqliteSink(path=tmp_path / 'orders.db') as sink:
+            with pytest.raises(utils.DeadlineExceeded) as error:
+                plenty.plenty_api_get_orders_by_date(
+                    start='2020-11-01', end='2020-11-03', workers=2,
+                    sink=sink, deadline=0.3)
+
+        assert 18 == written
+        assert isinstance(written, utils.PartialCount)
+        assert 18 == error.value.count
+
+
+def describe_get_pending_reorder():
+    def _order(order_id: int, finished: bool = False) -> dict:
+        dates = [{'typeId': 16, 'date': '2020-11-01T10:00:00+01:00'}]
+        if finished:
+            dates.append({'typeId': 17, 'date': '2020-11-05T10:00:00+01:00'})
+        return {'id': order_id, 'typeId': 4, 'dates': dates}
+
+    def _page(page: int, entries: list) -> tuple:
+        return (200, {'page': page, 'totalsCount': 4,
+                      'isLastPage': page == 2, 'lastPageNumber': 2,
+                      'entries': entries})
+
+    def with_created_after_and_transactions():
+        session = FakeSession(responses=[_page(page=1, entries=[]),
+                                         _page(page=2, entries=[])])
+        plenty = create_api(session=session)
+
+        plenty.plenty_api_get_pending_reorder(created_after='2020-11-01')
+
+        params = session.requests[0][1]
+        assert '2020-11-01T00:00:00+00:00' == params['createdAtFrom']
+        assert ['orderItems.transactions'] == params['with[]']
+
+    def without_transactions():
+        session = FakeSession(responses=[_page(page=1, entries=[]),
+                                         _page(page=2, entries=[])])
+        plenty = create_api(session=session)
+
+        plenty.plenty_api_get_pending_reorder(transactions=False)
+
+        params = session.requests[0][1]
+        assert 'with[]' not in params
+        assert 'createdAtFrom' not in params
+
+    def with_invalid_created_after():
+        session = FakeSession()
+        plenty = create_api(session=session)
+
+        assert None is plenty.plenty_api_get_pending_reorder(
+            created_after='invalid')
+        assert [] == session.requests
+
+    def with_finished_orders_discarded_per_page(monkeypatch):
+        session = FakeSession(responses=[
+            _page(page=1, entries=[_order(1), _order(2, finished=True)]),
+            _page(page=2, entries=[_order(3, finished=True), _order(4)])
+        ])
+        plenty = create_api(session=session)
+        filtered_pages = []
+        is_finished_order = utils.is_finished_order
+
+        def _count_filter(order: dict) -> bool:
+            filtered_pages.append(len(session.requests))
+            return is_finished_order(order)
+
+        monkeypatch.setattr(utils, 'is_finished_order', _count_filter)
+
+        orders = plenty.plenty_api_get_pending_reorder()
+
+        assert [1, 4] == [order['id'] for order in orders]
+        # The orders of the first page are filtered before the second page
+        # is requested
+        assert [1, 1, 2, 2] == filtered_pages
+
+
+def describe_get_pending_redistribution():
+    def with_created_after():
+        session = FakeSession(responses=[(200, {
+            'page': 1, 'totalsCount': 0, 'isLastPage': True,
+            'lastPageNumber': 1, 'entries': []})])
+        plenty = create_api(session=session)
+
+        plenty.plenty_api_get_pending_redistribution(
+            created_after='2020-11-01', transactions=False)
+
+        params = session.requests[0][1]
+        assert '2020-11-01T00:00:00+00:00' == params['createdAtFrom']
+        assert 'with[]' not in params
+
+
+def describe_estimate_get_request():
+    def with_plentymarkets_page_format():
+        session = FakeSession(responses=[(200, {
+            'page': 1, 'totalsCount': 950, 'isLastPage': False,
+            'lastPageNumber': 4, 'entries': [{'id': x} for x in range(250)]
+        })])
+        plenty = create_api(session=session)
+
+        estimate = plenty.plenty_api_estimate_get_request(domain='order')
+
+        assert 4 == estimate['calls']
+        assert 950 == estimate['records']
+        assert -1 == estimate['calls_left']
+        assert estimate['fits_budget']
+        assert 250 == session.requests[0][1]['itemsPerPage']
+        assert 1 == len(session.requests)
+
+    def with_laravel_page_format_without_total():
+        session = FakeSession(responses=[(200, {
+            'current_page': 1, 'last_page': 3, 'data': [{'id': 1}, {'id': 2}]
+        })])
+        plenty = create_api(session=session)
+
+        estimate = plenty.plenty_api_estimate_get_request(domain='contact')
+
+        assert 3 == estimate['calls']
+        # Without a total count, every page is expected to be full
+        assert 6 == estimate['records']
+
+    def with_call_budget():
+        headers = {
+            'X-Plenty-Global-Short-Period-Limit': '10',
+            'X-Plenty-Global-Short-Period-Calls-Left': '1',
+            'X-Plenty-Global-Short-Period-Decay': '30',
+            'X-Plenty-Global-Long-Period-Calls-Left': '2'
+        }
+        body = {'page': 1, 'totalsCount': 950, 'isLastPage': False,
+                'lastPageNumber': 4, 'entries': [{'id': 1}]}
+        plenty = create_api(session=FakeSession(responses=[
+            lambda: build_response(url=API_URL, status_code=200, body=body,
+                                   headers=headers)
+        ]))
+
+        estimate = plenty.plenty_api_estimate_get_request(domain='order')
+
+        assert 2 == estimate['calls_left']
+        assert not estimate['fits_budget']
+        # 3 calls wait for the reset of the short period
+        assert 30 <= estimate['seconds'] < 31
+        assert 10 == plenty.call_budget['short_limit']
+
+    def with_error_response():
+        plenty = create_api(session=FakeSession(responses=[
+            (400, {'error': {'message': 'Invalid filter'}})
+        ]))
+
+        assert None is plenty.plenty_api_estimate_get_request(domain='order')
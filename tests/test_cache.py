@@ -0,0 +1,110 @@
+import time
+
+from plenty_api.cache import ResponseCache
+from tests.helpers import FakeSession, build_response, create_api
+
+API_URL = 'https://api.plentymarkets-cloud01.com'
+
+
+def describe_response_cache():
+    def with_key_independent_of_query_order():
+        first = ResponseCache.build_key(route='/rest/vat',
+                                        query={'page': 1, 'itemsPerPage': 50})
+        second = ResponseCache.build_key(route='/rest/vat',
+                                         query={'itemsPerPage': 50, 'page': 1})
+        third = ResponseCache.build_key(route='/rest/vat', query={'page': 2})
+
+        assert first == second
+        assert first != third
+
+    def without_validators():
+        cache = ResponseCache()
+        key = cache.build_key(route='/rest/vat', query={})
+
+        assert cache.store(key=key, body=[{'id': 1}], headers={}) is False
+        assert cache.get(key=key) is None
+
+    def with_validators():
+        cache = ResponseCache()
+        key = cache.build_key(route='/rest/vat', query={})
+        headers = {'ETag': '"abc"',
+                   'Last-Modified': 'Wed, 21 Oct 2020 07:28:00 GMT'}
+        body = [{'id': 1}]
+
+        assert cache.store(key=key, body=body, headers=headers) is True
+        body[0]['id'] = 2
+        entry = cache.get(key=key)
+
+        assert [{'id': 1}] == entry.body
+        assert {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 21 Oct 2020 07:28:00 GMT'
+        } == entry.get_conditional_headers()
+
+    def with_max_age():
+        cache = ResponseCache(max_age=0.05)
+        key = cache.build_key(route='/rest/vat', query={})
+        cache.store(key=key, body=[], headers={'ETag': '"abc"'})
+
+        assert cache.is_fresh(entry=cache.get(key=key)) is True
+        time.sleep(0.06)
+        assert cache.is_fresh(entry=cache.get(key=key)) is False
+
+    def with_least_recently_used_eviction():
+        cache = ResponseCache(max_entries=2)
+        keys = [cache.build_key(route='/rest/vat', query={'page': page})
+                for page in range(3)]
+        cache.store(key=keys[0], body=[0], headers={'ETag': '"0"'})
+        cache.store(key=keys[1], body=[1], headers={'ETag': '"1"'})
+        cache.get(key=keys[0])
+        cache.store(key=keys[2], body=[2], headers={'ETag': '"2"'})
+
+        assert cache.get(key=keys[0]) is not None
+        assert cache.get(key=keys[1]) is None
+        assert cache.get(key=keys[2]) is not None
+
+
+def describe_cached_request():
+    REFERRERS = [{'id': 1, 'name': 'Amazon'}]
+
+    def _response(status_code: int, body, headers: dict):
+        return lambda: build_response(
+            url=f'{API_URL}/rest/orders/referrers', status_code=status_code,
+            body=body, headers=headers)
+
+    def with_not_modified_response():
+        session = FakeSession(responses=[
+            _response(status_code=200, body=REFERRERS,
+                      headers={'ETag': '"v1"'}),
+            _response(status_code=304, body={}, headers={'ETag': '"v1"'})
+        ])
+        plenty = create_api(session=session)
+
+        first = plenty.plenty_api_get_referrers()
+        second = plenty.plenty_api_get_referrers()
+
+        assert REFERRERS == first == second
+        assert 'If-None-Match' not in session.headers[0]
+        assert '"v1"' == session.headers[1]['If-None-Match']
+        counters = plenty.instrumentation.snapshot()['counters'][
+            '/rest/orders/referrers']
+        assert 1 == counters['cache_hits']
+        assert 1 == counters['not_modified']
+        assert 2 == counters['cache_lookups']
+
+    def with_changed_response():
+        changed = [{'id': 1, 'name': 'Amazon'}, {'id': 2, 'name': 'Ebay'}]
+        session = FakeSession(responses=[
+            _response(status_code=200, body=REFERRERS,
+                      headers={'ETag': '"v1"'}),
+            _response(status_code=200, body=changed,
+                      headers={'ETag': '"v2"'}),
+            _response(status_code=304, body={}, headers={'ETag': '"v2"'})
+        ])
+        plenty = create_api(session=session)
+
+        plenty.plenty_api_get_referrers()
+
+        assert changed == plenty.plenty_api_get_referrers()
+        assert changed == plenty.plenty_api_get_referrers()
+        assert '"v2"' == session.headers[2]['If-None-Match']
@@ -0,0 +1,116 @@
+from plenty_api.checkpoint import PaginationCheckpoint
+from tests.helpers import FakeSession, create_api
+
+API_URL = 'https://api.plentymarkets-cloud01.com'
+
+
+def describe_pagination_checkpoint():
+    def with_unknown_request(tmp_path):
+        checkpoint = PaginationCheckpoint(path=tmp_path / 'checkpoint.db')
+        key = checkpoint.build_key(domain='orders', path='', query={})
+
+        (last_page, pages) = checkpoint.load(key=key)
+
+        assert 0 == last_page
+        assert [] == list(pages)
+
+    def with_key_independent_of_page_and_alias():
+        query = {'with[]': ['addresses'], 'createdAtFrom': '2020-11-27'}
+        paged_query = {'createdAtFrom': '2020-11-27', 'page': 12,
+                       'with[]': ['addresses']}
+
+        first = PaginationCheckpoint.build_key(domain='orders', path='',
+                                               query=query)
+        second = PaginationCheckpoint.build_key(domain='order', path='',
+                                                query=paged_query)
+        third = PaginationCheckpoint.build_key(domain='order', path='/x',
+                                               query=query)
+
+        assert first == second
+        assert first != third
+
+    def with_key_per_system():
+        first = PaginationCheckpoint.build_key(
+            domain='orders', path='', query={},
+            url='https://a.plentymarkets-cloud01.com')
+        second = PaginationCheckpoint.build_key(
+            domain='orders', path='', query={},
+            url='https://A.plentymarkets-cloud01.com/')
+        third = PaginationCheckpoint.build_key(
+            domain='orders', path='', query={},
+            url='https://b.plentymarkets-cloud01.com')
+
+        assert first == second
+        assert first != third
+
+    def with_resumed_request(tmp_path):
+        path = tmp_path / 'checkpoint.db'
+        query = {'createdAtFrom': '2020-11-27'}
+        checkpoint = PaginationCheckpoint(path=path)
+        key = checkpoint.build_key(domain='orders', path='', query=query)
+        checkpoint.save_page(key=key, domain='orders', path='', query=query,
+                             page=1, records=[{'id': 1}, {'id': 2}])
+        checkpoint.save_page(key=key, domain='orders', path='', query=query,
+                             page=2, records=[{'id': 3}])
+        checkpoint.close()
+
+        resumed = PaginationCheckpoint(path=path)
+        (last_page, pages) = resumed.load(key=key)
+
+        assert 2 == last_page
+        assert [{'id': 1}, {'id': 2}] == next(pages)
+        # Pages are stored while the completed pages are consumed
+        resumed.save_page(key=key, domain='orders', path='', query=query,
+                          page=3, records=[{'id': 4}])
+        assert [[{'id': 3}]] == list(pages)
+
+    def with_completed_request(tmp_path):
+        checkpoint = PaginationCheckpoint(path=tmp_path / 'checkpoint.db')
+        key = checkpoint.build_key(domain='orders', path='', query={})
+        checkpoint.save_page(key=key, domain='orders', path='', query={},
+                             page=1, records=[{'id': 1}])
+
+        checkpoint.clear(key=key)
+
+        (last_page, pages) = checkpoint.load(key=key)
+
+        assert 0 == last_page
+        assert [] == list(pages)
+
+
+def describe_get_request_with_checkpoint():
+    def _page(page: int, last_page: int, entries: list) -> tuple:
+        return (200, {'page': page, 'totalsCount': 6,
+                      'isLastPage': page == last_page,
+                      'lastPageNumber': last_page, 'entries': entries})
+
+    def with_resume_after_failed_page(tmp_path):
+        checkpoint = PaginationCheckpoint(path=tmp_path / 'checkpoint.db')
+        key = checkpoint.build_key(domain='stockmanagement', path='',
+                                   query={}, url=API_URL)
+        failing = FakeSession(responses=[
+            _page(page=1, last_page=3, entries=[{'id': 1}, {'id': 2}]),
+            _page(page=2, last_page=3, entries=[{'id': 3}, {'id': 4}]),
+            (400, {'error': {'message': 'Bad request'}})
+        ])
+        plenty = create_api(session=failing)
+        plenty.checkpoint = checkpoint
+
+        failed = plenty.plenty_api_get_stock()
+
+        assert 'error' in failed
+        assert 2 == checkpoint.load(key=key)[0]
+
+        resumed = FakeSession(responses=[
+            _page(page=3, last_page=3, entries=[{'id': 5}, {'id': 6}])
+        ])
+        plenty = create_api(session=resumed)
+        plenty.checkpoint = checkpoint
+
+        stock = plenty.plenty_api_get_stock()
+
+        assert [{'id': x} for x in range(1, 7)] == stock
+        assert [3] == [params['page'] for _, params in resumed.requests]
+        (last_page, pages) = checkpoint.load(key=key)
+        assert 0 == last_page
+        assert [] == list(pages)
@@ -0,0 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import pytest
+
+import plenty_api
+import plenty_api.utils as utils
+from plenty_api.coalesce import SingleFlight
+from tests.helpers import FakeSession, build_response, create_api
+
+
+def describe_single_flight():
+    def with_concurrent_identical_requests():
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return [{'id': 1}]
+
+        def request(_):
+            return flight.do(key=('vat', ()), function=fetch)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(request, 0)
+            started.wait()
+            followers = list(executor.map(request, range(3)))
+        results = [leader.result()] + followers
+
+        assert 1 == len(calls)
+        assert [False, True, True, True] == [shared for _, shared in results]
+        assert all([{'id': 1}] == result for result, _ in results)
+        results[0][0][0]['id'] = 2
+        assert all([{'id': 1}] == result for result, _ in results[1:])
+
+    def with_sequential_requests():
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return len(calls)
+
+        assert (1, False) == flight.do(key='a', function=fetch)
+        assert (2, False) == flight.do(key='a', function=fetch)
+
+    def with_failed_request():
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            time.sleep(0.05)
+            raise RuntimeError('failed')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, 'a', fetch)
+            started.wait()
+            follower = executor.submit(flight.do, 'a', fetch)
+            with pytest.raises(RuntimeError):
+                leader.result()
+            with pytest.raises(RuntimeError):
+                follower.result()
+        assert {} == flight.flights
+
+    def with_timeout_of_follower():
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            time.sleep(0.3)
+            return 1
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, 'a', fetch)
+            started.wait()
+            begin = time.monotonic()
+            with pytest.raises(TimeoutError):
+                flight.do(key='a', function=fetch, timeout=0.05)
+            assert time.monotonic() - begin < 0.2
+            assert (1, False) == leader.result()
+
+
+def describe_coalesced_get_request():
+    def _page(page: int, last_page: int, delay: float = 0.0):
+        def respond():
+            time.sleep(delay)
+            return build_response(
+                url='https://coalesce.plentymarkets-cloud01.com',
+                status_code=200, body={
+                    'page': page, 'totalsCount': 2 * last_page,
+                    'isLastPage': page >= last_page,
+                    'lastPageNumber': last_page,
+                    'entries': [{'variationId': page, 'warehouseId': 1},
+                                {'variationId': page, 'warehouseId': 2}]
+                })
+        return respond
+
+    def _create_api(session: FakeSession) -> plenty_api.PlentyApi:
+        plenty = create_api(session=session)
+        plenty.single_flight = SingleFlight()
+        return plenty
+
+    def with_shorter_deadline_of_follower():
+        session = FakeSession(responses=[_page(page=1, last_page=1,
+                                               delay=0.4)])
+        plenty = _create_api(session=session)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(plenty.plenty_api_get_stock)
+            time.sleep(0.1)
+            begin = time.monotonic()
+            follower = plenty.plenty_api_get_stock(deadline=0.05)
+            waited = time.monotonic() - begin
+            stock = leader.result()
+
+        assert waited < 0.3
+        assert isinstance(follower, utils.PartialResult)
+        assert [] == follower
+        assert 2 == len(stock)
+
+    def with_longer_deadline_of_follower():
+        session = FakeSession(responses=[
+            _page(page=1, last_page=2, delay=0.3),
+            _page(page=1, last_page=2), _page(page=2, last_page=2)
+        ])
+        plenty = _create_api(session=session)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(plenty.plenty_api_get_stock,
+                                     deadline=0.2)
+            time.sleep(0.1)
+            follower = plenty.plenty_api_get_stock()
+            stock = leader.result()
+
+        assert isinstance(stock, utils.PartialResult)
+        assert 2 == len(stock)
+        assert not isinstance(follower, utils.PartialResult)
+        assert 4 == len(follower)
+        assert 3 == len(session.requests)
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+import simplejson
+
+from plenty_api.interning import StringInterner
+
+
+def _pages():
+    for page in range(2):
+        yield simplejson.dumps([
+            {'id': page * 10 + index, 'currency': 'EUR', 'plentyId': 12345,
+             'statusId': 7.0, 'name': f'Order {index}'}
+            for index in range(3)
+        ]).encode('utf-8')
+
+
+def describe_string_interner():
+    def with_shared_values():
+        interner = StringInterner()
+        records = []
+        for page in _pages():
+            (data, _) = interner.decode(content=page)
+            records += data
+
+        assert 6 == len(records)
+        assert all(record['currency'] is records[0]['currency']
+                   for record in records)
+        assert all(record['plentyId'] is records[0]['plentyId']
+                   for record in records)
+        assert all(record['statusId'] is records[0]['statusId']
+                   for record in records)
+        # Keys are shared across pages
+        keys = [list(record.keys())[1] for record in records]
+        assert all(key is keys[0] for key in keys)
+
+    def with_other_fields():
+        interner = StringInterner(fields=['currency'])
+        records = []
+        for page in _pages():
+            records += interner.decode(content=page)[0]
+
+        assert records[0]['currency'] is records[3]['currency']
+        assert 0 == len(interner.pools[int])
+
+    def with_saved_bytes():
+        interner = StringInterner()
+        pages = list(_pages())
+
+        (_, first) = interner.decode(content=pages[0])
+        (_, second) = interner.decode(content=pages[1])
+
+        assert 0 < first <= second
+
+    def with_limits():
+        interner = StringInterner(fields=['name', 'currency'], max_length=3,
+                                  max_entries=1)
+        for page in _pages():
+            interner.decode(content=page)
+
+        assert {'EUR': 'EUR'} == interner.pools[str]
+        interner.clear()
+        assert {} == interner.pools[str]
+
+    def with_concurrent_threads():
+        interner = StringInterner(max_entries=50)
+        pages = [simplejson.dumps([
+            {'id': page * 100 + index, 'currency': f'C{index % 80}'}
+            for index in range(100)
+        ]).encode('utf-8') for page in range(32)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda page: interner.decode(content=page)[0], pages))
+
+        records = [record for result in results for record in result]
+        assert 3200 == len(records)
+        assert 50 == len(interner.pools[str])
+        pool = interner.pools[str]
+        assert all(pool.get(record['currency'], record['currency'])
+                   is record['currency'] for record in records)
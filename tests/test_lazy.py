@@ -0,0 +1,76 @@
+import copy
+import pickle
+import pytest
+
+import plenty_api.lazy as lazy
+from plenty_api.lazy import LazyRecord, parse_page, materialize
+
+PAGE = (b'{"page": 1, "isLastPage": true, "lastPageNumber": 1, "entries": ['
+        b'{"id": 1, "statusId": 7.0, '
+        b'"orderItems": [{"id": 10, "quantity": 2}],'
+        b' "addresses": [{"id": 5, "town": "Koeln"}]}]}')
+
+
+def describe_parse_page():
+    def without_on_demand_parser(monkeypatch):
+        monkeypatch.setattr(lazy, 'simdjson', None)
+        page = parse_page(content=PAGE)
+
+        assert not lazy.is_available()
+        assert {'id': 10, 'quantity': 2} == page['entries'][0]['orderItems'][0]
+
+    def with_on_demand_parser():
+        pytest.importorskip('simdjson')
+        page = parse_page(content=PAGE)
+
+        assert 1 == page['page']
+        assert isinstance(page['entries'], list)
+        assert isinstance(page['entries'][0], LazyRecord)
+
+    def with_list_response():
+        pytest.importorskip('simdjson')
+        page = parse_page(content=b'[{"id": 1}, {"id": 2}]')
+
+        assert [1, 2] == [record['id'] for record in page]
+
+    def with_invalid_json():
+        with pytest.raises(ValueError):
+            parse_page(content=b'<html></html>')
+
+
+def describe_lazy_record():
+    def _order():
+        pytest.importorskip('simdjson')
+        return parse_page(content=PAGE)['entries'][0]
+
+    def with_field_access():
+        order = _order()
+
+        assert 7.0 == order['statusId']
+        assert 'Koeln' == order['addresses'][0]['town']
+        assert isinstance(order['orderItems'][0], LazyRecord)
+        assert None is order.get('missing')
+        assert 'statusId' in order
+        with pytest.raises(KeyError):
+            order['missing']
+
+    def with_assigned_fields():
+        order = _order()
+        order['statusId'] = 7.1
+        order['shippingPackages'] = []
+
+        assert 7.1 == order['statusId']
+        assert ['id', 'statusId', 'orderItems', 'addresses',
+                'shippingPackages'] == list(order.keys())
+        assert [] == order.to_dict()['shippingPackages']
+
+    def with_copies():
+        order = _order()
+        expected = {'id': 1, 'statusId': 7.0,
+                    'orderItems': [{'id': 10, 'quantity': 2}],
+                    'addresses': [{'id': 5, 'town': 'Koeln'}]}
+
+        assert expected == copy.deepcopy(order)
+        assert expected == pickle.loads(pickle.dumps(order))
+        assert expected == materialize([order])[0]
+        assert order == expected
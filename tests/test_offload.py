@@ -0,0 +1,55 @@
+import pytest
+
+from plenty_api.offload import ProcessOffload
+from plenty_api.utils import (
+    create_vat_mapping, json_to_dataframe, summarize_shipment_packages
+)
+
+
+@pytest.fixture(scope='module')
+def offload():
+    with ProcessOffload(max_workers=1) as executor:
+        yield executor
+
+
+def describe_process_offload():
+    def with_mapping(offload):
+        data = [{'countryId': 1, 'id': 2, 'taxIdNumber': 'DE123'},
+                {'countryId': 1, 'id': 4, 'taxIdNumber': 'DE123'},
+                {'countryId': 5, 'id': 3, 'taxIdNumber': 'FR123'}]
+
+        result = offload.run('create_vat_mapping', data=data, subset=[1])
+
+        assert {'1': {'config': ['2', '4'], 'TaxId': 'DE123'}} == result
+        assert create_vat_mapping(data=data, subset=[1]) == result
+
+    def with_dataframe_pages(offload):
+        pages = [[{'id': 1, 'item': {'a': 1}}], [{'id': 2, 'item': {'a': 2}}]]
+
+        futures = [offload.submit('json_to_dataframe', json=page)
+                   for page in pages]
+        frames = [future.result() for future in futures]
+
+        assert [1] == frames[0]['id'].tolist()
+        assert json_to_dataframe(json=pages[1]).equals(frames[1])
+
+    def with_shipment_summary(offload):
+        response = [{
+            'palletId': 7, 'noOfPackage': 1,
+            'content': [{'variationId': 1234, 'itemQuantity': 2,
+                         'packageId': 3}]
+        }]
+
+        result = offload.run('summarize_shipment_packages',
+                             response=response, mode='minimal')
+
+        assert {7: [3]} == result['pallets']
+        assert summarize_shipment_packages(response=response,
+                                           mode='minimal') == result
+
+    def with_unknown_function(offload):
+        with pytest.raises(ValueError):
+            offload.submit('build_login_token', response_json={})
+        with pytest.raises(ValueError):
+            offload.submit('attribute_variation_mapping', variation=[],
+                           attribute=[])
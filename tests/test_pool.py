@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import pytest
+
+import plenty_api.pool
+from plenty_api.pool import PlentyApiPool
+
+
+class FakeApi:
+    created = []
+    lock = threading.Lock()
+
+    def __init__(self, base_url, session=None, rate_limiter=None, **kwargs):
+        time.sleep(0.01)
+        with FakeApi.lock:
+            FakeApi.created.append(base_url)
+        self.base_url = base_url
+        self.session = session
+        self.rate_limiter = rate_limiter
+
+    def plenty_api_get_stock(self, refine):
+        if 'broken' in self.base_url:
+            raise RuntimeError('connection failed')
+        return [{'variationId': refine['variationId'],
+                 'url': self.base_url}]
+
+
+def _create_pool(monkeypatch):
+    FakeApi.created = []
+    monkeypatch.setattr(plenty_api.pool, 'PlentyApi', FakeApi)
+    pool = PlentyApiPool(max_workers=4)
+    pool.register(name='shop_a', base_url='https://a.plentymarkets.com',
+                  rate=5, burst=2)
+    pool.register(name='shop_b', base_url='https://b.plentymarkets.com')
+    return pool
+
+
+def describe_plenty_api_pool():
+    def with_lazy_creation(monkeypatch):
+        with _create_pool(monkeypatch) as pool:
+            assert [] == FakeApi.created
+
+            client = pool.get(name='shop_a')
+
+            assert ['https://a.plentymarkets.com'] == FakeApi.created
+            assert client is pool.get(name='shop_a')
+            assert client.session is pool.sessions['shop_a']
+            assert client.rate_limiter.rate == 5
+            assert pool.get(name='shop_b').rate_limiter is None
+
+    def with_single_creation_per_tenant(monkeypatch):
+        with _create_pool(monkeypatch) as pool:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                clients = list(executor.map(lambda _: pool.get('shop_a'),
+                                            range(16)))
+
+            assert 1 == len(FakeApi.created)
+            assert all(client is clients[0] for client in clients)
+
+    def with_duplicate_tenant(monkeypatch):
+        with _create_pool(monkeypatch) as pool:
+            with pytest.raises(ValueError):
+                pool.register(name='shop_a', base_url='https://c.com')
+
+    def with_fan_out(monkeypatch):
+        with _create_pool(monkeypatch) as pool:
+            pool.register(name='shop_c',
+                          base_url='https://broken.plentymarkets.com')
+
+            result = pool.get_stock_for_variation(variation_id=1234)
+
+            assert ['shop_a', 'shop_b', 'shop_c'] == list(result)
+            assert 'https://b.plentymarkets.com' == result['shop_b'][0]['url']
+            assert result['shop_c'] is None
+
+    def with_concurrent_tenants(monkeypatch):
+        with _create_pool(monkeypatch) as pool:
+            names = [f'shop_{index}' for index in range(8)]
+            for name in names:
+                pool.register(name=name,
+                              base_url=f'https://{name}.plentymarkets.com')
+
+            result = pool.get_stock_for_variation(variation_id=1234,
+                                                  tenants=names)
+            sessions = [pool.get(name=name).session for name in names]
+
+            assert all(f'https://{name}.plentymarkets.com' ==
+                       result[name][0]['url'] for name in names)
+            assert len(names) == len({id(session) for session in sessions})
+            assert len(names) == len({id(session.cookies)
+                                      for session in sessions})
+            assert all(session.get_adapter('https://x.com') is pool.adapter
+                       for session in sessions)
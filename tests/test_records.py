@@ -0,0 +1,111 @@
+import copy
+import pickle
+import pytest
+
+from plenty_api.records import (
+    Order, OrderItem, Transaction, Variation, StockRow, StorageLocation,
+    get_record_type, convert
+)
+
+
+@pytest.fixture
+def sample_order() -> dict:
+    return {
+        'id': 1, 'typeId': 1, 'statusId': 7.0, 'plentyId': 12345,
+        'createdAt': '2020-11-27T10:00:00+01:00',
+        'orderItems': [{
+            'id': 10, 'orderId': 1, 'itemVariationId': 1234, 'quantity': 2,
+            'transactions': [{'id': 100, 'quantity': 2, 'direction': 'out'}]
+        }],
+        'customField': 'value'
+    }
+
+
+def describe_record():
+    def with_nested_records(sample_order):
+        order = Order.from_dict(data=sample_order)
+
+        assert 1 == order.id
+        assert isinstance(order.orderItems[0], OrderItem)
+        assert isinstance(order.orderItems[0].transactions[0], Transaction)
+        assert 'out' == order['orderItems'][0]['transactions'][0]['direction']
+        assert not hasattr(order, '__dict__')
+
+    def with_unknown_fields(sample_order):
+        order = Order.from_dict(data=sample_order)
+
+        assert {'customField': 'value'} == order.extra
+        assert 'value' == order['customField']
+        assert 'customField' in order
+        assert None is order.get('missing')
+        with pytest.raises(KeyError):
+            order['missing']
+
+    def with_dictionary_access(sample_order):
+        order = Order.from_dict(data=sample_order)
+        order['statusId'] = 7.1
+        order['shippingPackages'] = []
+        order['note'] = 'checked'
+
+        assert 7.1 == order.statusId
+        assert [] == order.shippingPackages
+        assert 'checked' == order.extra['note']
+
+    def with_conversion_to_dict(sample_order):
+        data = Order.from_dict(data=sample_order).to_dict()
+
+        assert 1 == data['id']
+        assert 'value' == data['customField']
+        assert 1234 == data['orderItems'][0]['itemVariationId']
+        assert 'out' == data['orderItems'][0]['transactions'][0]['direction']
+        assert None is data['updatedAt']
+
+    def with_copy_and_pickle(sample_order):
+        order = Order.from_dict(data=sample_order)
+
+        assert order == copy.deepcopy(order)
+        assert order == pickle.loads(pickle.dumps(order))
+
+    def with_keyword_arguments():
+        row = StockRow(variationId=5, stockNet=3, custom=1)
+
+        assert 5 == row.variationId
+        assert None is row.warehouseId
+        assert {'custom': 1} == row.extra
+
+
+def describe_get_record_type():
+    def with_known_routes():
+        assert Order == get_record_type(domain='order')
+        assert Variation == get_record_type(domain='variation')
+        assert StockRow == get_record_type(domain='stockmanagement')
+        assert StorageLocation == get_record_type(
+            domain='warehouses', path='/104/stock/storageLocations')
+
+    def with_unknown_routes():
+        assert None is get_record_type(domain='item')
+        assert None is get_record_type(domain='order', path='/1/shipping')
+        assert None is get_record_type(domain='warehouses')
+
+
+def describe_convert():
+    def with_variation_stock():
+        data = [{'id': 1, 'itemId': 2, 'stock': [{'warehouseId': 104,
+                                                  'netStock': 3}]}]
+        variations = convert(domain='variation', data=data)
+
+        assert isinstance(variations[0].stock[0], StockRow)
+        assert 3 == variations[0].stock[0].netStock
+
+    def with_page_replaced_in_place():
+        data = [{'variationId': 1, 'warehouseId': 104, 'netStock': 3},
+                {'variationId': 2, 'warehouseId': 104, 'netStock': 0}]
+        stock = convert(domain='stockmanagement', data=data)
+
+        assert stock is data
+        assert all(isinstance(row, StockRow) for row in data)
+        assert 3 == data[0].netStock
+
+    def without_record_type():
+        data = [{'id': 1}]
+        assert data is convert(domain='item', data=data)
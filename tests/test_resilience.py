@@ -0,0 +1,222 @@
+import time
+import pytest
+import requests
+
+import plenty_api.utils as utils
+from plenty_api.resilience import (
+    CircuitBreaker, RateLimiter, RetryPolicy, get_circuit_breaker
+)
+from tests.helpers import FakeSession, create_api
+
+
+def describe_retry_policy():
+    def with_default_methods():
+        policy = RetryPolicy()
+
+        assert policy.allows_method(method='GET') is True
+        assert policy.allows_method(method='put') is True
+        assert policy.allows_method(method='post') is False
+        assert policy.allows_method(method='post', idempotent=True) is True
+        assert policy.allows_method(method='get', idempotent=False) is False
+
+    def with_retryable_statuses():
+        policy = RetryPolicy()
+
+        assert policy.allows_status(status_code=503) is True
+        assert policy.allows_status(status_code=404) is False
+
+    def with_delay_within_bounds():
+        policy = RetryPolicy(backoff_factor=1.0, max_backoff=5.0)
+
+        for attempt in range(10):
+            delay = policy.get_delay(attempt=attempt)
+            assert 0 <= delay <= min(5.0, 2 ** attempt)
+
+    def with_max_retries():
+        policy = RetryPolicy(max_retries=2)
+
+        assert policy.acquire(attempt=0) is True
+        assert policy.acquire(attempt=1) is True
+        assert policy.acquire(attempt=2) is False
+
+    def with_exhausted_budget():
+        policy = RetryPolicy(budget=2.0, budget_ratio=0.5)
+
+        assert policy.acquire(attempt=0) is True
+        assert policy.acquire(attempt=0) is True
+        assert policy.acquire(attempt=0) is False
+
+        policy.record_success()
+        policy.record_success()
+
+        assert policy.acquire(attempt=0) is True
+        assert policy.acquire(attempt=0) is False
+
+
+def describe_circuit_breaker():
+    def with_consecutive_failures():
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert breaker.state == 'closed'
+        assert breaker.allow_request() is True
+
+        breaker.record_failure()
+
+        assert breaker.state == 'open'
+        assert breaker.allow_request() is False
+
+    def with_limited_half_open_probes():
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01,
+                                 half_open_probes=2)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == 'half_open'
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+
+        assert breaker.state == 'closed'
+
+    def with_failed_probe():
+        breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=0.01)
+        for _ in range(5):
+            breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.allow_request() is True
+
+        breaker.record_failure()
+
+        assert breaker.state == 'open'
+
+    def with_released_probe():
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker.release_probe()
+
+        assert breaker.state == 'half_open'
+        assert breaker.allow_request() is True
+
+    def with_probe_released_by_deadline_and_reauthentication():
+        def _time_out():
+            time.sleep(0.1)
+            raise requests.exceptions.Timeout()
+
+        page = {'page': 1, 'totalsCount': 1, 'isLastPage': True,
+                'lastPageNumber': 1, 'entries': [{'variationId': 1}]}
+        session = FakeSession(responses=[
+            _time_out, (401, {'error': {'message': 'Unauthenticated'}}),
+            (200, page)
+        ])
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        plenty = create_api(session=session, circuit_breaker=breaker)
+        plenty.raise_on_deadline = True
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == 'half_open'
+        with pytest.raises(utils.DeadlineExceeded):
+            plenty.plenty_api_get_stock(deadline=0.05)
+
+        assert [{'variationId': 1}] == plenty.plenty_api_get_stock()
+        assert 2 == session.logins
+        assert breaker.state == 'closed'
+
+    def with_latency_spike():
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60,
+                                 latency_threshold=2.0)
+
+        breaker.record_success(latency=1.0)
+
+        assert breaker.state == 'closed'
+
+        breaker.record_success(latency=3.0)
+
+        assert breaker.state == 'open'
+
+    def with_shared_breaker_per_host():
+        first = get_circuit_breaker(base_url='https://a.plentymarkets.com/')
+        second = get_circuit_breaker(base_url='https://A.plentymarkets.com')
+        third = get_circuit_breaker(base_url='https://b.plentymarkets.com')
+
+        assert first is second
+        assert first is not third
+
+
+def describe_rate_limiter():
+    def with_burst():
+        limiter = RateLimiter(rate=1, burst=3)
+
+        assert all(limiter.acquire(timeout=0) for _ in range(3))
+        assert limiter.acquire(timeout=0) is False
+
+    def with_refill():
+        limiter = RateLimiter(rate=50, burst=1)
+        limiter.acquire()
+        start = time.monotonic()
+
+        assert limiter.acquire(timeout=1) is True
+        assert time.monotonic() - start >= 0.015
+
+
+def describe_request_retries():
+    PAGE = {'page': 1, 'totalsCount': 1, 'isLastPage': True,
+            'lastPageNumber': 1, 'entries': [{'variationId': 1}]}
+
+    def _reset_connection():
+        raise requests.exceptions.ConnectionError('Connection reset by peer')
+
+    def _counters(plenty) -> dict:
+        return plenty.instrumentation.snapshot()['counters']['stockmanagement']
+
+    def with_retried_server_error():
+        session = FakeSession(responses=[(503, {}), (502, {}), (200, PAGE)])
+        plenty = create_api(session=session)
+
+        assert [{'variationId': 1}] == plenty.plenty_api_get_stock()
+        assert 3 == len(session.requests)
+        assert 2 == _counters(plenty=plenty)['retries']
+
+    def with_retried_connection_reset():
+        session = FakeSession(responses=[_reset_connection, (200, PAGE)])
+        plenty = create_api(session=session)
+
+        assert [{'variationId': 1}] == plenty.plenty_api_get_stock()
+        assert 2 == len(session.requests)
+        assert 1 == _counters(plenty=plenty)['retries']
+        assert 1 == _counters(plenty=plenty)['errors']
+
+    def with_exhausted_retries():
+        session = FakeSession(responses=[(503, {})] * 3)
+        plenty = create_api(session=session, retry_policy=RetryPolicy(
+            max_retries=2, backoff_factor=0.01))
+
+        assert not plenty.plenty_api_get_stock()
+        assert 3 == len(session.requests)
+
+    def with_throttled_requests_capped(monkeypatch):
+        delays = []
+        monkeypatch.setattr(time, 'sleep', delays.append)
+        session = FakeSession(responses=[(429, {})] * 5)
+        plenty = create_api(session=session,
+                            retry_policy=RetryPolicy(max_throttled=2))
+
+        assert not plenty.plenty_api_get_stock()
+        # Two throttled requests are repeated, the third one gives up
+        assert 3 == len(session.requests)
+        assert 3 == _counters(plenty=plenty)['throttled']
+        assert [3, 3] == delays
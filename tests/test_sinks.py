@@ -0,0 +1,208 @@
+import gzip
+import sqlite3
+import threading
+import time
+import pytest
+import requests
+import simplejson
+
+import plenty_api.utils as utils
+from plenty_api.sinks import NdjsonSink, Sink, SqliteSink
+from tests.helpers import FakeSession, create_api
+
+
+def describe_sink():
+    def with_abstract_write_page():
+        with pytest.raises(TypeError):
+            Sink()
+
+
+def describe_ndjson_sink():
+    def with_records_appended_per_page(tmp_path):
+        path = tmp_path / 'orders.ndjson'
+        with NdjsonSink(path=path) as sink:
+            sink.write(records=[{'id': 1}, {'id': 2}])
+            sink.write(records=[])
+            sink.write(records=[{'id': 3, 'amounts': [{'currency': 'EUR'}]}])
+
+        lines = path.read_text().splitlines()
+
+        assert 3 == sink.written
+        assert [{'id': 1}, {'id': 2},
+                {'id': 3, 'amounts': [{'currency': 'EUR'}]}] == [
+            simplejson.loads(line) for line in lines]
+
+    def with_flushed_pages_before_close(tmp_path):
+        path = tmp_path / 'orders.ndjson'
+        sink = NdjsonSink(path=path)
+        sink.write(records=[{'id': 1}])
+
+        assert '{"id": 1}\n' == path.read_text()
+        sink.close()
+
+    def with_existing_file(tmp_path):
+        path = tmp_path / 'orders.ndjson'
+        with NdjsonSink(path=path) as sink:
+            sink.write(records=[{'id': 1}])
+        with NdjsonSink(path=path) as sink:
+            sink.write(records=[{'id': 2}])
+
+        assert ['{"id": 1}', '{"id": 2}'] == path.read_text().splitlines()
+
+    def with_compression(tmp_path):
+        path = tmp_path / 'orders.ndjson.gz'
+        with NdjsonSink(path=path, compress=True) as sink:
+            sink.write(records=[{'id': 1}])
+            sink.write(records=[{'id': 2}])
+
+        with gzip.open(path, 'rt') as compressed:
+            lines = compressed.read().splitlines()
+
+        assert ['{"id": 1}', '{"id": 2}'] == lines
+
+
+def describe_sqlite_sink():
+    def _read_table(path, table: str = 'records') -> dict:
+        connection = sqlite3.connect(str(path))
+        rows = connection.execute(f'SELECT key, data FROM {table}').fetchall()
+        connection.close()
+        return {key: simplejson.loads(data) for key, data in rows}
+
+    def with_records_per_key(tmp_path):
+        path = tmp_path / 'export.db'
+        with SqliteSink(path=path, table='orders') as sink:
+            sink.write(records=[{'id': 1, 'statusId': 3},
+                                {'id': 2, 'statusId': 5}])
+
+        assert {'1': {'id': 1, 'statusId': 3},
+                '2': {'id': 2, 'statusId': 5}} == _read_table(
+                    path=path, table='orders')
+
+    def with_upsert_of_existing_records(tmp_path):
+        path = tmp_path / 'export.db'
+        with SqliteSink(path=path) as sink:
+            sink.write(records=[{'id': 1, 'statusId': 3}])
+        with SqliteSink(path=path) as sink:
+            sink.write(records=[{'id': 1, 'statusId': 7}, {'id': 2}])
+
+        assert {'1': {'id': 1, 'statusId': 7},
+                '2': {'id': 2}} == _read_table(path=path)
+
+    def with_composite_key(tmp_path):
+        path = tmp_path / 'stock.db'
+        stock = [
+            {'variationId': 10, 'warehouseId': 1, 'netStock': 4},
+            {'variationId': 10, 'warehouseId': 2, 'netStock': 0},
+            {'variationId': 10, 'warehouseId': 1, 'netStock': 3}
+        ]
+        with SqliteSink(path=path, table='stock',
+                        key=('variationId', 'warehouseId')) as sink:
+            sink.write(records=stock)
+
+        assert {'10/1': stock[2], '10/2': stock[1]} == _read_table(
+            path=path, table='stock')
+
+    def with_key_of_the_domain(tmp_path):
+        path = tmp_path / 'stock.db'
+        stock = [{'variationId': 10, 'warehouseId': 1, 'netStock': 4},
+                 {'variationId': 10, 'warehouseId': 2, 'netStock': 0}]
+        with SqliteSink(path=path) as sink:
+            sink.write(records=stock, domain='stockmanagement')
+            sink.write(records=stock, domain='stockmanagement')
+
+        assert {'10/1': stock[0], '10/2': stock[1]} == _read_table(path=path)
+
+    def with_missing_key(tmp_path):
+        with SqliteSink(path=tmp_path / 'stock.db') as sink:
+            with pytest.raises(ValueError):
+                sink.write(records=[{'variationId': 10, 'warehouseId': 1}],
+                           domain='order')
+
+    def with_concurrent_writers(tmp_path):
+        path = tmp_path / 'export.db'
+        sink = SqliteSink(path=path)
+        threads = [
+            threading.Thread(target=sink.write, kwargs={
+                'records': [{'id': shard * 100 + x} for x in range(50)]})
+            for shard in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sink.close()
+
+        assert 200 == sink.written
+        assert 200 == len(_read_table(path=path))
+
+    def with_invalid_table_name(tmp_path):
+        with pytest.raises(ValueError):
+            SqliteSink(path=tmp_path / 'export.db', table='x; DROP TABLE y')
+
+
+def describe_get_request_with_sink():
+    def _time_out():
+        time.sleep(0.3)
+        raise requests.exceptions.Timeout()
+
+    def with_complete_export(tmp_path):
+        page = {'page': 1, 'totalsCount': 2, 'isLastPage': True,
+                'lastPageNumber': 1,
+                'entries': [{'variationId': 1, 'warehouseId': 1},
+                            {'variationId': 2, 'warehouseId': 1}]}
+        plenty = create_api(session=FakeSession(responses=[(200, page)]))
+
+        with SqliteSink(path=tmp_path / 'stock.db') as sink:
+            written = plenty.plenty_api_get_stock(sink=sink)
+
+        assert 2 == written
+        assert not isinstance(written, utils.PartialCount)
+
+    def with_key_fields_kept_by_projection(tmp_path):
+        page = {'page': 1, 'totalsCount': 2, 'isLastPage': True,
+                'lastPageNumber': 1,
+                'entries': [{'id': 1, 'number': 'A', 'model': 'x'},
+                            {'id': 2, 'number': 'B', 'model': 'y'}]}
+        plenty = create_api(session=FakeSession(responses=[(200, page)]))
+
+        with SqliteSink(path=tmp_path / 'variations.db') as sink:
+            written = plenty.plenty_api_get_variations(fields=['number'],
+                                                       sink=sink)
+
+        assert 2 == written
+        connection = sqlite3.connect(str(tmp_path / 'variations.db'))
+        rows = connection.execute('SELECT key, data FROM records').fetchall()
+        connection.close()
+        assert {'1': {'number': 'A', 'id': 1},
+                '2': {'number': 'B', 'id': 2}} == {
+            key: simplejson.loads(data) for key, data in rows}
+
+    def with_exceeded_deadline(tmp_path):
+        page = {'page': 1, 'totalsCount': 4, 'isLastPage': False,
+                'lastPageNumber': 2,
+                'entries': [{'variationId': 1, 'warehouseId': 1},
+                            {'variationId': 2, 'warehouseId': 1}]}
+        plenty = create_api(session=FakeSession(
+            responses=[(200, page), _time_out]))
+
+        with SqliteSink(path=tmp_path / 'stock.db') as sink:
+            written = plenty.plenty_api_get_stock(sink=sink, deadline=0.2)
+
+        assert 2 == written
+        assert isinstance(written, utils.PartialCount)
+
+    def with_written_amount_within_exception(tmp_path):
+        page = {'page': 1, 'totalsCount': 4, 'isLastPage': False,
+                'lastPageNumber': 2,
+                'entries': [{'variationId': 1, 'warehouseId': 1},
+                            {'variationId': 2, 'warehouseId': 1}]}
+        plenty = create_api(session=FakeSession(
+            responses=[(200, page), _time_out]))
+        plenty.raise_on_deadline = True
+
+        with SqliteSink(path=tmp_path / 'stock.db') as sink:
+            with pytest.raises(utils.DeadlineExceeded) as error:
+                plenty.plenty_api_get_stock(sink=sink, deadline=0.2)
+
+        assert 2 == error.value.count
+        assert 'after 2 records' in str(error.value)
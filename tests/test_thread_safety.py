@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import threading
+import pytest
+import simplejson
+
+from tests.helpers import create_api
+
+PAGES = 4
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.logins = 0
+        self.token = ''
+        self.expire_after = None
+        self.requests = 0
+
+
+def _create_handler(state: StubState):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def send_json(self, status: int, body: dict) -> None:
+            body = simplejson.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            with state.lock:
+                state.logins += 1
+                state.token = f'token{state.logins}'
+                token = state.token
+            self.send_json(200, {'token_type': 'Bearer',
+                                 'access_token': token})
+
+        def do_GET(self) -> None:
+            with state.lock:
+                state.requests += 1
+                if state.expire_after == state.requests:
+                    state.token = ''
+                valid = self.headers['Authorization'] == (
+                    f'Bearer {state.token}')
+            if not valid:
+                self.send_json(401, {'error': {'message': 'Unauthenticated'}})
+                return
+            query = parse_qs(urlparse(self.path).query)
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('itemsPerPage', ['50'])[0])
+            item_id = int(query['itemId'][0])
+            self.send_json(200, {
+                'page': page, 'totalsCount': PAGES * per_page,
+                'isLastPage': page >= PAGES, 'lastPageNumber': PAGES,
+                'entries': [{'id': (page - 1) * per_page + index,
+                             'itemId': item_id}
+                            for index in range(per_page)]
+            })
+
+    return StubHandler
+
+
+@pytest.fixture
+def stub_server():
+    state = StubState()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _create_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield (f'http://127.0.0.1:{server.server_address[1]}', state)
+    server.shutdown()
+    server.server_close()
+
+
+def _fetch_all(plenty, item_ids: list) -> list:
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        return list(executor.map(
+            lambda item_id: plenty.plenty_api_get_variations(
+                refine={'itemId': item_id}),
+            item_ids))
+
+
+def describe_shared_instance():
+    def with_concurrent_requests(stub_server):
+        (url, state) = stub_server
+        plenty = create_api(base_url=url)
+        item_ids = list(range(64))
+
+        results = _fetch_all(plenty=plenty, item_ids=item_ids)
+
+        for item_id, variations in zip(item_ids, results):
+            assert PAGES * 250 == len(variations)
+            assert {item_id} == {entry['itemId'] for entry in variations}
+            assert list(range(PAGES * 250)) == [
+                entry['id'] for entry in variations]
+        assert 1 == state.logins
+        assert 64 * PAGES == state.requests
+
+    def with_expired_token(stub_server):
+        (url, state) = stub_server
+        plenty = create_api(base_url=url)
+        state.expire_after = 20
+
+        results = _fetch_all(plenty=plenty, item_ids=list(range(32)))
+
+        assert all(PAGES * 250 == len(variations) for variations in results)
+        # A single login for all threads, whose token expired
+        assert 2 == state.logins
+        counters = plenty.instrumentation.snapshot()['counters']['variation']
+        assert counters['reauthenticated'] > 0
+
+    def with_shared_query(stub_server):
+        (url, _) = stub_server
+        plenty = create_api(base_url=url)
+        query = {'itemId': 7}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: list(plenty.plenty_api_iterate_pages(
+                    domain='variations', query=query, prefetch=0)),
+                range(8)))
+
+        assert {'itemId': 7} == query
+        assert all(PAGES == len(pages) for pages in results)
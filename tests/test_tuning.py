@@ -0,0 +1,37 @@
+from plenty_api.tuning import PageSizeTuner
+
+
+def describe_page_size_tuner():
+    def _measure(tuner, throughput):
+        for _ in range(len(throughput) * tuner.pages_per_candidate):
+            size = tuner.get_page_size(domain='order', maximum=250)
+            tuner.record(domain='order', page_size=size, records=size,
+                         seconds=size / throughput[size])
+        return tuner.get_page_size(domain='order', maximum=250)
+
+    def with_fastest_candidate():
+        tuner = PageSizeTuner(candidates=(50, 100, 250),
+                              pages_per_candidate=2)
+        assert 100 == _measure(tuner, {50: 400, 100: 900, 250: 600})
+        assert {'order': 100} == tuner.chosen
+
+    def with_candidates_above_the_maximum():
+        tuner = PageSizeTuner(candidates=(100, 500))
+        assert 100 == tuner.get_page_size(domain='item', maximum=250)
+        tuner.record(domain='item', page_size=100, records=100, seconds=1)
+        tuner.record(domain='item', page_size=100, records=100, seconds=1)
+        tuner.record(domain='item', page_size=100, records=100, seconds=1)
+        assert 250 == tuner.get_page_size(domain='item', maximum=250)
+
+    def with_incomplete_pages():
+        tuner = PageSizeTuner(candidates=(50, 100), pages_per_candidate=1)
+        tuner.record(domain='order', page_size=50, records=12, seconds=0.1)
+        assert 50 == tuner.get_page_size(domain='order', maximum=250)
+        assert {} == tuner.samples['order']
+
+    def with_reset():
+        tuner = PageSizeTuner(candidates=(50, 100), pages_per_candidate=1)
+        assert 50 == _measure(tuner, {50: 900, 100: 100})
+        tuner.reset(domain='order')
+        assert 50 == tuner.get_page_size(domain='order', maximum=250)
+        assert {} == tuner.chosen
@@ -1,14 +1,22 @@
 import copy
 import pytest
 import requests
+import threading
 
 from plenty_api.utils import (
-    get_route, build_endpoint, check_date_range, parse_date, build_date_range,
+    get_route, resolve_domain, build_endpoint, build_endpoint_map,
+    check_date_range, parse_date, build_date_range,
     get_utc_offset, build_query_date, create_vat_mapping, date_to_timestamp,
     get_language, shrink_price_configuration, sanity_check_parameter,
+    get_query_builder, freeze_query, AttributeValueIndex,
     attribute_variation_mapping, list_contains, json_field_filled,
     build_redistribution_transactions, validate_redistribution_template,
-    summarize_shipment_packages
+    summarize_shipment_packages, group_stock_by_warehouse, is_finished_order,
+    split_date_range, get_total_record_count, merge_unique_records,
+    get_deadline, get_request_timeout, transform_data_type, PartialResult,
+    get_accept_encoding, get_response_size, build_projection, project_record,
+    chunk_ids, get_call_budget, estimate_duration, prefetch,
+    get_projection_relations
 )
 
 
@@ -770,6 +778,30 @@ def test_get_route() -> None:
     assert expected == result
 
 
+def test_resolve_domain() -> None:
+    sample_data = ['order', 'orders', 'ITEMS', 'referrers', 'v2property',
+                   'property', 'itemsx', 'manfacturer', '']
+    expected = ['order', 'order', 'item', 'referrer', 'v2property',
+                'property', '', '', '']
+
+    result = [resolve_domain(domain=domain) for domain in sample_data]
+
+    assert expected == result
+
+
+def describe_build_endpoint_map():
+    def with_valid_url():
+        url = 'https://test.plentymarkets-cloud01.com'
+        result = build_endpoint_map(url=url)
+
+        assert url + '/rest/orders' == result['order']
+        assert url + '/rest/v2/properties' == result['v2property']
+        assert len(result) == 17
+
+    def with_invalid_url():
+        assert {} == build_endpoint_map(url='invalid.com')
+
+
 def test_build_endpoint() -> None:
     sample_data = [
         {'url': 'https://test.plentymarkets-cloud01.com',
@@ -783,12 +815,18 @@ def test_build_endpoint() -> None:
         {'url': '',
          'route': '/rest/orders'},
         {'url': 'https://test.plentymarkets-cloud01.com',
-         'route': ''}
+         'route': ''},
+        {'url': 'http://127.0.0.1:8080',
+         'route': '/rest/orders'},
+        {'url': 'http://test.plentymarkets-cloud01.com',
+         'route': '/rest/orders'},
+        {'url': 'http://127.0.0.1.test.com',
+         'route': '/rest/orders'}
     ]
 
     expected = ['https://test.plentymarkets-cloud01.com/rest/orders',
                 'https://test.plentymarkets-cloud01.com/rest/orders', '', '',
-                '', '']
+                '', '', 'http://127.0.0.1:8080/rest/orders', '', '']
     result = []
 
     for sample in sample_data:
@@ -916,6 +954,48 @@ def test_sanity_check_parameter(sample_sanity_check_parameter: list,
     assert expected_sanity_check_query == result
 
 
+def describe_query_builder():
+    def with_arguments_that_must_not_be_modified():
+        query = {'orderType': 1}
+        refine = {'wrong': 'wrong', 'referrerId': 1}
+        additional = ['wrong', 'addresses']
+        expected = {'orderType': 1, 'referrerId': 1, 'with[]': ['addresses']}
+
+        result = sanity_check_parameter(domain='order', query=query,
+                                        refine=refine, additional=additional)
+
+        assert expected == result
+        assert {'orderType': 1} == query
+        assert {'wrong': 'wrong', 'referrerId': 1} == refine
+        assert ['wrong', 'addresses'] == additional
+
+    def with_alias_domain():
+        builder = get_query_builder(domain='orders')
+
+        assert builder is get_query_builder(domain='order')
+        assert hash(builder) == hash(get_query_builder(domain='order'))
+        assert 'order' == builder.domain
+
+    def with_domain_without_refine_keys():
+        builder = get_query_builder(domain='attribute')
+
+        assert {'with': 'values'} == builder.build(
+            refine={'id': 1}, additional=['values'])
+
+    def with_invalid_domain():
+        assert get_query_builder(domain='wrong') is None
+
+
+def test_freeze_query() -> None:
+    first = {'with[]': ['addresses', 'documents'], 'orderType': 1}
+    second = {'orderType': 1, 'with[]': ['addresses', 'documents']}
+
+    assert freeze_query(query=first) == freeze_query(query=second)
+    assert hash(freeze_query(query=first)) == hash(freeze_query(query=second))
+    assert freeze_query(query={}) == ()
+    assert freeze_query(query=first) != freeze_query(query={'orderType': 1})
+
+
 def test_attribute_variation_mapping(sample_attributes: list,
                                      sample_variation_data: list,
                                      expected_attribute_variation_map: list):
@@ -937,6 +1017,25 @@ def test_attribute_variation_mapping(sample_attributes: list,
     assert expected_attribute_variation_map == result
 
 
+def describe_attribute_value_index():
+    def with_multiple_pages(sample_attributes: list,
+                            sample_variation_data: list,
+                            expected_attribute_variation_map: list):
+        index = AttributeValueIndex()
+
+        assert index.add_variations(variations=sample_variation_data[:4])
+        assert index.add_variations(variations=sample_variation_data[4:])
+        assert [4567, 5678] == index.get(attribute_id=1, value_id=2).tolist()
+        assert [] == index.get(attribute_id=2, value_id=1).tolist()
+        assert expected_attribute_variation_map[0] == index.annotate(
+            attributes=sample_attributes[0])
+
+    def with_variations_without_attribute_values():
+        index = AttributeValueIndex()
+
+        assert not index.add_variations(variations=[{'id': 1}])
+
+
 def test_list_contains():
     l1 = [
         [1, 2, 3],
@@ -1345,3 +1444,334 @@ def describe_summarize_shipment_packages():
         assert summarize_shipment_packages(response=response,
                                            mode='minimal') == expect
 
+
+def describe_group_stock_by_warehouse():
+    def with_empty_stock():
+        assert {} == group_stock_by_warehouse(stock=[], variation_ids={1})
+
+    def with_stock_in_multiple_warehouses():
+        stock = [
+            {'variationId': 1, 'warehouseId': 104, 'stockNet': 3},
+            {'variationId': 2, 'warehouseId': 104, 'stockNet': 1},
+            {'variationId': 1, 'warehouseId': 105, 'stockNet': 8},
+            {'variationId': 3, 'warehouseId': 106, 'stockNet': 2}
+        ]
+        expected = {104: {1, 2}, 105: {1}}
+
+        result = group_stock_by_warehouse(stock=stock, variation_ids={1, 2})
+
+        assert expected == result
+
+
+def describe_is_finished_order():
+    def with_pending_order():
+        order = {'id': 1, 'dates': [{'typeId': 16, 'date': '2021-01-01'}]}
+        assert is_finished_order(order=order) is False
+
+    def with_finished_order():
+        order = {'id': 1, 'dates': [{'typeId': 16, 'date': '2021-01-01'},
+                                    {'typeId': 17, 'date': '2021-01-05'}]}
+        assert is_finished_order(order=order) is True
+
+
+def describe_split_date_range():
+    def with_single_part():
+        date_range = {'start': '2020-11-27T00:00:00+01:00',
+                      'end': '2020-11-28T00:00:00+01:00'}
+        assert [date_range] == split_date_range(date_range=date_range,
+                                                parts=1)
+
+    def with_multiple_parts():
+        date_range = {'start': '2020-11-27T00:00:00+01:00',
+                      'end': '2020-11-28T00:00:00+01:00'}
+        expected = [
+            {'start': '2020-11-27T00:00:00+01:00',
+             'end': '2020-11-27T08:00:00+01:00'},
+            {'start': '2020-11-27T08:00:00+01:00',
+             'end': '2020-11-27T16:00:00+01:00'},
+            {'start': '2020-11-27T16:00:00+01:00',
+             'end': '2020-11-28T00:00:00+01:00'}
+        ]
+        assert expected == split_date_range(date_range=date_range, parts=3)
+
+    def with_more_parts_than_seconds():
+        date_range = {'start': '2020-11-27T00:00:00+01:00',
+                      'end': '2020-11-27T00:00:02+01:00'}
+        assert 2 == len(split_date_range(date_range=date_range, parts=10))
+
+
+def test_get_total_record_count() -> None:
+    samples = [{'page': 1, 'totalsCount': 512, 'isLastPage': False},
+               {'current_page': 1, 'total': '30', 'last_page': 2},
+               {'searchResult': []}]
+    expected = [512, 30, -1]
+
+    result = [get_total_record_count(response=sample) for sample in samples]
+
+    assert expected == result
+
+
+def test_merge_unique_records() -> None:
+    pages = [[{'id': 1}, {'id': 2}], [{'id': 2}, {'id': 3}], []]
+    expected = [{'id': 1}, {'id': 2}, {'id': 3}]
+
+    assert expected == merge_unique_records(pages=pages, key='id')
+
+
+def describe_get_request_timeout():
+    def without_deadline():
+        assert (5, 60) == get_request_timeout(timeout=(5, 60), deadline=None)
+
+    def with_distant_deadline():
+        deadline = get_deadline(seconds=1000)
+        assert (5, 60) == get_request_timeout(timeout=(5, 60),
+                                              deadline=deadline)
+
+    def with_close_deadline():
+        deadline = get_deadline(seconds=2)
+        (connect, read) = get_request_timeout(timeout=(5, 60),
+                                              deadline=deadline)
+        assert 0 < connect <= 2
+        assert 0 < read <= 2
+
+    def with_passed_deadline():
+        deadline = get_deadline(seconds=-1)
+        assert (0.001, 0.001) == get_request_timeout(timeout=(5, None),
+                                                     deadline=deadline)
+
+
+def describe_transform_partial_data():
+    def with_json():
+        data = PartialResult([{'id': 1}])
+        result = transform_data_type(data=data, data_format='json')
+        assert result.partial is True
+        assert [{'id': 1}] == result
+
+    def with_empty_json():
+        result = transform_data_type(data=PartialResult(), data_format='json')
+        assert result.partial is True
+
+    def with_dataframe():
+        data = PartialResult([{'id': 1}, {'id': 2}])
+        result = transform_data_type(data=data, data_format='dataframe')
+        assert result.attrs['partial'] is True
+        assert [1, 2] == result['id'].tolist()
+
+    def with_complete_dataframe():
+        result = transform_data_type(data=[{'id': 1}],
+                                     data_format='dataframe')
+        assert 'partial' not in result.attrs
+
+
+def test_get_accept_encoding() -> None:
+    encodings = get_accept_encoding().split(', ')
+
+    assert ['gzip', 'deflate'] == encodings[:2]
+    assert set(encodings) <= {'gzip', 'deflate', 'br'}
+
+
+def describe_get_response_size():
+    class FakeRaw:
+        def __init__(self, position):
+            self.position = position
+
+        def tell(self):
+            return self.position
+
+    def _build_response(content, raw=None, headers=None):
+        response = requests.Response()
+        response._content = content
+        response.raw = raw
+        response.headers.update(headers or {})
+        return response
+
+    def with_compressed_body():
+        response = _build_response(content=b'x' * 100, raw=FakeRaw(12))
+        assert (12, 100) == get_response_size(response=response)
+
+    def with_content_length():
+        response = _build_response(content=b'x' * 100,
+                                  headers={'Content-Length': '40'})
+        assert (40, 100) == get_response_size(response=response)
+
+    def without_size_information():
+        response = _build_response(content=b'x' * 100)
+        assert (100, 100) == get_response_size(response=response)
+
+
+def test_build_projection() -> None:
+    fields = ['id', 'variation.number', 'variation.stock.netStock', 'id']
+    expected = {'id': {},
+                'variation': {'number': {}, 'stock': {'netStock': {}}}}
+
+    assert expected == build_projection(fields=fields)
+
+
+def describe_get_projection_relations():
+    def with_nested_fields_of_relations():
+        projection = build_projection(fields=['id', 'stock.netStock',
+                                              'variationBarcodes'])
+
+        assert ['variationBarcodes', 'stock'] == get_projection_relations(
+            domain='variation', projection=projection)
+
+    def with_nested_relation():
+        projection = build_projection(fields=['orderItems.variation.number',
+                                              'orderItems.quantity'])
+
+        assert ['orderItems.variation'] == get_projection_relations(
+            domain='orders', projection=projection)
+
+    def with_plain_fields():
+        projection = build_projection(fields=['id', 'number'])
+
+        assert [] == get_projection_relations(domain='item',
+                                              projection=projection)
+        assert [] == get_projection_relations(domain='unknown',
+                                              projection=projection)
+
+
+def describe_project_record():
+    def with_flat_fields():
+        record = {'id': 1, 'number': 'A-1', 'model': 'x', 'weightG': 200}
+        projection = build_projection(fields=['id', 'number', 'missing'])
+
+        assert {'id': 1, 'number': 'A-1'} == project_record(
+            record=record, projection=projection)
+
+    def with_nested_fields():
+        records = [{'id': 1, 'stock': [{'netStock': 3, 'warehouseId': 1},
+                                       {'netStock': 5, 'warehouseId': 2}],
+                    'item': {'id': 9, 'texts': []}}]
+        projection = build_projection(fields=['id', 'stock.netStock',
+                                              'item.id'])
+        expected = [{'id': 1, 'stock': [{'netStock': 3}, {'netStock': 5}],
+                     'item': {'id': 9}}]
+
+        assert expected == project_record(record=records,
+                                          projection=projection)
+
+    def with_empty_relation():
+        record = {'id': 1, 'stock': None}
+        projection = build_projection(fields=['stock.netStock'])
+
+        assert {'stock': None} == project_record(record=record,
+                                                 projection=projection)
+
+
+def describe_chunk_ids():
+    def with_id_limit():
+        expected = [[1, 2], [3, 4], [5]]
+        assert expected == chunk_ids(ids=[1, 2, 3, 4, 5], max_length=100,
+                                     max_ids=2)
+
+    def with_length_limit():
+        # '1234%2C5678' => 11 characters
+        ids = [1234, 5678, 9012, 3456]
+        expected = [[1234, 5678], [9012, 3456]]
+        assert expected == chunk_ids(ids=ids, max_length=11, max_ids=100)
+
+    def with_single_long_id():
+        assert [[123456], [7]] == chunk_ids(ids=[123456, 7], max_length=4,
+                                            max_ids=100)
+
+    def without_ids():
+        assert [] == chunk_ids(ids=[], max_length=100, max_ids=10)
+
+
+def describe_get_call_budget():
+    def with_call_limit_headers():
+        headers = {'X-Plenty-Global-Short-Period-Limit': '40',
+                   'X-Plenty-Global-Short-Period-Calls-Left': '39',
+                   'X-Plenty-Global-Long-Period-Calls-Left': 'abc',
+                   'Content-Type': 'application/json'}
+        expected = {'short_limit': 40, 'short_calls_left': 39}
+        assert expected == get_call_budget(headers=headers)
+
+    def without_call_limit_headers():
+        assert {} == get_call_budget(headers={})
+
+
+def describe_estimate_duration():
+    def with_latency_only():
+        assert 5.0 == estimate_duration(calls=10, latency=0.5,
+                                        call_budget={})
+
+    def with_rate_limiter():
+        assert 20.0 == estimate_duration(calls=10, latency=0.5,
+                                         call_budget={}, rate=0.5)
+
+    def with_exhausted_short_period():
+        call_budget = {'short_limit': 40, 'short_calls_left': 10,
+                       'short_decay': 5}
+        # 90 calls beyond the remaining 10 => 3 resets of the period
+        assert 25.0 == estimate_duration(calls=100, latency=0.1,
+                                         call_budget=call_budget)
+
+
+def describe_prefetch():
+    def with_all_items():
+        assert [[1], [2], [3]] == list(prefetch(iterable=iter([[1], [2], [3]]),
+                                                window=2))
+
+    def without_background_thread():
+        assert [1, 2] == list(prefetch(iterable=[1, 2], window=0))
+
+    def with_bounded_buffer():
+        fetched = []
+        read_ahead = threading.Event()
+
+        def pages():
+            for page in range(10):
+                fetched.append(page)
+                if page == 3:
+                    read_ahead.set()
+                yield page
+
+        stream = prefetch(iterable=pages(), window=2)
+        assert 0 == next(stream)
+        assert read_ahead.wait(timeout=5)
+        consumed = [0]
+        for page in stream:
+            consumed.append(page)
+            # consumed pages + window + the page waiting for a free slot
+            assert len(fetched) <= len(consumed) + 2 + 1
+        assert list(range(10)) == consumed
+
+    def with_overlapping_fetch():
+        fetching = [threading.Event() for _ in range(3)]
+
+        def pages():
+            for page in range(3):
+                fetching[page].set()
+                yield page
+
+        for page in prefetch(iterable=pages(), window=1):
+            # The next page is fetched while the caller processes this one
+            if page < 2:
+                assert fetching[page + 1].wait(timeout=5)
+
+    def with_failing_iterable():
+        def pages():
+            yield 1
+            raise RuntimeError('request failed')
+
+        stream = prefetch(iterable=pages(), window=1)
+        assert 1 == next(stream)
+        with pytest.raises(RuntimeError):
+            next(stream)
+
+    def with_early_stop():
+        closed = threading.Event()
+
+        def pages():
+            try:
+                for page in range(100):
+                    yield page
+            finally:
+                closed.set()
+
+        stream = prefetch(iterable=pages(), window=1)
+        assert 0 == next(stream)
+        stream.close()
+        assert closed.is_set()